@@ -0,0 +1,131 @@
+# Path: agent/async_nodes.py
+
+import asyncio
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+from agent.state import AgentState
+from agent.nodes import (
+    apply_rule_intent, build_intent_prompt, apply_intent_response, apply_intent_error,
+    merge_rule_parameters, plan_api_call, record_api_response, record_api_error,
+    build_response_prompt, build_polish_prompt, intent_prompt_turn, record_exchange, record_generation_error,
+    token_handler, cached_reply, is_json_reply
+)
+from agent.llm_cache import is_date_relative, llm_cache
+from agent.responses import RESPONSE_POLISH, render_response
+from agent.llm import llm_registry
+from api.async_client import AsyncBookingAPIClient
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# One client (and connection pool) per event loop, shared by every conversation on it
+_api_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncBookingAPIClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def get_async_api_client() -> AsyncBookingAPIClient:
+    """Returns the API client shared by all conversations on the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _api_clients.get(loop)
+    if client is None:
+        client = _api_clients[loop] = AsyncBookingAPIClient()
+    return client
+
+async def aclose_async_api_client() -> None:
+    """
+    Closes the running event loop's API client, if it has one.
+
+    Call it before the loop finishes (e.g. at the end of the coroutine passed
+    to asyncio.run); a loop that is simply discarded leaves its pooled
+    connections open.
+    """
+    client = _api_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+async def ainvoke_cached(name: str, prompt: str, dated_text: str, cacheable: Callable[[str], bool] = bool) -> str:
+    """Async version of invoke_cached."""
+    key, reply = cached_reply(name, prompt)
+    if reply is None:
+        reply = await llm_registry.ainvoke(name, prompt)
+        if cacheable(reply):
+            llm_cache.set(key, reply, date_relative=is_date_relative(dated_text))
+    return reply
+
+async def aclassify_intent(state: AgentState) -> AgentState:
+    log.debug("node_start", node="classify_intent", mode="async")
+    
+    if apply_rule_intent(state):
+        return state
+    
+    prompt = build_intent_prompt(state)
+    
+    try:
+        response_text = await ainvoke_cached("classification", prompt, intent_prompt_turn(prompt),
+                                            cacheable=is_json_reply)
+        apply_intent_response(state, response_text)
+        merge_rule_parameters(state)
+    except Exception as e:
+        apply_intent_error(state, e)
+    
+    return state
+
+async def aexecute_api_call(state: AgentState) -> AgentState:
+    log.debug("node_start", node="execute_api_call", mode="async", intent=state.intent)
+    
+    try:
+        api_call = plan_api_call(state)
+        if api_call:
+            method, args = api_call
+            api_client = get_async_api_client()
+            record_api_response(state, await getattr(api_client, method)(*args))
+    
+    except Exception as e:
+        record_api_error(state, e)
+    
+    return state
+
+async def agenerate_text(prompt: str, on_token: Optional[Callable[[str], None]] = None,
+                         streamed: Optional[List[str]] = None) -> str:
+    """Async version of generate_text."""
+    if on_token is None:
+        return await llm_registry.ainvoke("generation", prompt)
+    tokens = [] if streamed is None else streamed
+    async for token in llm_registry.astream("generation", prompt):
+        tokens.append(token)
+        on_token(token)
+    return "".join(tokens)
+
+async def agenerate_response(state: AgentState, config: Optional[Dict[str, Any]] = None) -> AgentState:
+    log.debug("node_start", node="generate_response", mode="async")
+    on_token = token_handler(config)
+    
+    # If we need clarification, return the clarification message
+    if state.needs_clarification and state.clarification_message:
+        return record_exchange(state, state.clarification_message, on_token)
+    
+    # Structured API results are rendered from templates without the LLM
+    templated = render_response(state)
+    if templated is not None:
+        if not RESPONSE_POLISH:
+            return record_exchange(state, templated, on_token)
+        # The rephrased reply is buffered, not streamed, so a polish that fails
+        # partway leaves the consumer with only the template
+        try:
+            polished = await agenerate_text(build_polish_prompt(templated))
+        except Exception as e:
+            log.warning("response_polish_failed", error=str(e))
+            polished = templated
+        return record_exchange(state, polished, on_token)
+    
+    # Generate response based on API result
+    streamed = []
+    try:
+        prompt = build_response_prompt(state)
+        agent_response = await agenerate_text(prompt, on_token, streamed)
+        
+    except Exception as e:
+        log.warning("response_generation_failed", error=str(e), streamed_tokens=len(streamed))
+        return record_generation_error(state, streamed, on_token)
+    
+    return record_exchange(state, agent_response)
@@ -1,10 +1,19 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
 from langgraph.graph import StateGraph, END
 from agent.state import AgentState
 from agent.nodes import classify_intent, process_parameters, execute_api_call, generate_response
+from agent.async_nodes import aclassify_intent, aexecute_api_call, agenerate_response
+from utils.log import get_logger
+from utils.metrics import workflow_metrics
+
+log = get_logger(__name__)
 
 def should_continue_after_parameters(state: AgentState) -> str:
     """Router to decide the next step after parameter processing."""
-    print(f"Router: intent={state.intent}, needs_clarification={state.needs_clarification}")
+    log.debug("route_after_parameters", intent=state.intent, needs_clarification=state.needs_clarification)
     
     # If we need clarification, go straight to response generation
     if state.needs_clarification:
@@ -28,13 +37,70 @@ def after_api_call(state: AgentState) -> str:
     
 def build_graph():
     """Builds the LangGraph workflow."""
+    return _build_workflow(classify_intent, process_parameters, execute_api_call, generate_response)
+
+def build_async_graph():
+    """
+    Builds the same workflow with asyncio-native nodes; run it with `await graph.ainvoke(state)`.
+    
+    LLM and API calls are awaited on shared connection pools, so one process
+    can drive many concurrent conversations without a thread per call.
+    """
+    return _build_workflow(aclassify_intent, process_parameters, aexecute_api_call, agenerate_response)
+
+class TurnStream:
+    """
+    One turn of a compiled graph whose reply is yielded as it is generated.
+
+    The graph runs in a background thread with an on_token callback in its
+    config, which generate_response calls for every LLM token (or once with a
+    templated reply). Iterating yields the tokens; afterwards `result` holds the
+    final state dict, and `first_token_ms`/`total_ms` the time to the first token
+    and to the full reply. Errors raised by the graph are re-raised by the iterator.
+    """
+
+    _DONE = object()
+
+    def __init__(self, app, state: AgentState):
+        self.result: Optional[Dict[str, Any]] = None
+        self.first_token_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self._tokens: "queue.Queue[Any]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(app, state), daemon=True)
+        self._thread.start()
+
+    def _run(self, app, state: AgentState) -> None:
+        try:
+            self.result = app.invoke(state, config={"configurable": {"on_token": self._tokens.put}})
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._tokens.put(self._DONE)
+
+    def __iter__(self) -> Iterator[str]:
+        while (token := self._tokens.get()) is not self._DONE:
+            if self.first_token_ms is None:
+                self.first_token_ms = (time.perf_counter() - self._start) * 1000
+            yield token
+        self._thread.join()
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        if self._error is not None:
+            raise self._error
+
+def stream_turn(app, state: AgentState) -> TurnStream:
+    """Runs one turn of a graph from build_graph() and streams the reply; see TurnStream."""
+    return TurnStream(app, state)
+
+def _build_workflow(classify_node, parameters_node, api_call_node, response_node):
     workflow = StateGraph(AgentState)
 
-    # Add nodes
-    workflow.add_node("classify_intent", classify_intent)
-    workflow.add_node("process_parameters", process_parameters)
-    workflow.add_node("execute_api_call", execute_api_call)
-    workflow.add_node("generate_response", generate_response)
+    # Add nodes, each wrapped to record its timings in workflow_metrics
+    workflow.add_node("classify_intent", workflow_metrics.node("classify_intent", classify_node))
+    workflow.add_node("process_parameters", workflow_metrics.node("process_parameters", parameters_node))
+    workflow.add_node("execute_api_call", workflow_metrics.node("execute_api_call", api_call_node))
+    workflow.add_node("generate_response", workflow_metrics.node("generate_response", response_node))
 
     # Define edges
     workflow.set_entry_point("classify_intent")
@@ -45,7 +111,7 @@ def build_graph():
     # Conditional routing after parameter processing
     workflow.add_conditional_edges(
         "process_parameters",
-        should_continue_after_parameters,
+        workflow_metrics.router("should_continue_after_parameters", should_continue_after_parameters),
         {
             "execute_api_call": "execute_api_call",
             "generate_response": "generate_response"
@@ -55,7 +121,7 @@ def build_graph():
     # After API call, always generate response
     workflow.add_conditional_edges(
         "execute_api_call",
-        after_api_call,
+        workflow_metrics.router("after_api_call", after_api_call),
         {
             "generate_response": "generate_response"
         }
@@ -0,0 +1,323 @@
+# Path: agent/llm.py
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from langchain_community.chat_models import ChatOllama
+from langchain_community.llms.ollama import OllamaEndpointNotFoundError
+from langchain_core.language_models import BaseChatModel
+from langchain_core.pydantic_v1 import Field
+from utils.log import get_logger
+from utils.metrics import add_llm_time
+
+log = get_logger(__name__)
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
+# How long Ollama keeps the model loaded after a call, e.g. "30m"; unset keeps Ollama's default
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE")
+# Concurrent LLM calls that keep a pooled connection to Ollama
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "10"))
+# Latencies kept per client for percentiles
+LATENCY_WINDOW = 1000
+
+# The clients the agent uses, created once by the registry
+LLM_CLIENTS = {
+    "classification": {"model": OLLAMA_MODEL, "format": "json"},
+    "generation": {"model": OLLAMA_MODEL},
+}
+
+
+class PooledChatOllama(ChatOllama):
+    """
+    ChatOllama that sends requests on a shared connection pool.
+
+    The stock client opens a new connection per call (requests.post, and a
+    new aiohttp.ClientSession per async call); this one reuses the
+    registry's requests.Session and one aiohttp session per event loop.
+    """
+
+    session: Optional[requests.Session] = Field(default=None, exclude=True)
+    registry: Any = Field(default=None, exclude=True)
+
+    def _request_payload(self, payload: Any, stop: Optional[List[str]], **kwargs: Any) -> Dict[str, Any]:
+        """The request body ChatOllama would send; see Ollama._create_stream."""
+        if self.stop is not None and stop is not None:
+            raise ValueError("`stop` found in both the input and default params.")
+        elif self.stop is not None:
+            stop = self.stop
+
+        params = self._default_params
+        for key in self._default_params:
+            if key in kwargs:
+                params[key] = kwargs[key]
+
+        if "options" in kwargs:
+            params["options"] = kwargs["options"]
+        else:
+            params["options"] = {
+                **params["options"],
+                "stop": stop,
+                **{k: v for k, v in kwargs.items() if k not in self._default_params},
+            }
+
+        if payload.get("messages"):
+            return {"messages": payload.get("messages", []), **params}
+        return {"prompt": payload.get("prompt"), "images": payload.get("images", []), **params}
+
+    def _request_headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json", **(self.headers if isinstance(self.headers, dict) else {})}
+
+    def _raise_for_status(self, status: int, detail: str) -> None:
+        if status == 404:
+            raise OllamaEndpointNotFoundError(
+                "Ollama call failed with status code 404. "
+                f"Maybe your model is not found and you should pull the model with `ollama pull {self.model}`."
+            )
+        raise ValueError(f"Ollama call failed with status code {status}. Details: {detail}")
+
+    def _create_stream(self, api_url: str, payload: Any, stop: Optional[List[str]] = None,
+                       **kwargs: Any) -> Iterator[str]:
+        response = (self.session or requests).post(
+            url=api_url,
+            headers=self._request_headers(),
+            json=self._request_payload(payload, stop, **kwargs),
+            stream=True,
+            timeout=self.timeout,
+        )
+        response.encoding = "utf-8"
+        if response.status_code != 200:
+            self._raise_for_status(response.status_code, response.text)
+        # Reading the stream to the end returns the connection to the pool
+        return response.iter_lines(decode_unicode=True)
+
+    async def _acreate_stream(self, api_url: str, payload: Any, stop: Optional[List[str]] = None,
+                              **kwargs: Any) -> AsyncIterator[str]:
+        session = self.registry.aiohttp_session() if self.registry else None
+        owned_session = session is None
+        if owned_session:
+            session = aiohttp.ClientSession()
+        try:
+            async with session.post(
+                url=api_url,
+                headers=self._request_headers(),
+                json=self._request_payload(payload, stop, **kwargs),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                if response.status != 200:
+                    self._raise_for_status(response.status, await response.text())
+                async for line in response.content:
+                    yield line.decode("utf-8")
+        finally:
+            if owned_session:
+                await session.close()
+
+
+class LLMCallStats:
+    """Call counts and a window of recent latencies for one client."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.latencies_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.total_ms += elapsed_ms
+            self.latencies_ms.append(elapsed_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self.latencies_ms)
+
+        def percentile(pct: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))], 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+        }
+
+
+class LLMRegistry:
+    """
+    Creates each LLM client the agent uses once and shares one connection pool between them.
+
+    Nodes call invoke/ainvoke with a client name from LLM_CLIENTS, which also
+    records per-call latency; stats() returns the numbers per client.
+    """
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, clients: Dict[str, Dict[str, Any]] = LLM_CLIENTS,
+                 pool_size: int = OLLAMA_POOL_SIZE, keep_alive: Optional[str] = OLLAMA_KEEP_ALIVE):
+        self.base_url = base_url.rstrip("/")
+        self.configs = clients
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._clients: Dict[str, BaseChatModel] = {}
+        self._stats = {name: LLMCallStats() for name in clients}
+        self._lock = threading.Lock()
+        # aiohttp sessions belong to the event loop that created them
+        self._aiohttp_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, name: str) -> BaseChatModel:
+        """Returns the named client, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._clients[name] = PooledChatOllama(
+                        base_url=self.base_url, keep_alive=self.keep_alive,
+                        session=self.session, registry=self, **self.configs[name]
+                    )
+        return client
+
+    def register(self, name: str, client: BaseChatModel) -> None:
+        """
+        Uses the given chat model for the named client instead of an Ollama one,
+        e.g. the in-process fake backend in debug/fake_ollama.py.
+        """
+        with self._lock:
+            self._clients[name] = client
+            self._stats.setdefault(name, LLMCallStats())
+
+    def unregister(self, name: str) -> None:
+        """Drops a registered client; the next call creates the configured Ollama client again."""
+        with self._lock:
+            self._clients.pop(name, None)
+
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        """The aiohttp session shared by async calls on the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._aiohttp_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            session = self._aiohttp_sessions[loop] = aiohttp.ClientSession(connector=connector)
+        return session
+
+    def invoke(self, name: str, prompt: str) -> str:
+        """Calls the named client and returns the reply text."""
+        start = time.perf_counter()
+        failed = True
+        try:
+            content = self.get(name).invoke(prompt).content
+            failed = False
+            return content
+        finally:
+            self._record(name, start, failed)
+
+    async def ainvoke(self, name: str, prompt: str) -> str:
+        """Async version of invoke."""
+        start = time.perf_counter()
+        failed = True
+        try:
+            content = (await self.get(name).ainvoke(prompt)).content
+            failed = False
+            return content
+        finally:
+            self._record(name, start, failed)
+
+    def stream(self, name: str, prompt: str) -> Iterator[str]:
+        """Calls the named client and yields the reply text as the model produces it."""
+        start = time.perf_counter()
+        first_token_ms = None
+        failed = True
+        try:
+            for chunk in self.get(name).stream(prompt):
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - start) * 1000
+                yield chunk.content
+            failed = False
+        finally:
+            self._record(name, start, failed, first_token_ms)
+
+    async def astream(self, name: str, prompt: str) -> AsyncIterator[str]:
+        """Async version of stream."""
+        start = time.perf_counter()
+        first_token_ms = None
+        failed = True
+        try:
+            async for chunk in self.get(name).astream(prompt):
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - start) * 1000
+                yield chunk.content
+            failed = False
+        finally:
+            self._record(name, start, failed, first_token_ms)
+
+    def _record(self, name: str, start: float, failed: bool, first_token_ms: Optional[float] = None) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._stats[name].record(elapsed_ms, failed)
+        add_llm_time(elapsed_ms)
+        if first_token_ms is None:
+            log.debug("llm_call", client=name, elapsed_ms=round(elapsed_ms, 1), failed=failed)
+        else:
+            log.debug("llm_call", client=name, elapsed_ms=round(elapsed_ms, 1), failed=failed,
+                      first_token_ms=round(first_token_ms, 1))
+
+    def warm_up(self) -> Dict[str, Optional[float]]:
+        """
+        Loads every configured model into Ollama before the first turn.
+
+        An empty generate request makes Ollama load the model without producing
+        tokens. Returns the load time in ms per model, or None where Ollama
+        could not be reached; failures are logged, not raised.
+        """
+        timings: Dict[str, Optional[float]] = {}
+        for model in {config["model"] for config in self.configs.values()}:
+            body: Dict[str, Any] = {"model": model}
+            if self.keep_alive is not None:
+                body["keep_alive"] = self.keep_alive
+            start = time.perf_counter()
+            try:
+                response = self.session.post(f"{self.base_url}/api/generate", json=body, timeout=(3.05, 300))
+                response.raise_for_status()
+                timings[model] = (time.perf_counter() - start) * 1000
+                log.info("llm_warm_up", model=model, elapsed_ms=round(timings[model], 1))
+            except requests.exceptions.RequestException as e:
+                timings[model] = None
+                log.warning("llm_warm_up_failed", model=model, error=str(e))
+        return timings
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-client call counts, errors and latency percentiles."""
+        return {name: stats.summary() for name, stats in self._stats.items()}
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """Close the running event loop's aiohttp session."""
+        session = self._aiohttp_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+llm_registry = LLMRegistry()
@@ -0,0 +1,204 @@
+# Path: agent/llm_cache.py
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+# Messages that mention a relative date only mean the same thing until midnight
+DATE_RELATIVE_PATTERN = re.compile(
+    r"\b(today|tonight|tomorrow|yesterday|weekend|next|coming|"
+    r"this (?:week|month|morning|afternoon|evening)|"
+    r"in (?:a|an|one|two|three|\d+) (?:days?|weeks?)|"
+    r"mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:rs|rsday)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?)\b",
+    re.IGNORECASE
+)
+# Sentence punctuation that does not change what a message asks
+TRAILING_PUNCTUATION = re.compile(r'[?!.]+(?=\s|"|$)')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapses whitespace and drops sentence punctuation so trivially different prompts match.
+
+    Case is kept: the reply carries names, emails and booking references as
+    the user typed them, so messages differing only in case need their own call.
+    """
+    return TRAILING_PUNCTUATION.sub("", " ".join(prompt.split()))
+
+
+def is_date_relative(message: str) -> bool:
+    """Whether the message mentions a date relative to today ("tomorrow", "next Friday", ...)."""
+    return bool(DATE_RELATIVE_PATTERN.search(message))
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU cache of LLM replies keyed by client, model and normalized prompt.
+
+    Entries expire after ttl_seconds; replies to prompts whose conversation
+    mentions a relative date also expire at the next local midnight. With a path, replies are also kept in
+    a SQLite file so they survive restarts and are shared by processes; a
+    memory miss falls back to it and promotes the row.
+
+    Attributes:
+        max_entries (int): Maximum number of replies kept in memory before LRU eviction
+        ttl_seconds (float): Lifetime of a cached reply in seconds
+        path (str): SQLite file backing the cache, or None for memory only
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 86400.0, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self.enabled and path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses "
+                "(key TEXT PRIMARY KEY, reply TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is active (a size or TTL of 0 disables it)."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def key(name: str, model: str, prompt: str) -> str:
+        """Cache key for a call to the named client and model with this prompt."""
+        return hashlib.sha256(f"{name}\0{model}\0{normalize_prompt(prompt)}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached reply.
+
+        Returns:
+            The reply, or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, reply = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return reply
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT reply, expires_at FROM llm_responses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    reply, expires_at = row
+                    self._store(key, expires_at, reply)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return reply
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, reply: str, date_relative: bool = False) -> None:
+        """
+        Store a reply, evicting the least recently used entry if full.
+
+        Args:
+            key: From LLMResponseCache.key
+            reply: The LLM's reply text
+            date_relative: The prompt's history or message mentions a relative
+                date, so the reply also expires at the next midnight
+        """
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        if date_relative:
+            midnight = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()).timestamp()
+            expires_at = min(expires_at, midnight)
+
+        with self._lock:
+            self._store(key, expires_at, reply)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, reply, expires_at) VALUES (?, ?, ?)",
+                    (key, reply, expires_at)
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Remove all entries, including the SQLite rows, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_responses")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = self.expirations = 0
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters for sizing and monitoring.
+
+        Returns:
+            Dict with size limits, current size, hit/miss/eviction counters
+            and the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "path": self.path,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def _store(self, key: str, expires_at: float, reply: str) -> None:
+        """Put a reply in the in-memory LRU (lock must be held)."""
+        self._entries[key] = (expires_at, reply)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+# Shared cache for the agent's LLM calls; LLM_CACHE_SIZE=0 disables it
+llm_cache = LLMResponseCache(
+    max_entries=int(os.getenv("LLM_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "86400")),
+    path=os.getenv("LLM_CACHE_PATH") or None
+)
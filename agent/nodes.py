@@ -1,15 +1,25 @@
 # Path: agent/nodes.py
 
 import json
+import logging
+import os
 import re
-from langchain_community.chat_models import ChatOllama
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from agent.state import AgentState
-from agent.prompts import INTENT_CLASSIFICATION_PROMPT, RESPONSE_GENERATION_PROMPT
+from agent.prompts import (
+    INTENT_CLASSIFICATION_PROMPT, INTENT_CLASSIFICATION_TURN, RESPONSE_GENERATION_PROMPT, RESPONSE_POLISH_PROMPT
+)
+from agent.prompt_builder import compact_json, estimate_tokens, history_within_budget
+from agent.responses import RESPONSE_POLISH, render_response
+from agent.llm import llm_registry
+from agent.llm_cache import is_date_relative, llm_cache
 from api.client import BookingAPIClient
 from utils.parsers import parse_natural_date
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 # Initialize components
-llm = ChatOllama(model="llama3.2", format="json")
 api_client = BookingAPIClient()
 
 def extract_json(text: str):
@@ -33,14 +43,8 @@ def extract_json(text: str):
     
     return None
 
-def classify_intent(state: AgentState) -> AgentState:
-    print("--- Node: Classify Intent ---")
-    
-    # Build conversation context string
-    context_str = ""
-    for msg in state.conversation_history[-4:]:  # Last 4 messages for better context
-        context_str += f"{msg['role'].title()}: {msg['content']}\n"
-    
+def _intent_signals(state: AgentState):
+    """Keyword signals about the current turn used to correct the LLM's intent."""
     # Check if we're continuing an existing booking conversation
     continuing_booking = bool(
         state.booking_context and 
@@ -57,150 +61,401 @@ def classify_intent(state: AgentState) -> AgentState:
         'my reservation', 'my booking', 'what time is my', 'when is my',
         'my table', 'reservation time', 'booking time'
     ])
-    
-    print(f"Continuing booking: {continuing_booking}")
-    print(f"Has existing booking: {has_existing_booking}")
-    print(f"Asking about existing: {asking_about_existing}")
-    print(f"Current booking context: {state.booking_context}")
-    
-    prompt = INTENT_CLASSIFICATION_PROMPT.format(
-        conversation_history=context_str,
+    return continuing_booking, has_existing_booking, asking_about_existing, user_msg_lower
+
+# Rule-based intents at or above this confidence skip the LLM classifier
+INTENT_RULE_THRESHOLD = float(os.getenv("INTENT_RULE_THRESHOLD", "0.85"))
+
+# Booking references are upper-case letters and digits, e.g. ABC1234
+BOOKING_REFERENCE_PATTERN = re.compile(r'\b(?=[A-Z0-9]*\d)(?=[A-Z0-9]*[A-Z])[A-Z0-9]{6,8}\b')
+CANCEL_PATTERN = re.compile(r'\b(cancel\w*|delete|call off|scrap)\b')
+MODIFY_PATTERN = re.compile(r'\b(change|modify|reschedul\w*|move|update|amend|switch|instead of)\b')
+EXISTING_BOOKING_PATTERN = re.compile(r'\b(my|our)\s+(booking|reservation|table)\b')
+LOOKUP_PATTERN = re.compile(
+    r'\b(check|details?|look up|show me|confirm|status|what time is|when is|reservation time|booking time)\b'
+)
+AVAILABILITY_PATTERN = re.compile(
+    r'\b(availab\w*|free|open|any tables?|what times|do you have (a )?(table|space|room))\b'
+)
+BOOK_PATTERN = re.compile(
+    r"\b(book|reserve|table for|(make|get) a (reservation|booking|table)|like a (reservation|table))\b"
+)
+GENERAL_PATTERN = re.compile(
+    r'^(hi|hello|hey|thanks|thank you|good (morning|afternoon|evening))\b'
+    r'|\b(menu|opening hours|address|where are you|located|parking|vegan|vegetarian|allergen\w*|dress code)\b'
+)
+# Dates, times, party sizes and contact details the LLM would extract as parameters
+BOOKING_DETAIL_PATTERN = re.compile(
+    r'\d|@|\b(today|tonight|tomorrow|weekend|next week|this week|monday|tuesday|wednesday|thursday|friday|saturday|sunday'
+    r'|noon|midnight|people|persons?|guests?|one|two|three|four|five|six|seven|eight|nine|ten'
+    r'|name|called|phone|mobile|email)\b'
+)
+
+def classify_intent_with_rules(message: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Classifies a message with compiled keyword rules instead of the LLM.
+
+    Returns {"intent", "confidence", "reason"}. Confidence is high only for
+    unambiguous wording (an explicit cancel/change/check of "my booking", an
+    availability question, a request to book); anything else scores low so
+    classify_intent falls back to the LLM.
+    """
+    text = message.lower().strip()
+    has_reference = bool(BOOKING_REFERENCE_PATTERN.search(message))
+    about_existing = has_reference or bool(EXISTING_BOOKING_PATTERN.search(text))
+    cancel = CANCEL_PATTERN.search(text)
+    modify = MODIFY_PATTERN.search(text)
+    lookup = LOOKUP_PATTERN.search(text)
+    availability = AVAILABILITY_PATTERN.search(text)
+    book = BOOK_PATTERN.search(text)
+
+    if cancel:
+        confidence = 0.95 if about_existing else 0.8
+        return {"intent": "cancel_booking", "confidence": confidence, "reason": f"'{cancel.group()}' keyword"}
+    if modify and (about_existing or not (availability or book)):
+        confidence = 0.95 if about_existing else 0.7
+        return {"intent": "modify_booking", "confidence": confidence, "reason": f"'{modify.group()}' keyword"}
+    if about_existing and (lookup or has_reference or text.endswith("?")):
+        confidence = 0.95 if lookup else 0.85
+        return {"intent": "check_booking", "confidence": confidence, "reason": "question about an existing booking"}
+    if availability:
+        # "Book a table if one is free" mixes both; let the LLM decide
+        confidence = 0.6 if book else 0.9
+        return {"intent": "check_availability", "confidence": confidence,
+                "reason": f"'{availability.group()}' keyword"}
+    if book:
+        return {"intent": "make_booking", "confidence": 0.9, "reason": f"'{book.group()}' keyword"}
+    if GENERAL_PATTERN.search(text):
+        return {"intent": "general_inquiry", "confidence": 0.85, "reason": "greeting or restaurant question"}
+    if BOOKING_DETAIL_PATTERN.search(text):
+        # Bare details ("for 4 people") continue a booking in progress
+        continuing = bool(context) and any(context.values()) and not context.get("booking_reference")
+        return {"intent": "make_booking", "confidence": 0.85 if continuing else 0.5,
+                "reason": "booking details" + (" continuing a booking" if continuing else "")}
+    return {"intent": "general_inquiry", "confidence": 0.3, "reason": "no rule matched"}
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'eleven': 11, 'twelve': 12
+}
+_NUMBER = r'\d{1,2}|' + '|'.join(NUMBER_WORDS)
+_MONTH = r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+_WEEKDAY = r'monday|tuesday|wednesday|thursday|friday|saturday|sunday'
+# Every parameter in one alternation, so a message is scanned once; each
+# alternative has a single named group, which match.lastgroup reports
+PARAMETER_PATTERN = re.compile(
+    rf"(?P<booking_reference>(?-i:{BOOKING_REFERENCE_PATTERN.pattern}))"
+    rf"|\b(?P<date>today|tonight|tomorrow|(?:this |next )?weekend|(?:this |next )?(?:{_WEEKDAY})"
+    rf"|in \d+ days?|\d+ days? from now|\d{{4}}-\d{{2}}-\d{{2}}|\d{{1,2}}/\d{{1,2}}/\d{{4}}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?(?: of)? (?:{_MONTH})|(?:{_MONTH}) \d{{1,2}}(?:st|nd|rd|th)?)\b"
+    r"|\b(?:(?:phone|mobile|tel|number)(?: number)?(?: is)?:?\s*)?(?P<phone>\+?\d[\d\s().-]{7,}\d)"
+    r"|\b(?P<time>\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2}|noon|midday)\b"
+    rf"|\b(?:party of|table for|for|just)\s+(?P<party_for>{_NUMBER})\b(?!\s*(?::|\.\d|am\b|pm\b|/|-\d))"
+    r"(?:\s+(?:people|persons?|guests?|adults|pax))?"
+    rf"|\b(?P<party_size>{_NUMBER})\s+(?:people|persons?|guests?|adults|pax|of us)\b"
+    r"|\b(?:my name is|my name's|name is|name:|i am|i'm|this is|under(?: the name)?)\s+"
+    r"(?P<customer_name>(?-i:[A-Z][a-zA-Z'-]+(?:\s+[A-Z][a-zA-Z'-]+){0,2}))",
+    re.IGNORECASE
+)
+
+def _parameter_value(group: str, text: str) -> Optional[Tuple[str, Any]]:
+    """Normalizes one matched parameter; None if the text is not a usable value."""
+    if group == "date":
+        text = text.lower()
+        date = parse_natural_date("today" if text == "tonight" else re.sub(r'(\d)(st|nd|rd|th)|of ', r'\1', text))
+        return ("date", date) if date else None
+    if group == "time":
+        text = text.lower().replace(".", ":")
+        if text in ("noon", "midday"):
+            return "time", "12:00"
+        time = convert_time_format(text.replace(" ", ""))
+        return ("time", time) if time and int(time[:2]) < 24 else None
+    if group == "phone":
+        digits = sum(char.isdigit() for char in text)
+        return ("phone", text.strip()) if 9 <= digits <= 15 else None
+    if group in ("party_for", "party_size"):
+        text = text.lower()
+        size = NUMBER_WORDS.get(text) or int(text)
+        return ("party_size", size) if 0 < size <= 20 else None
+    return group, text.strip()
+
+def _scan_parameters(message: str) -> Tuple[Dict[str, Any], str, set]:
+    """
+    Scans the message once, returning (parameters, unparsed text, repeated fields).
+
+    The first value of each field wins. The unparsed text is the message with
+    the extracted spans removed, so callers can tell whether anything else
+    that looks like a booking detail is left for the LLM.
+    """
+    parameters: Dict[str, Any] = {}
+    repeated = set()
+    unparsed = []
+    position = 0
+    for match in PARAMETER_PATTERN.finditer(message):
+        value = _parameter_value(match.lastgroup, match.group(match.lastgroup))
+        if value is None:
+            continue
+        field, parsed = value
+        if field in parameters:
+            repeated.add(field)
+        else:
+            parameters[field] = parsed
+        unparsed.append(message[position:match.start()])
+        position = match.end()
+    unparsed.append(message[position:])
+    return parameters, " ".join(unparsed), repeated
+
+def extract_parameters_with_rules(message: str) -> Dict[str, Any]:
+    """
+    Extracts date, time, party_size, customer_name, phone and booking_reference
+    from a message with one compiled pattern; fields it cannot find are left out.
+
+    Dates come back as YYYY-MM-DD, times as HH:MM and party sizes as ints,
+    so process_parameters has nothing left to re-parse.
+    """
+    return _scan_parameters(message)[0]
+
+def _rule_parameters(state: AgentState) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parameters for the classified intent from the local extractor, and
+    whether they cover every detail in the message.
+
+    Changes need new_date/new_time/new_party_size; those are only filled
+    when the message mentions each value once ("to 8pm", not "from 6pm to 8pm").
+    """
+    parameters, unparsed, repeated = _scan_parameters(state.user_message)
+    complete = not BOOKING_DETAIL_PATTERN.search(unparsed)
+    if state.intent == "modify_booking":
+        complete = complete and not repeated
+        parameters = {
+            ("new_" + key if key in ("date", "time", "party_size") else key): value
+            for key, value in parameters.items()
+            if complete or key == "booking_reference"
+        }
+    if state.intent == "check_booking" and "booking_reference" not in parameters \
+            and state.booking_context.get("booking_reference"):
+        parameters["booking_reference"] = state.booking_context["booking_reference"]
+    return parameters, complete
+
+def apply_rule_intent(state: AgentState) -> bool:
+    """
+    Classifies the turn with classify_intent_with_rules and, if it is
+    confident and the local extractor found every parameter in the message,
+    sets the intent and parameters without an LLM call.
+    """
+    result = classify_intent_with_rules(state.user_message, state.booking_context)
+    if result["confidence"] < INTENT_RULE_THRESHOLD:
+        log.debug("intent_rules_deferred", **result)
+        return False
+
+    previous_intent = state.intent
+    state.intent = result["intent"]
+    parameters, complete = _rule_parameters(state)
+    if not complete:
+        state.intent = previous_intent
+        log.debug("intent_rules_deferred", unparsed_details=True, **result)
+        return False
+
+    state.parameters = parameters
+    state.needs_clarification = False
+    state.clarification_message = ""
+    log.info("intent_classified", source="rules", intent=state.intent, parameters=state.parameters,
+             confidence=result["confidence"], reason=result["reason"])
+    return True
+
+def merge_rule_parameters(state: AgentState) -> AgentState:
+    """After an LLM classification, prefers the local extractor's values and keeps the LLM's for the rest."""
+    parameters, _ = _rule_parameters(state)
+    if parameters:
+        state.parameters.update(parameters)
+        log.debug("rule_parameters_merged", parameters=parameters)
+    return state
+
+def build_intent_prompt(state: AgentState) -> str:
+    """
+    Builds the intent classification prompt for the current turn.
+
+    The static instructions come first so consecutive calls share a prefix the
+    model server can keep cached; the history (bounded by a token budget),
+    compact booking context and message follow.
+    """
+    conversation_history, history_messages = history_within_budget(state.conversation_history)
+    
+    # The keyword signals are only needed for the debug log, so skip them when it is off
+    if log.isEnabledFor(logging.DEBUG):
+        continuing_booking, has_existing_booking, asking_about_existing, _ = _intent_signals(state)
+        log.debug("intent_signals", continuing_booking=continuing_booking,
+                  has_existing_booking=has_existing_booking, asking_about_existing=asking_about_existing,
+                  booking_context=state.booking_context)
+    
+    turn = INTENT_CLASSIFICATION_TURN.format(
+        conversation_history=conversation_history,
         user_message=state.user_message,
-        current_booking_context=json.dumps(state.booking_context, indent=2)
+        current_booking_context=compact_json(state.booking_context)
     )
-    
-    try:
-        response_text = llm.invoke(prompt).content
-        print(f"Raw LLM response: {response_text}")  # Debug output
-        
-        parsed_response = extract_json(response_text)
-        
-        if parsed_response:
-            llm_intent = parsed_response.get("intent", "general_inquiry")
-            
-            # FIXED: Override logic for existing booking queries
-            if has_existing_booking and asking_about_existing:
-                # User is asking about their existing booking
-                state.intent = "check_booking"
-                # Set the booking reference as a parameter
-                state.parameters = {"booking_reference": state.booking_context.get('booking_reference')}
-                print(f"Override: User asking about existing booking {state.booking_context.get('booking_reference')}")
-            elif continuing_booking and llm_intent in ['make_booking', 'general_inquiry']:
-                # Only keep make_booking if the LLM also thinks it's booking-related
-                state.intent = "make_booking"
-                # Extract parameters normally
-                raw_params = parsed_response.get("parameters", {})
-                state.parameters = {}
-                
-                for key, value in raw_params.items():
-                    if value is not None and str(value).strip() not in ["", "null", "None"]:
-                        if key == "party_size":
-                            try:
-                                number_words = {
-                                    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-                                    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-                                }
-                                value_str = str(value).lower().strip()
-                                if value_str in number_words:
-                                    state.parameters[key] = number_words[value_str]
-                                else:
-                                    number_match = re.search(r'\d+', str(value))
-                                    if number_match:
-                                        state.parameters[key] = int(number_match.group())
-                                    else:
-                                        state.parameters[key] = int(value)
-                            except (ValueError, TypeError):
-                                print(f"Could not parse party_size: {value}")
-                                continue
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("intent_prompt", prefix_tokens=estimate_tokens(INTENT_CLASSIFICATION_PROMPT), turn_tokens=estimate_tokens(turn),
+                  history_messages=history_messages)
+    return INTENT_CLASSIFICATION_PROMPT + turn
+
+def clean_llm_parameters(raw_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drops the LLM's empty/null parameters and turns party_size into an int."""
+    parameters = {}
+    for key, value in raw_params.items():
+        if value is not None and str(value).strip() not in ["", "null", "None"]:
+            if key == "party_size":
+                try:
+                    value_str = str(value).lower().strip()
+                    if value_str in NUMBER_WORDS:
+                        parameters[key] = NUMBER_WORDS[value_str]
+                    else:
+                        number_match = re.search(r'\d+', str(value))
+                        if number_match:
+                            parameters[key] = int(number_match.group())
                         else:
-                            state.parameters[key] = str(value).strip()
+                            parameters[key] = int(value)
+                except (ValueError, TypeError):
+                    log.info("party_size_unparsed", value=value)
+                    continue
             else:
-                # Trust the LLM's classification for all other cases
-                state.intent = llm_intent
-                
-                # Extract parameters normally
-                raw_params = parsed_response.get("parameters", {})
-                state.parameters = {}
-                
-                for key, value in raw_params.items():
-                    if value is not None and str(value).strip() not in ["", "null", "None"]:
-                        if key == "party_size":
-                            try:
-                                number_words = {
-                                    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-                                    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-                                }
-                                value_str = str(value).lower().strip()
-                                if value_str in number_words:
-                                    state.parameters[key] = number_words[value_str]
-                                else:
-                                    number_match = re.search(r'\d+', str(value))
-                                    if number_match:
-                                        state.parameters[key] = int(number_match.group())
-                                    else:
-                                        state.parameters[key] = int(value)
-                            except (ValueError, TypeError):
-                                print(f"Could not parse party_size: {value}")
-                                continue
-                        else:
-                            state.parameters[key] = str(value).strip()
-            
-            state.needs_clarification = parsed_response.get("needs_clarification", False)
-            state.clarification_message = parsed_response.get("clarification_message", "")
-            
-            print(f"Classified intent: {state.intent}")
-            print(f"Extracted parameters: {state.parameters}")
+                parameters[key] = str(value).strip()
+    return parameters
+
+def apply_intent_response(state: AgentState, response_text: str) -> AgentState:
+    """Sets intent, parameters and clarification from the LLM's classification response."""
+    log.debug("intent_llm_response", response=response_text)
+    continuing_booking, has_existing_booking, asking_about_existing, user_msg_lower = _intent_signals(state)
+    
+    parsed_response = extract_json(response_text)
+
+    if parsed_response:
+        llm_intent = parsed_response.get("intent", "general_inquiry")
+
+        # FIXED: Override logic for existing booking queries
+        if has_existing_booking and asking_about_existing:
+            # User is asking about their existing booking
+            state.intent = "check_booking"
+            # Set the booking reference as a parameter
+            state.parameters = {"booking_reference": state.booking_context.get('booking_reference')}
+            log.debug("intent_override", intent=state.intent, booking_reference=state.booking_context.get('booking_reference'))
+        elif continuing_booking and llm_intent in ['make_booking', 'general_inquiry']:
+            # Only keep make_booking if the LLM also thinks it's booking-related
+            state.intent = "make_booking"
+            # Extract parameters normally
+            state.parameters = clean_llm_parameters(parsed_response.get("parameters", {}))
         else:
-            print("Failed to parse JSON response, using fallback")
-            # FIXED: Better fallback logic
-            if has_existing_booking and asking_about_existing:
-                state.intent = "check_booking"
-                state.parameters = {"booking_reference": state.booking_context.get('booking_reference')}
-            elif any(word in user_msg_lower for word in ['available', 'availability', 'check availability', 'what times', 'free tables']):
-                state.intent = "check_availability"
-            elif any(word in user_msg_lower for word in ['book', 'reserve', 'table', 'reservation']) and continuing_booking:
-                state.intent = "make_booking"
-            elif any(word in user_msg_lower for word in ['cancel']) and 'booking' in user_msg_lower:
-                state.intent = "cancel_booking"
-            elif continuing_booking:
-                state.intent = "make_booking"
-            else:
-                state.intent = "general_inquiry"
-                
-            state.needs_clarification = True
-            state.clarification_message = "I'm sorry, I had trouble understanding that. Could you please rephrase your request?"
-            
-    except Exception as e:
-        print(f"Error in intent classification: {e}")
-        # FIXED: Same fallback logic for errors
+            # Trust the LLM's classification for all other cases
+            state.intent = llm_intent
+
+            # Extract parameters normally
+            state.parameters = clean_llm_parameters(parsed_response.get("parameters", {}))
+
+        state.needs_clarification = parsed_response.get("needs_clarification", False)
+        state.clarification_message = parsed_response.get("clarification_message", "")
+
+        log.info("intent_classified", intent=state.intent, parameters=state.parameters)
+    else:
+        log.warning("intent_response_not_json", response=response_text)
+        # FIXED: Better fallback logic
         if has_existing_booking and asking_about_existing:
             state.intent = "check_booking"
             state.parameters = {"booking_reference": state.booking_context.get('booking_reference')}
         elif any(word in user_msg_lower for word in ['available', 'availability', 'check availability', 'what times', 'free tables']):
             state.intent = "check_availability"
+        elif any(word in user_msg_lower for word in ['book', 'reserve', 'table', 'reservation']) and continuing_booking:
+            state.intent = "make_booking"
+        elif any(word in user_msg_lower for word in ['cancel']) and 'booking' in user_msg_lower:
+            state.intent = "cancel_booking"
         elif continuing_booking:
             state.intent = "make_booking"
         else:
             state.intent = "general_inquiry"
-            
+
         state.needs_clarification = True
-        state.clarification_message = "I encountered an error processing your request. Could you please try again?"
+        state.clarification_message = "I'm sorry, I had trouble understanding that. Could you please rephrase your request?"
+    
+    return state
+
+def apply_intent_error(state: AgentState, error: Exception) -> AgentState:
+    """Falls back to keyword rules when intent classification fails."""
+    continuing_booking, has_existing_booking, asking_about_existing, user_msg_lower = _intent_signals(state)
+    log.warning("intent_classification_failed", error=str(error))
+    # FIXED: Same fallback logic for errors
+    if has_existing_booking and asking_about_existing:
+        state.intent = "check_booking"
+        state.parameters = {"booking_reference": state.booking_context.get('booking_reference')}
+    elif any(word in user_msg_lower for word in ['available', 'availability', 'check availability', 'what times', 'free tables']):
+        state.intent = "check_availability"
+    elif continuing_booking:
+        state.intent = "make_booking"
+    else:
+        state.intent = "general_inquiry"
+
+    state.needs_clarification = True
+    state.clarification_message = "I encountered an error processing your request. Could you please try again?"
+    
+    return state
+
+def is_json_reply(reply: str) -> bool:
+    """Whether an LLM reply contains the JSON object the classifier asks for."""
+    return extract_json(reply) is not None
+
+def cached_reply(name: str, prompt: str) -> Tuple[str, Optional[str]]:
+    """Returns the llm_cache key for a call to the named client and its cached reply, if any."""
+    key = llm_cache.key(name, llm_registry.configs[name]["model"], prompt)
+    reply = llm_cache.get(key)
+    if reply is not None:
+        log.debug("llm_cache_hit", client=name)
+    return key, reply
+
+def intent_prompt_turn(prompt: str) -> str:
+    """The part of an intent prompt that varies per turn: history, booking context and message."""
+    return prompt[len(INTENT_CLASSIFICATION_PROMPT):]
+
+def invoke_cached(name: str, prompt: str, dated_text: str, cacheable: Callable[[str], bool] = bool) -> str:
+    """
+    Calls the named LLM client unless llm_cache has a reply to the same normalized prompt.
+
+    Replies that pass cacheable are stored; they expire at midnight when
+    dated_text, the user-supplied part of the prompt, mentions a relative date.
+    """
+    key, reply = cached_reply(name, prompt)
+    if reply is None:
+        reply = llm_registry.invoke(name, prompt)
+        if cacheable(reply):
+            llm_cache.set(key, reply, date_relative=is_date_relative(dated_text))
+    return reply
+
+def classify_intent(state: AgentState) -> AgentState:
+    log.debug("node_start", node="classify_intent")
+    
+    if apply_rule_intent(state):
+        return state
+    
+    prompt = build_intent_prompt(state)
+    
+    try:
+        # "yes, book it" after "tomorrow at 7" is as date-relative as the earlier turn
+        response_text = invoke_cached("classification", prompt, intent_prompt_turn(prompt), cacheable=is_json_reply)
+        apply_intent_response(state, response_text)
+        merge_rule_parameters(state)
+    except Exception as e:
+        apply_intent_error(state, e)
     
     return state
 
 def process_parameters(state: AgentState) -> AgentState:
-    print("--- Node: Process Parameters ---")
-    print(f"Current booking context: {state.booking_context}")
-    print(f"New parameters: {state.parameters}")
+    log.debug("node_start", node="process_parameters", booking_context=state.booking_context,
+              parameters=state.parameters)
     
     # Update booking context with new valid parameters
     if state.parameters:
         for key, value in state.parameters.items():
             if value is not None and str(value).strip() not in ["", "null", "None"]:
-                print(f"Adding {key}: {value} to booking context")
                 state.booking_context[key] = value
     
-    print(f"Updated booking context: {state.booking_context}")
+    log.debug("booking_context_updated", booking_context=state.booking_context)
     
     # Process and validate date
     if state.booking_context.get('date'):
@@ -208,7 +463,7 @@ def process_parameters(state: AgentState) -> AgentState:
         parsed_date = parse_natural_date(raw_date)
         if parsed_date:
             state.booking_context['date'] = parsed_date
-            print(f"Parsed date: {parsed_date}")
+            log.debug("date_parsed", raw=raw_date, date=parsed_date)
         else:
             state.needs_clarification = True
             state.clarification_message = f"I couldn't understand the date '{raw_date}'. Could you provide it in YYYY-MM-DD format or use terms like 'today', 'tomorrow', or 'next Friday'?"
@@ -224,7 +479,7 @@ def process_parameters(state: AgentState) -> AgentState:
             converted_time = convert_time_format(time_str)
             if converted_time:
                 state.booking_context['time'] = converted_time
-                print(f"Converted time: {converted_time}")
+                log.debug("time_converted", raw=time_str, time=converted_time)
             else:
                 state.needs_clarification = True
                 state.clarification_message = f"I couldn't understand the time '{time_str}'. Could you provide it in HH:MM format (like 19:30) or with AM/PM (like 7:30 PM)?"
@@ -287,9 +542,6 @@ def check_required_parameters(state: AgentState) -> AgentState:
     intent = state.intent
     context = state.booking_context
     
-    print(f"Checking required parameters for intent: {intent}")
-    print(f"Available context: {context}")
-    
     missing_params = []
     
     if intent == "check_availability":
@@ -310,13 +562,12 @@ def check_required_parameters(state: AgentState) -> AgentState:
         for field, description in required_fields.items():
             if not context.get(field):
                 missing_params.append(description)
-                print(f"Missing required field: {field} ({description})")
     
     elif intent in ["check_booking", "cancel_booking", "modify_booking"]:
         if not context.get("booking_reference"):
             missing_params.append("booking reference")
     
-    print(f"Missing parameters: {missing_params}")
+    log.debug("required_parameters_checked", intent=intent, missing=missing_params)
     
     if missing_params:
         state.needs_clarification = True
@@ -325,106 +576,191 @@ def check_required_parameters(state: AgentState) -> AgentState:
         else:
             state.clarification_message = f"I need your {missing_params[0]} to continue. Could you please provide it?"
     else:
-        print("All required parameters are available!")
         state.needs_clarification = False
         state.clarification_message = ""
     
     return state
 
-def execute_api_call(state: AgentState) -> AgentState:
-    print(f"--- Node: Execute API Call for intent '{state.intent}' ---")
+def plan_api_call(state: AgentState) -> Optional[Tuple[str, tuple]]:
+    """Picks the API client method and arguments for the current intent, or None if no call is needed."""
     intent = state.intent
     context = state.booking_context
     
-    try:
-        if intent == "check_availability":
-            state.api_response = api_client.check_availability(
-                context["date"], 
-                int(context["party_size"])
-            )
-        
-        elif intent == "make_booking":
-            full_name = context["customer_name"].strip().split()
-            first_name = full_name[0]
-            surname = full_name[-1] if len(full_name) > 1 else "Guest"
-            email = f"{first_name.lower()}.{surname.lower()}@example.com"
-            
-            state.api_response = api_client.create_booking(
-                context["date"],
-                context["time"], 
-                int(context["party_size"]),
-                first_name,
-                surname,
-                email,
-                context["phone"]
-            )
-            
-            # FIXED: Store booking reference in context after successful booking
-            if state.api_response.get('status') in [200, 201]:
-                booking_ref = state.api_response.get('data', {}).get('booking_reference')
-                if booking_ref:
-                    state.booking_context['booking_reference'] = booking_ref
-                    print(f"Stored booking reference in context: {booking_ref}")
-        
-        elif intent == "check_booking":
-            state.api_response = api_client.get_booking_details(context["booking_reference"])
+    if intent == "check_availability":
+        return "check_availability", (context["date"], int(context["party_size"]))
+    
+    elif intent == "make_booking":
+        full_name = context["customer_name"].strip().split()
+        first_name = full_name[0]
+        surname = full_name[-1] if len(full_name) > 1 else "Guest"
+        email = f"{first_name.lower()}.{surname.lower()}@example.com"
         
-        elif intent == "cancel_booking":
-            state.api_response = api_client.cancel_booking(context["booking_reference"])
+        return "create_booking", (
+            context["date"],
+            context["time"], 
+            int(context["party_size"]),
+            first_name,
+            surname,
+            email,
+            context["phone"]
+        )
+    
+    elif intent == "check_booking":
+        return "get_booking_details", (context["booking_reference"],)
+    
+    elif intent == "cancel_booking":
+        return "cancel_booking", (context["booking_reference"],)
+    
+    elif intent == "modify_booking":
+        booking_ref = context["booking_reference"]
+        new_date = context.get("new_date")
+        new_time = context.get("new_time") 
+        new_party_size = context.get("new_party_size")
         
-        elif intent == "modify_booking":
-            booking_ref = context["booking_reference"]
-            new_date = context.get("new_date")
-            new_time = context.get("new_time") 
-            new_party_size = context.get("new_party_size")
-            
-            if new_date or new_time or new_party_size:
-                state.api_response = api_client.update_booking(
-                    booking_ref, new_date, new_time, 
-                    int(new_party_size) if new_party_size else None
-                )
-            else:
-                state.needs_clarification = True
-                state.clarification_message = "What would you like to change about your booking? You can modify the date, time, or party size."
-                return state
+        if new_date or new_time or new_party_size:
+            return "update_booking", (
+                booking_ref, new_date, new_time, 
+                int(new_party_size) if new_party_size else None
+            )
+        else:
+            state.needs_clarification = True
+            state.clarification_message = "What would you like to change about your booking? You can modify the date, time, or party size."
+    
+    return None
+
+def record_api_response(state: AgentState, response: Dict[str, Any]) -> AgentState:
+    """Stores an API response on the state, remembering the reference of a new booking."""
+    state.api_response = response
+    
+    # FIXED: Store booking reference in context after successful booking
+    if state.intent == "make_booking" and response.get('status') in [200, 201]:
+        booking_ref = response.get('data', {}).get('booking_reference')
+        if booking_ref:
+            state.booking_context['booking_reference'] = booking_ref
+            log.debug("booking_reference_stored", booking_reference=booking_ref)
+    
+    return state
+
+def record_api_error(state: AgentState, error: Exception) -> AgentState:
+    log.warning("api_call_failed", intent=state.intent, error=str(error))
+    state.api_response = {
+        "status": 500,
+        "error": f"Sorry, I encountered an error while processing your request: {str(error)}"
+    }
+    return state
+
+def execute_api_call(state: AgentState) -> AgentState:
+    log.debug("node_start", node="execute_api_call", intent=state.intent)
+    
+    try:
+        api_call = plan_api_call(state)
+        if api_call:
+            method, args = api_call
+            record_api_response(state, getattr(api_client, method)(*args))
     
     except Exception as e:
-        print(f"API call error: {e}")
-        state.api_response = {
-            "status": 500,
-            "error": f"Sorry, I encountered an error while processing your request: {str(e)}"
-        }
+        record_api_error(state, e)
     
     return state
 
-def generate_response(state: AgentState) -> AgentState:
-    print("--- Node: Generate Response ---")
+def build_response_prompt(state: AgentState) -> str:
+    """Builds the response generation prompt from the turn's intent and API result."""
+    return RESPONSE_GENERATION_PROMPT.format(
+        intent=state.intent,
+        parameters=json.dumps(state.parameters, indent=2),
+        api_response=json.dumps(state.api_response, indent=2) if state.api_response else "No API call was made",
+        booking_context=json.dumps(state.booking_context, indent=2)
+    )
+
+def build_polish_prompt(draft: str) -> str:
+    """Builds the prompt that rephrases a templated reply when RESPONSE_POLISH is on."""
+    return RESPONSE_POLISH_PROMPT.format(draft=draft)
+
+def record_exchange(state: AgentState, agent_response: str,
+                    on_token: Optional[Callable[[str], None]] = None) -> AgentState:
+    """
+    Sets the agent's reply and adds this exchange to conversation history.
+
+    In a streaming run, pass on_token for replies that did not come from the
+    LLM token by token (clarifications, templates) so they are streamed whole.
+    """
+    if on_token is not None:
+        on_token(agent_response)
+    state.agent_response = agent_response
+    state.conversation_history.append({"role": "user", "content": state.user_message})
+    state.conversation_history.append({"role": "assistant", "content": state.agent_response})
+    return state
+
+def token_handler(config: Optional[Dict[str, Any]]) -> Optional[Callable[[str], None]]:
+    """The on_token callback of a streaming run (see agent.graph.stream_turn), if any."""
+    return ((config or {}).get("configurable") or {}).get("on_token")
+
+GENERATION_ERROR = "I apologize, but I encountered an error while generating my response. Please try again."
+# Appended to a reply whose stream failed after some of it reached the user
+GENERATION_INTERRUPTED = " ... Sorry, my reply was cut off. Please try again."
+
+def generate_text(prompt: str, on_token: Optional[Callable[[str], None]] = None,
+                  streamed: Optional[List[str]] = None) -> str:
+    """
+    Calls the generation LLM, passing each token to on_token as it arrives when streaming.
+
+    Tokens already passed to on_token are appended to `streamed`, so if the
+    stream fails the caller knows how much of the reply the user has seen.
+    """
+    if on_token is None:
+        return llm_registry.invoke("generation", prompt)
+    tokens = [] if streamed is None else streamed
+    for token in llm_registry.stream("generation", prompt):
+        tokens.append(token)
+        on_token(token)
+    return "".join(tokens)
+
+def record_generation_error(state: AgentState, streamed: List[str],
+                            on_token: Optional[Callable[[str], None]]) -> AgentState:
+    """
+    Records the fallback reply after response generation failed.
+
+    If part of the reply was already streamed, the apology continues it rather
+    than following it as a second reply, and the history keeps the text the
+    user actually saw.
+    """
+    if not streamed:
+        return record_exchange(state, GENERATION_ERROR, on_token)
+    if on_token is not None:
+        on_token(GENERATION_INTERRUPTED)
+    return record_exchange(state, "".join(streamed) + GENERATION_INTERRUPTED)
+
+def generate_response(state: AgentState, config: Optional[Dict[str, Any]] = None) -> AgentState:
+    log.debug("node_start", node="generate_response")
+    on_token = token_handler(config)
     
     # If we need clarification, return the clarification message
     if state.needs_clarification and state.clarification_message:
-        state.agent_response = state.clarification_message
-        state.conversation_history.append({"role": "user", "content": state.user_message})
-        state.conversation_history.append({"role": "assistant", "content": state.agent_response})
-        return state
+        return record_exchange(state, state.clarification_message, on_token)
+    
+    # Structured API results are rendered from templates without the LLM
+    templated = render_response(state)
+    if templated is not None:
+        if not RESPONSE_POLISH:
+            return record_exchange(state, templated, on_token)
+        # The rephrased reply is buffered, not streamed, so a polish that fails
+        # partway leaves the consumer with only the template
+        try:
+            polished = generate_text(build_polish_prompt(templated))
+        except Exception as e:
+            log.warning("response_polish_failed", error=str(e))
+            polished = templated
+        return record_exchange(state, polished, on_token)
     
     # Generate response based on API result
+    streamed = []
     try:
-        prompt = RESPONSE_GENERATION_PROMPT.format(
-            intent=state.intent,
-            parameters=json.dumps(state.parameters, indent=2),
-            api_response=json.dumps(state.api_response, indent=2) if state.api_response else "No API call was made",
-            booking_context=json.dumps(state.booking_context, indent=2)
-        )
-        
-        response_llm = ChatOllama(model="llama3.2")
-        state.agent_response = response_llm.invoke(prompt).content
+        prompt = build_response_prompt(state)
+        agent_response = generate_text(prompt, on_token, streamed)
         
     except Exception as e:
-        print(f"Response generation error: {e}")
-        state.agent_response = "I apologize, but I encountered an error while generating my response. Please try again."
+        log.warning("response_generation_failed", error=str(e), streamed_tokens=len(streamed))
+        return record_generation_error(state, streamed, on_token)
     
     # Add this exchange to conversation history
-    state.conversation_history.append({"role": "user", "content": state.user_message})
-    state.conversation_history.append({"role": "assistant", "content": state.agent_response})
-    
-    return state
\ No newline at end of file
+    return record_exchange(state, agent_response)
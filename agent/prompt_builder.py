@@ -0,0 +1,45 @@
+# Path: agent/prompt_builder.py
+
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+# Token budget for the conversation history in the intent prompt, and the most messages kept
+INTENT_HISTORY_TOKEN_BUDGET = int(os.getenv("INTENT_HISTORY_TOKEN_BUDGET", "200"))
+INTENT_HISTORY_MESSAGES = int(os.getenv("INTENT_HISTORY_MESSAGES", "4"))
+# Llama-family tokenizers average about four characters per token on English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text for budgeting and reporting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or empty fields and with sorted keys, e.g. {"date":"2025-10-24","party_size":4}."""
+    if isinstance(value, dict):
+        value = {key: item for key, item in value.items() if item not in (None, "", [], {})}
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def history_within_budget(history: List[Dict[str, str]], budget: int = INTENT_HISTORY_TOKEN_BUDGET,
+                          max_messages: int = INTENT_HISTORY_MESSAGES) -> Tuple[str, int]:
+    """
+    Renders the most recent messages that fit in the token budget, oldest first.
+
+    A newest message that alone exceeds the budget is cut to its last part.
+    Returns the rendered history and how many messages it includes.
+    """
+    lines: List[str] = []
+    remaining = budget
+    for msg in reversed(history[-max_messages:] if max_messages > 0 else []):
+        line = f"{msg['role'].title()}: {msg['content']}\n"
+        tokens = estimate_tokens(line)
+        if tokens > remaining:
+            if not lines and remaining > 0:
+                lines.append(f"{msg['role'].title()}: ...{msg['content'][-remaining * CHARS_PER_TOKEN:]}\n")
+            break
+        lines.append(line)
+        remaining -= tokens
+    return "".join(reversed(lines)), len(lines)
@@ -1,15 +1,8 @@
+# Static instructions, sent first and unchanged on every turn so the model server can reuse
+# their cached prefix; the per-turn part follows in INTENT_CLASSIFICATION_TURN
 INTENT_CLASSIFICATION_PROMPT = """
 You are a restaurant booking assistant for TheHungryUnicorn restaurant.
-Analyze the user's message and classify their intent, extracting relevant parameters.
-
-CONTEXT:
-Conversation History:
-{conversation_history}
-
-Current Booking Context (information already gathered):
-{current_booking_context}
-
-Current User Message: "{user_message}"
+Analyze the user's message at the end of this prompt and classify their intent, extracting relevant parameters.
 
 INTENT ANALYSIS RULES:
 
@@ -75,9 +68,9 @@ EXAMPLES:
 - "When is my booking on Saturday?" (with booking_reference in context) → check_booking
 
 OUTPUT FORMAT (JSON only, no other text):
-{{
+{
   "intent": "one of: check_availability, make_booking, check_booking, modify_booking, cancel_booking, general_inquiry",
-  "parameters": {{
+  "parameters": {
     "date": "extracted date or null",
     "time": "extracted time or null", 
     "party_size": "extracted number or null",
@@ -87,11 +80,22 @@ OUTPUT FORMAT (JSON only, no other text):
     "new_date": "for modify_booking - new date or null",
     "new_time": "for modify_booking - new time or null",
     "new_party_size": "for modify_booking - new party size or null"
-  }},
+  },
   "confidence": 0.95,
   "needs_clarification": false,
   "clarification_message": "friendly message asking for missing info, or null"
-}}
+}
+"""
+
+INTENT_CLASSIFICATION_TURN = """
+CONTEXT:
+Conversation History:
+{conversation_history}
+
+Current Booking Context (information already gathered):
+{current_booking_context}
+
+Current User Message: "{user_message}"
 """
 
 RESPONSE_GENERATION_PROMPT = """
@@ -146,6 +150,17 @@ TONE:
 Generate your response:
 """
 
+RESPONSE_POLISH_PROMPT = """
+You are a friendly restaurant booking assistant for TheHungryUnicorn.
+Rephrase this reply to the customer so it sounds natural and warm.
+Keep every date, time, party size, name and booking reference exactly as written,
+and do not add any information.
+
+Reply: {draft}
+
+Rephrased reply:
+"""
+
 PARAMETER_EXTRACTION_PROMPT = """
 Extract booking parameters from this text: "{text}"
 
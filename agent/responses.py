@@ -0,0 +1,129 @@
+# Path: agent/responses.py
+
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+from agent.state import AgentState
+
+# Rephrase templated replies with the generation LLM; off by default so the
+# common successful turn makes no LLM call in response generation
+RESPONSE_POLISH = os.getenv("RESPONSE_POLISH", "false").lower() == "true"
+
+TEMPLATED_INTENTS = {"check_availability", "make_booking", "cancel_booking", "check_booking"}
+
+
+def format_date(value: Any) -> str:
+    """'2025-10-24' -> 'Friday 24 October'; anything unparseable is returned as is."""
+    try:
+        day = date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return str(value)
+    return f"{day:%A} {day.day} {day:%B}"
+
+
+def format_time(value: Any) -> str:
+    """'19:30:00' -> '7:30 PM'; anything unparseable is returned as is."""
+    try:
+        hour, minute = (int(part) for part in str(value).split(":")[:2])
+    except ValueError:
+        return str(value)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def format_list(items: List[str]) -> str:
+    """['a', 'b', 'c'] -> 'a, b and c'."""
+    return items[0] if len(items) == 1 else f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+def _people(party_size: Any) -> str:
+    return "1 person" if str(party_size) == "1" else f"{party_size} people"
+
+
+def _error_detail(response: Dict[str, Any]) -> str:
+    error = response.get("error")
+    if isinstance(error, dict):
+        return str(error.get("detail", error))
+    return str(error or "")
+
+
+def _render_availability(data: Dict[str, Any]) -> str:
+    when = format_date(data.get("visit_date"))
+    party = _people(data.get("party_size"))
+    times = [format_time(slot["time"]) for slot in data.get("available_slots", []) if slot.get("available")]
+    if not times:
+        return (f"Sorry, we don't have any tables for {party} on {when}. "
+                "Would you like me to check another date?")
+    return (f"Good news! On {when} we have tables for {party} at {format_list(times)}. "
+            "Which time would you like me to book?")
+
+
+def _render_booking(data: Dict[str, Any]) -> str:
+    customer = data.get("customer") or {}
+    name = " ".join(part for part in (customer.get("first_name"), customer.get("surname")) if part)
+    return (f"Your table is booked! Your booking reference is {data.get('booking_reference')}: "
+            f"{_people(data.get('party_size'))} on {format_date(data.get('visit_date'))} "
+            f"at {format_time(data.get('visit_time'))}" + (f", under the name {name}" if name else "") +
+            ". Please keep the reference handy to check or cancel your booking.")
+
+
+def _render_booking_details(data: Dict[str, Any]) -> str:
+    customer = data.get("customer") or {}
+    name = " ".join(part for part in (customer.get("first_name"), customer.get("surname")) if part)
+    details = (f"Booking {data.get('booking_reference')} is for {_people(data.get('party_size'))} "
+               f"on {format_date(data.get('visit_date'))} at {format_time(data.get('visit_time'))}"
+               + (f", under the name {name}" if name else ""))
+    if data.get("status") == "cancelled":
+        reason = data.get("cancellation_reason") or {}
+        reason_text = reason.get("reason") if isinstance(reason, dict) else reason
+        return details + ". It has been cancelled" + (f" ({reason_text})." if reason_text else ".")
+    return details + f". Its status is {data.get('status', 'confirmed')}."
+
+
+def _render_cancellation(data: Dict[str, Any]) -> str:
+    return (f"Booking {data.get('booking_reference')} has been cancelled. "
+            "We hope to see you another time!")
+
+
+def _render_error(intent: str, status: int, detail: str, context: Dict[str, Any]) -> str:
+    reference = context.get("booking_reference", "")
+    if status == 404 and "booking" in detail.lower():
+        return (f"I couldn't find a booking with reference {reference}. "
+                "Could you double-check the reference and try again?")
+    if intent == "make_booking" and status == 409:
+        return (f"Sorry, {format_time(context.get('time', ''))} on {format_date(context.get('date', ''))} "
+                "is fully booked. Would you like me to check other times?")
+    if intent == "cancel_booking" and "already cancelled" in detail.lower():
+        return f"Booking {reference} has already been cancelled, so there's nothing more to do."
+    if status >= 500:
+        return ("Sorry, I couldn't reach the booking system just now. "
+                "Please try again in a moment.")
+    return f"Sorry, I couldn't complete that request: {detail}. Could you check the details and try again?"
+
+
+RENDERERS = {
+    "check_availability": _render_availability,
+    "make_booking": _render_booking,
+    "check_booking": _render_booking_details,
+    "cancel_booking": _render_cancellation,
+}
+
+
+def render_response(state: AgentState) -> Optional[str]:
+    """
+    Renders the reply for a well-defined API outcome without the LLM.
+
+    Covers success and error results of check_availability, make_booking,
+    check_booking and cancel_booking. Returns None for anything else
+    (other intents, no API call), which generate_response leaves to the LLM.
+    """
+    response = state.api_response
+    if state.intent not in TEMPLATED_INTENTS or not response:
+        return None
+
+    status = response.get("status")
+    data = response.get("data")
+    if status in (200, 201) and isinstance(data, dict):
+        return RENDERERS[state.intent](data)
+    if isinstance(status, int) and status >= 400:
+        return _render_error(state.intent, status, _error_detail(response), state.booking_context)
+    return None
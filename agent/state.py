@@ -1,5 +1,8 @@
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 @dataclass
 class AgentState:
@@ -33,14 +36,14 @@ class AgentState:
         # Only clear if we're not in the middle of an operation
         if not self.needs_clarification:
             self.booking_context = {}
-            print("Booking context cleared")
+            log.debug("booking_context_cleared")
     
     def preserve_booking_reference(self):
         """Preserve only the booking reference when clearing context."""
         if self.booking_context.get('booking_reference'):
             booking_ref = self.booking_context['booking_reference']
             self.booking_context = {'booking_reference': booking_ref}
-            print(f"Preserved booking reference: {booking_ref}")
+            log.debug("booking_reference_preserved", booking_reference=booking_ref)
         
     def add_to_history(self, role: str, content: str):
         """Helper method to add messages to conversation history."""
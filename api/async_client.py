@@ -0,0 +1,191 @@
+# Path: api/async_client.py
+
+import asyncio
+import os
+import time
+import httpx
+from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+
+from api.client import (
+    API_SERVER_URL, API_CONNECT_TIMEOUT, API_READ_TIMEOUT, API_MAX_RETRIES,
+    API_RETRY_BACKOFF, IDEMPOTENT_METHODS, RETRY_STATUSES, parse_response
+)
+from utils.log import get_logger
+from utils.metrics import add_http_time
+
+load_dotenv()
+
+log = get_logger(__name__)
+
+# One process may drive hundreds of conversations, so the async pool is larger
+API_ASYNC_POOL_SIZE = int(os.getenv("API_ASYNC_POOL_SIZE", "100"))
+
+
+class AsyncBookingAPIClient:
+    """
+    An asyncio-native client for the mock restaurant booking API.
+
+    Mirrors BookingAPIClient method for method and returns the same result
+    dicts, but awaits HTTP calls on a shared httpx connection pool instead of
+    blocking a thread per call. Create and use it inside the event loop that
+    runs the conversations; pooled connections belong to that loop.
+    """
+
+    def __init__(self, server_url: str = API_SERVER_URL, pool_size: int = API_ASYNC_POOL_SIZE,
+                 connect_timeout: float = API_CONNECT_TIMEOUT, read_timeout: float = API_READ_TIMEOUT,
+                 max_retries: int = API_MAX_RETRIES, retry_backoff: float = API_RETRY_BACKOFF):
+        self.server_url = server_url.rstrip("/")
+        self.base_url = f"{self.server_url}/api/ConsumerApi/v1/Restaurant/TheHungryUnicorn"
+        bearer_token = os.getenv("API_BEARER_TOKEN")
+        if not bearer_token:
+            raise ValueError("API_BEARER_TOKEN not found in .env file")
+        self.headers = {
+            "Authorization": f"Bearer {bearer_token}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+        # Queue excess calls here rather than in httpcore, whose pool rescans
+        # every waiting request on each assignment and slows down with hundreds queued
+        self._request_slots = asyncio.Semaphore(pool_size)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncBookingAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _send(self, method: str, url: str, data: Optional[Dict], idempotent: bool) -> httpx.Response:
+        """Send a request on the shared pool, retrying idempotent calls with exponential backoff."""
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            start = time.perf_counter()
+            try:
+                async with self._request_slots:
+                    response = await self.client.request(method, url, data=data)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                log.info("api_retry", url=url, error=type(e).__name__, attempt=attempt + 1, attempts=attempts)
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                log.info("api_retry", url=url, status=response.status_code, attempt=attempt + 1, attempts=attempts)
+            finally:
+                add_http_time((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                            idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """Generic request handler; see BookingAPIClient._make_request."""
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        url = f"{self.base_url}{endpoint}"
+        try:
+            log.debug("api_request", method=method, url=url, data=data)
+
+            response = await self._send(method, url, data, idempotent)
+
+            return parse_response(response)
+
+        except httpx.ConnectError as e:
+            log.warning("api_connection_error", url=url, error=str(e))
+            return {"status": 500, "error": "Could not connect to the restaurant booking system. Please check if the server is running."}
+        except httpx.TimeoutException as e:
+            log.warning("api_timeout", url=url, error=str(e))
+            return {"status": 500, "error": "Request timed out. Please try again."}
+        except httpx.HTTPError as e:
+            log.warning("api_request_error", url=url, error=str(e))
+            return {"status": 500, "error": f"Request failed: {str(e)}"}
+        except Exception as e:
+            log.error("api_unexpected_error", exc_info=e, url=url)
+            return {"status": 500, "error": f"An unexpected error occurred: {str(e)}"}
+
+    async def check_availability(self, visit_date: str, party_size: int) -> Dict[str, Any]:
+        """Check availability for a specific date and party size."""
+        payload = {
+            "VisitDate": visit_date,
+            "PartySize": party_size,
+            "ChannelCode": "ONLINE"
+        }
+        return await self._make_request("POST", "/AvailabilitySearch", data=payload, idempotent=True)
+
+    async def check_availability_range(self, start_date: str, end_date: str, party_size: int) -> Dict[str, Any]:
+        """Check availability for every date from start_date to end_date (inclusive) in one call."""
+        payload = {
+            "StartDate": start_date,
+            "EndDate": end_date,
+            "PartySize": party_size,
+            "ChannelCode": "ONLINE"
+        }
+        return await self._make_request("POST", "/AvailabilityRangeSearch", data=payload, idempotent=True)
+
+    async def create_booking(self, visit_date: str, visit_time: str, party_size: int,
+                             first_name: str, surname: str, email: str, mobile: str) -> Dict[str, Any]:
+        """Create a new booking."""
+        payload = {
+            "VisitDate": visit_date,
+            "VisitTime": visit_time,
+            "PartySize": party_size,
+            "ChannelCode": "ONLINE",
+            "Customer[FirstName]": first_name,
+            "Customer[Surname]": surname,
+            "Customer[Email]": email,
+            "Customer[Mobile]": mobile
+        }
+        return await self._make_request("POST", "/BookingWithStripeToken", data=payload)
+
+    async def get_booking_details(self, booking_reference: str) -> Dict[str, Any]:
+        """Get details of an existing booking."""
+        return await self._make_request("GET", f"/Booking/{booking_reference}")
+
+    async def update_booking(self, booking_reference: str, new_date: Optional[str] = None,
+                             new_time: Optional[str] = None, new_party_size: Optional[int] = None) -> Dict[str, Any]:
+        """Update an existing booking."""
+        payload = {}
+        if new_date:
+            payload["VisitDate"] = new_date
+        if new_time:
+            payload["VisitTime"] = new_time
+        if new_party_size:
+            payload["PartySize"] = new_party_size
+
+        if not payload:
+            return {"status": 400, "error": "No update parameters provided"}
+
+        # Setting absolute values, so repeating the call is safe
+        return await self._make_request("PATCH", f"/Booking/{booking_reference}", data=payload, idempotent=True)
+
+    async def cancel_booking(self, booking_reference: str) -> Dict[str, Any]:
+        """Cancel an existing booking."""
+        payload = {
+            "micrositeName": "TheHungryUnicorn",
+            "bookingReference": booking_reference,
+            "cancellationReasonId": 1  # "Customer Request"
+        }
+        return await self._make_request("POST", f"/Booking/{booking_reference}/Cancel", data=payload)
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test connection to the server."""
+        try:
+            response = await self.client.get(f"{self.server_url}/")
+            if response.status_code == 200:
+                return {"status": "success", "message": "Server is running"}
+            else:
+                return {"status": "error", "message": f"Server returned status {response.status_code}"}
+        except httpx.ConnectError:
+            return {"status": "error", "message": f"Cannot connect to server. Is it running at {self.server_url}?"}
+        except Exception as e:
+            return {"status": "error", "message": f"Connection test failed: {str(e)}"}
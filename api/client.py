@@ -1,17 +1,72 @@
 # Path: api/client.py
 
 import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from utils.log import get_logger
+from utils.metrics import add_http_time
 
 load_dotenv()
 
+log = get_logger(__name__)
+
+API_SERVER_URL = os.getenv("API_SERVER_URL", "http://localhost:8547")
+# Connections kept alive to the API server; size it to the number of concurrent callers
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+# Idempotent calls are retried on connection errors, timeouts and gateway errors
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "2"))
+API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.2"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {502, 503, 504}
+
+
+def parse_response(response) -> Dict[str, Any]:
+    """
+    Turns an HTTP response into the client's result dict.
+
+    Works with both requests and httpx responses, so the sync and async
+    clients return identical results.
+    """
+    # Handle successful responses
+    if response.status_code in [200, 201]:
+        try:
+            response_data = response.json()
+            log.debug("api_response", status=response.status_code, data=response_data)
+            return {"status": response.status_code, "data": response_data}
+        except ValueError as e:
+            log.warning("api_response_not_json", status=response.status_code, error=str(e))
+            return {"status": response.status_code, "data": response.text}
+    
+    # Handle error responses
+    else:
+        try:
+            error_data = response.json()
+            log.info("api_error_response", status=response.status_code, error=error_data)
+            return {"status": response.status_code, "error": error_data}
+        except ValueError:
+            log.info("api_error_response", status=response.status_code, error=response.text)
+            return {"status": response.status_code, "error": response.text}
+
+
 class BookingAPIClient:
-    """A client to interact with the mock restaurant booking API."""
+    """
+    A client to interact with the mock restaurant booking API.
+
+    All calls share one requests.Session, so TCP connections are pooled and
+    kept alive between calls instead of being opened for every request.
+    """
 
-    def __init__(self):
-        self.base_url = "http://localhost:8547/api/ConsumerApi/v1/Restaurant/TheHungryUnicorn"
+    def __init__(self, server_url: str = API_SERVER_URL, pool_size: int = API_POOL_SIZE,
+                 connect_timeout: float = API_CONNECT_TIMEOUT, read_timeout: float = API_READ_TIMEOUT,
+                 max_retries: int = API_MAX_RETRIES, retry_backoff: float = API_RETRY_BACKOFF):
+        self.server_url = server_url.rstrip("/")
+        self.base_url = f"{self.server_url}/api/ConsumerApi/v1/Restaurant/TheHungryUnicorn"
         bearer_token = os.getenv("API_BEARER_TOKEN")
         if not bearer_token:
             raise ValueError("API_BEARER_TOKEN not found in .env file")
@@ -19,72 +74,99 @@ class BookingAPIClient:
             "Authorization": f"Bearer {bearer_token}",
             "Content-Type": "application/x-www-form-urlencoded"
         }
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "BookingAPIClient":
+        return self
 
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Generic request handler with improved error handling."""
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _send(self, method: str, url: str, data: Optional[Dict], idempotent: bool) -> requests.Response:
+        """Send a request on the pooled session, retrying idempotent calls with exponential backoff."""
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, data=data, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if last_attempt:
+                    raise
+                log.info("api_retry", url=url, error=type(e).__name__, attempt=attempt + 1, attempts=attempts)
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                log.info("api_retry", url=url, status=response.status_code, attempt=attempt + 1, attempts=attempts)
+            finally:
+                add_http_time((time.perf_counter() - start) * 1000)
+            time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                      idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Generic request handler with improved error handling.
+
+        `idempotent` defaults to whether the HTTP method is idempotent; read-only
+        POST endpoints such as availability search pass True so they are retried too.
+        """
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        url = f"{self.base_url}{endpoint}"
         try:
-            url = f"{self.base_url}{endpoint}"
-            print(f"Making {method} request to: {url}")
-            print(f"Headers: {self.headers}")
-            if data:
-                print(f"Data: {data}")
-            
-            response = requests.request(method, url, headers=self.headers, data=data, timeout=30)
-            
-            print(f"Response status: {response.status_code}")
-            print(f"Response headers: {dict(response.headers)}")
+            log.debug("api_request", method=method, url=url, data=data)
             
-            # Handle successful responses
-            if response.status_code in [200, 201]:
-                try:
-                    response_data = response.json()
-                    print(f"Response data: {response_data}")
-                    return {"status": response.status_code, "data": response_data}
-                except ValueError as e:
-                    print(f"Failed to parse JSON response: {e}")
-                    return {"status": response.status_code, "data": response.text}
+            response = self._send(method, url, data, idempotent)
             
-            # Handle error responses
-            else:
-                try:
-                    error_data = response.json()
-                    print(f"Error response: {error_data}")
-                    return {"status": response.status_code, "error": error_data}
-                except ValueError:
-                    print(f"Error response (text): {response.text}")
-                    return {"status": response.status_code, "error": response.text}
+            return parse_response(response)
                     
         except requests.exceptions.ConnectionError as e:
-            print(f"Connection error: {e}")
+            log.warning("api_connection_error", url=url, error=str(e))
             return {"status": 500, "error": "Could not connect to the restaurant booking system. Please check if the server is running."}
         except requests.exceptions.Timeout as e:
-            print(f"Timeout error: {e}")
+            log.warning("api_timeout", url=url, error=str(e))
             return {"status": 500, "error": "Request timed out. Please try again."}
         except requests.exceptions.RequestException as e:
-            print(f"Request error: {e}")
+            log.warning("api_request_error", url=url, error=str(e))
             return {"status": 500, "error": f"Request failed: {str(e)}"}
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            log.error("api_unexpected_error", exc_info=e, url=url)
             return {"status": 500, "error": f"An unexpected error occurred: {str(e)}"}
 
     def check_availability(self, visit_date: str, party_size: int) -> Dict[str, Any]:
         """Check availability for a specific date and party size."""
-        print(f"--- Calling API: check_availability ---")
-        print(f"Visit Date: {visit_date}, Party Size: {party_size}")
-        
         payload = {
             "VisitDate": visit_date, 
             "PartySize": party_size, 
             "ChannelCode": "ONLINE"
         }
-        return self._make_request("POST", "/AvailabilitySearch", data=payload)
+        return self._make_request("POST", "/AvailabilitySearch", data=payload, idempotent=True)
+
+    def check_availability_range(self, start_date: str, end_date: str, party_size: int) -> Dict[str, Any]:
+        """Check availability for every date from start_date to end_date (inclusive) in one call."""
+        payload = {
+            "StartDate": start_date,
+            "EndDate": end_date,
+            "PartySize": party_size, 
+            "ChannelCode": "ONLINE"
+        }
+        return self._make_request("POST", "/AvailabilityRangeSearch", data=payload, idempotent=True)
 
     def create_booking(self, visit_date: str, visit_time: str, party_size: int, 
                       first_name: str, surname: str, email: str, mobile: str) -> Dict[str, Any]:
         """Create a new booking."""
-        print(f"--- Calling API: create_booking ---")
-        print(f"Details: {visit_date} {visit_time} for {party_size} people")
-        
         payload = {
             "VisitDate": visit_date, 
             "VisitTime": visit_time, 
@@ -99,37 +181,27 @@ class BookingAPIClient:
 
     def get_booking_details(self, booking_reference: str) -> Dict[str, Any]:
         """Get details of an existing booking."""
-        print(f"--- Calling API: get_booking_details ---")
-        print(f"Booking Reference: {booking_reference}")
         return self._make_request("GET", f"/Booking/{booking_reference}")
 
     def update_booking(self, booking_reference: str, new_date: Optional[str] = None, 
                       new_time: Optional[str] = None, new_party_size: Optional[int] = None) -> Dict[str, Any]:
         """Update an existing booking."""
-        print(f"--- Calling API: update_booking ---")
-        print(f"Booking Reference: {booking_reference}")
-        
         payload = {}
         if new_date: 
             payload["VisitDate"] = new_date
-            print(f"New date: {new_date}")
         if new_time: 
             payload["VisitTime"] = new_time
-            print(f"New time: {new_time}")
         if new_party_size: 
             payload["PartySize"] = new_party_size
-            print(f"New party size: {new_party_size}")
             
         if not payload:
             return {"status": 400, "error": "No update parameters provided"}
             
-        return self._make_request("PATCH", f"/Booking/{booking_reference}", data=payload)
+        # Setting absolute values, so repeating the call is safe
+        return self._make_request("PATCH", f"/Booking/{booking_reference}", data=payload, idempotent=True)
 
     def cancel_booking(self, booking_reference: str) -> Dict[str, Any]:
         """Cancel an existing booking."""
-        print(f"--- Calling API: cancel_booking ---")
-        print(f"Booking Reference: {booking_reference}")
-        
         payload = {
             "micrositeName": "TheHungryUnicorn", 
             "bookingReference": booking_reference,
@@ -140,12 +212,12 @@ class BookingAPIClient:
     def test_connection(self) -> Dict[str, Any]:
         """Test connection to the server."""
         try:
-            response = requests.get("http://localhost:8547/", timeout=10)
+            response = self.session.get(f"{self.server_url}/", timeout=self.timeout)
             if response.status_code == 200:
                 return {"status": "success", "message": "Server is running"}
             else:
                 return {"status": "error", "message": f"Server returned status {response.status_code}"}
         except requests.exceptions.ConnectionError:
-            return {"status": "error", "message": "Cannot connect to server. Is it running on port 8547?"}
+            return {"status": "error", "message": f"Cannot connect to server. Is it running at {self.server_url}?"}
         except Exception as e:
             return {"status": "error", "message": f"Connection test failed: {str(e)}"}
\ No newline at end of file
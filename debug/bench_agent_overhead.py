@@ -0,0 +1,78 @@
+# Path: debug/bench_agent_overhead.py
+
+import argparse
+import os
+import sys
+import time as timer
+
+# Measure every LLM call rather than replaying memoized classifications
+os.environ["LLM_CACHE_SIZE"] = "0"
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.graph import build_graph
+from agent.llm import LLMRegistry, llm_registry
+from agent.state import AgentState
+from fake_ollama import FakeLLM, install_fake_llm, start_fake_ollama
+
+# Turns that never reach the booking API: rule-classified questions and ones left to the LLM
+MESSAGES = [
+    "Hi", "What is the dress code?", "Is there parking nearby?", "Are you open on bank holidays?",
+    "Can I bring my dog?", "Do you do birthday cakes?", "Can you help me?", "Is it ok if we are a bit late?",
+]
+ROUNDS = 50
+
+
+def run_turns(app):
+    """Return per-turn latencies in ms over ROUNDS passes of MESSAGES."""
+    latencies = []
+    for _ in range(ROUNDS):
+        for message in MESSAGES:
+            start = timer.perf_counter()
+            app.invoke(AgentState(user_message=message))
+            latencies.append((timer.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def bench_agent_overhead(first_token_ms, tokens_per_second):
+    """Time build_graph() turns against the fake LLM, in-process and over HTTP."""
+
+    fake = FakeLLM(first_token_ms=first_token_ms, tokens_per_second=tokens_per_second)
+    server, base_url = start_fake_ollama(fake=fake)
+    http_registry = LLMRegistry(base_url=base_url)
+    app = build_graph()
+    turns = ROUNDS * len(MESSAGES)
+
+    print(f"⏱️  {turns} turns through build_graph(), fake LLM: {first_token_ms:g}ms to first token, "
+          f"{tokens_per_second:g} tok/s (0 = instant)")
+    print("=" * 72)
+    print(f"{'backend':>18} | {'mean ms':>8} | {'p50 ms':>7} | {'p95 ms':>7} | {'LLM calls/turn':>14}")
+    print("-" * 72)
+    try:
+        backends = [
+            ("in-process", lambda: install_fake_llm(llm_registry, fake)),
+            # The HTTP fake behind pooled Ollama clients, as the agent talks to a real server
+            ("HTTP (Ollama API)", lambda: [llm_registry.register(name, http_registry.get(name))
+                                           for name in llm_registry.configs]),
+        ]
+        for label, install in backends:
+            install()
+            calls_before = fake.calls
+            latencies = run_turns(app)
+            calls = fake.calls - calls_before
+            print(f"{label:>18} | {sum(latencies) / turns:>8.2f} | {latencies[turns // 2]:>7.2f} | "
+                  f"{latencies[int(turns * 0.95)]:>7.2f} | {calls / turns:>14.2f}")
+    finally:
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+        http_registry.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the agent's own per-turn overhead with a fake LLM")
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Simulated prompt evaluation time")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated generation speed")
+    args = parser.parse_args()
+    bench_agent_overhead(args.first_token_ms, args.tokens_per_second)
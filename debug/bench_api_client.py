@@ -0,0 +1,90 @@
+# Path: debug/bench_api_client.py
+
+import os
+import sys
+import tempfile
+import time as timer
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_test import start_server
+from api.client import BookingAPIClient
+
+PORT = 8599
+SERVER_URL = f"http://127.0.0.1:{PORT}"
+CALLS = 300
+THREADS = 8
+PAYLOAD = {"VisitDate": str(date.today() + timedelta(days=1)), "PartySize": 2,
+           "ChannelCode": "ONLINE"}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def fresh_connection_call(client):
+    """The original behaviour: module-level requests.request, a new TCP connection per call."""
+    return requests.request("POST", f"{client.base_url}/AvailabilitySearch",
+                            headers=client.headers, data=PAYLOAD, timeout=30)
+
+
+def pooled_call(client):
+    """BookingAPIClient's pooled keep-alive session."""
+    return client.session.request("POST", f"{client.base_url}/AvailabilitySearch",
+                                  data=PAYLOAD, timeout=client.timeout)
+
+
+def client_method_call(client):
+    """The full client method, including response handling."""
+    return client.check_availability(PAYLOAD["VisitDate"], PAYLOAD["PartySize"])
+
+
+def measure(call, client, threads):
+    """Run CALLS calls on `threads` threads; return (calls/sec, p50 ms, p99 ms)."""
+    def timed_call(_):
+        start = timer.perf_counter()
+        call(client)
+        return (timer.perf_counter() - start) * 1000
+
+    start = timer.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(timed_call, range(CALLS)))
+    elapsed = timer.perf_counter() - start
+    return CALLS / elapsed, percentile(latencies, 50), percentile(latencies, 99)
+
+
+def bench_api_client():
+    """Compare a fresh connection per call with the pooled session, sequentially and concurrently."""
+
+    print(f"⏱️  {CALLS} AvailabilitySearch calls against a local server")
+    print("=" * 72)
+    print(f"{'threads':>7} | {'mode':>18} | {'calls/s':>8} | {'p50':>8} | {'p99':>8} | {'saved/call':>10}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(PORT, 1, f"sqlite:///{os.path.join(tmp, 'client.db')}")
+        try:
+            with BookingAPIClient(server_url=SERVER_URL, pool_size=THREADS) as client:
+                for threads in (1, THREADS):
+                    baseline_p50 = None
+                    for mode, call in [("fresh connection", fresh_connection_call),
+                                       ("pooled session", pooled_call),
+                                       ("client method", client_method_call)]:
+                        throughput, p50, p99 = measure(call, client, threads)
+                        baseline_p50 = baseline_p50 or p50
+                        print(f"{threads:>7} | {mode:>18} | {throughput:>8.0f} | {p50:>6.2f}ms | "
+                              f"{p99:>6.2f}ms | {baseline_p50 - p50:>8.2f}ms")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    bench_api_client()
@@ -0,0 +1,97 @@
+# Path: debug/bench_async_agent.py
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time as timer
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PORT = 8599
+os.environ["API_SERVER_URL"] = f"http://127.0.0.1:{PORT}"
+
+from load_test import start_server
+from agent.state import AgentState
+from agent.nodes import execute_api_call
+from agent.async_nodes import aclose_async_api_client, aexecute_api_call
+
+CONVERSATIONS = [50, 200, 500]
+
+
+def new_state(number):
+    """A conversation whose next step is an availability check."""
+    return AgentState(
+        user_message="Any tables?",
+        intent="check_availability",
+        booking_context={"date": str(date.today() + timedelta(days=number % 7)), "party_size": 2}
+    )
+
+
+def run_threaded(conversations):
+    """Sync nodes: every in-flight conversation holds a thread while its API call blocks."""
+    with ThreadPoolExecutor(max_workers=conversations) as pool:
+        states = list(pool.map(execute_api_call, map(new_state, range(conversations))))
+    return states
+
+
+async def run_async(conversations):
+    """Async nodes: all API calls are awaited on one thread and one connection pool."""
+    try:
+        return await asyncio.gather(*(aexecute_api_call(new_state(n)) for n in range(conversations)))
+    finally:
+        await aclose_async_api_client()
+
+
+def measure(fn):
+    """Run fn while sampling the process's thread count; return (seconds, peak threads)."""
+    peak_threads = [threading.active_count()]
+    running = threading.Event()
+    running.set()
+
+    def sample_threads():
+        while running.is_set():
+            peak_threads[0] = max(peak_threads[0], threading.active_count())
+            timer.sleep(0.005)
+
+    sampler = threading.Thread(target=sample_threads)
+    sampler.start()
+    start = timer.perf_counter()
+    states = fn()
+    elapsed = timer.perf_counter() - start
+    running.clear()
+    sampler.join()
+    assert all(state.api_response["status"] == 200 for state in states), \
+        [state.api_response for state in states if state.api_response["status"] != 200][:1]
+    # The sampler itself is not part of either mode
+    return elapsed, peak_threads[0] - 1
+
+
+def bench_async_agent():
+    """Compare a thread per conversation with async nodes on one event loop."""
+
+    print("⏱️  Concurrent conversations hitting execute_api_call (check_availability)")
+    print("=" * 72)
+    print(f"{'conversations':>13} | {'mode':>24} | {'seconds':>8} | {'calls/s':>8} | {'threads':>7}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(PORT, 1, f"sqlite:///{os.path.join(tmp, 'agent.db')}")
+        try:
+            for conversations in CONVERSATIONS:
+                for mode, fn in [("sync, thread per chat", lambda: run_threaded(conversations)),
+                                 ("async, one event loop", lambda: asyncio.run(run_async(conversations)))]:
+                    elapsed, peak_threads = measure(fn)
+                    print(f"{conversations:>13} | {mode:>24} | {elapsed:>8.2f} | "
+                          f"{conversations / elapsed:>8.0f} | {peak_threads:>7}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    bench_async_agent()
@@ -0,0 +1,77 @@
+# Path: debug/bench_async_load.py
+
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+from app.cache import availability_cache
+
+CONCURRENCY = [1, 4, 16, 64]
+REQUESTS_PER_LEVEL = 400
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(app, concurrency: int):
+    """Fire REQUESTS_PER_LEVEL availability searches from `concurrency` concurrent clients."""
+    latencies = []
+    remaining = [REQUESTS_PER_LEVEL]
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+        async def worker(worker_id: int):
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                visit_date = date.today() + timedelta(days=(worker_id + remaining[0]) % 7)
+                start = timer.perf_counter()
+                response = await client.post(
+                    f"{BASE_PATH}/AvailabilitySearch", headers=AUTH_HEADERS,
+                    data={"VisitDate": str(visit_date), "PartySize": 2, "ChannelCode": "ONLINE"}
+                )
+                latencies.append((timer.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.text
+
+        start = timer.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = timer.perf_counter() - start
+
+    return REQUESTS_PER_LEVEL / elapsed, percentile(latencies, 50), percentile(latencies, 99)
+
+
+def bench_async_load():
+    """Show availability search throughput as the number of concurrent clients grows."""
+
+    print("⏱️  Load testing AvailabilitySearch on the async database layer")
+    print(f"   {REQUESTS_PER_LEVEL} requests per level, availability cache disabled")
+    print("=" * 56)
+    print(f"{'clients':>7} | {'req/s':>8} | {'p50':>9} | {'p99':>9} | {'scaling':>7}")
+    print("-" * 56)
+
+    # Measure the database path, not the cache
+    availability_cache.max_entries = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "load.db"))
+        baseline = None
+        for concurrency in CONCURRENCY:
+            throughput, p50, p99 = asyncio.run(run_level(client.app, concurrency))
+            baseline = baseline or throughput
+            print(f"{concurrency:>7} | {throughput:>8.0f} | {p50:>7.2f}ms | {p99:>7.2f}ms | "
+                  f"{throughput / baseline:>6.2f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    bench_async_load()
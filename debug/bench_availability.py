@@ -0,0 +1,137 @@
+# Path: debug/bench_availability.py
+
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, datetime, timedelta
+
+# Add the mock API server to the path so its `app` package can be imported
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Restaurant, Customer, Booking, AvailabilitySlot
+from app.routers.availability import (
+    build_availability_query, group_slots_by_date, MAX_BOOKINGS_PER_SLOT
+)
+
+SLOTS_PER_DAY = [8, 48, 96]
+ITERATIONS = 300
+VISIT_DATE = date.today() + timedelta(days=1)
+
+
+def legacy_available_slots(db, restaurant_id, visit_date, party_size):
+    """The original per-slot COUNT loop, kept here as the baseline."""
+    slots = db.query(AvailabilitySlot).filter(
+        AvailabilitySlot.restaurant_id == restaurant_id,
+        AvailabilitySlot.date == visit_date,
+        AvailabilitySlot.max_party_size >= party_size
+    ).all()
+
+    available_slots = []
+    for slot in slots:
+        existing_bookings = db.query(Booking).filter(
+            Booking.restaurant_id == restaurant_id,
+            Booking.visit_date == visit_date,
+            Booking.visit_time == slot.time,
+            Booking.status == "confirmed"
+        ).count()
+        available_slots.append({
+            "time": slot.time.strftime("%H:%M:%S"),
+            "available": slot.available and existing_bookings < MAX_BOOKINGS_PER_SLOT,
+            "max_party_size": slot.max_party_size,
+            "current_bookings": existing_bookings
+        })
+    return available_slots
+
+
+def grouped_available_slots(db, restaurant_id, visit_date, party_size):
+    """The single grouped query used by the AvailabilitySearch endpoint."""
+    rows = db.execute(
+        build_availability_query(restaurant_id, visit_date, visit_date, party_size)
+    ).all()
+    return group_slots_by_date(rows).get(visit_date, [])
+
+
+def build_database(path: str, slots_per_day: int):
+    """Create a database with one restaurant, 7 days of slots and ~2 bookings per slot."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    restaurant = Restaurant(name="TheHungryUnicorn", microsite_name="TheHungryUnicorn")
+    customer = Customer(first_name="Bench", surname="Mark", email="bench@example.com")
+    db.add_all([restaurant, customer])
+    db.commit()
+
+    step = timedelta(minutes=(24 * 60) // slots_per_day)
+    reference = 0
+    for day in range(-3, 4):
+        visit_date = VISIT_DATE + timedelta(days=day)
+        slot_start = datetime.combine(visit_date, time(0, 0))
+        for i in range(slots_per_day):
+            slot_time = (slot_start + step * i).time()
+            db.add(AvailabilitySlot(
+                restaurant_id=restaurant.id, date=visit_date, time=slot_time,
+                max_party_size=8, available=True
+            ))
+            for _ in range(i % 4):
+                reference += 1
+                db.add(Booking(
+                    booking_reference=f"B{reference:06d}", restaurant_id=restaurant.id,
+                    customer_id=customer.id, visit_date=visit_date, visit_time=slot_time,
+                    party_size=2, channel_code="ONLINE",
+                    status="cancelled" if reference % 5 == 0 else "confirmed"
+                ))
+    db.commit()
+    return engine, db, restaurant.id
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn, db, restaurant_id):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = timer.perf_counter()
+        fn(db, restaurant_id, VISIT_DATE, 2)
+        samples.append((timer.perf_counter() - start) * 1000)
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def bench_availability_search():
+    """Compare the legacy COUNT loop with the single grouped query."""
+
+    print("⏱️  Benchmarking availability search")
+    print("=" * 70)
+    print(f"{'slots/day':>9} | {'legacy p50':>10} | {'legacy p99':>10} | {'query p50':>10} | {'query p99':>10} | {'speedup':>7}")
+    print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for slots_per_day in SLOTS_PER_DAY:
+            engine, db, restaurant_id = build_database(
+                os.path.join(tmp, f"bench_{slots_per_day}.db"), slots_per_day
+            )
+
+            # Both implementations must agree before timing them
+            assert legacy_available_slots(db, restaurant_id, VISIT_DATE, 2) == \
+                grouped_available_slots(db, restaurant_id, VISIT_DATE, 2)
+
+            legacy_p50, legacy_p99 = measure(legacy_available_slots, db, restaurant_id)
+            query_p50, query_p99 = measure(grouped_available_slots, db, restaurant_id)
+
+            print(f"{slots_per_day:>9} | {legacy_p50:>8.2f}ms | {legacy_p99:>8.2f}ms | "
+                  f"{query_p50:>8.2f}ms | {query_p99:>8.2f}ms | {legacy_p50 / query_p50:>6.1f}x")
+
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    bench_availability_search()
@@ -0,0 +1,131 @@
+# Path: debug/bench_booking_creation.py
+
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+
+# Add the mock API server to the path so its `app` package can be imported
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import create_db_engine, create_async_db_engine
+from app.models import Base, Restaurant, Customer, Booking
+from app.routers.availability import MAX_BOOKINGS_PER_SLOT
+from app.routers.booking import (
+    generate_booking_reference, get_or_create_customer, insert_booking
+)
+
+PARALLEL_BOOKINGS = 300
+VISIT_DATE = date.today() + timedelta(days=1)
+# Enough 10-minute slots for every request to fit when spread evenly
+SLOT_TIMES = [time(minutes // 60, minutes % 60)
+              for minutes in range(0, PARALLEL_BOOKINGS // MAX_BOOKINGS_PER_SLOT * 10, 10)]
+
+
+async def legacy_create_booking(db, email, visit_time):
+    """The original flow: commit the customer, SELECT for a free reference, commit the booking."""
+    result = await db.execute(select(Customer).where(Customer.email == email))
+    customer = result.scalars().first()
+    if not customer:
+        customer = Customer(first_name="Guest", email=email)
+        db.add(customer)
+        await db.commit()
+        await db.refresh(customer)
+
+    booking_reference = generate_booking_reference()
+    while (await db.execute(
+        select(Booking.id).where(Booking.booking_reference == booking_reference)
+    )).first():
+        booking_reference = generate_booking_reference()
+
+    booking = Booking(
+        booking_reference=booking_reference, restaurant_id=1, customer_id=customer.id,
+        visit_date=VISIT_DATE, visit_time=visit_time, party_size=2,
+        channel_code="ONLINE", status="confirmed"
+    )
+    db.add(booking)
+    await db.commit()
+    await db.refresh(booking)
+    return booking
+
+
+async def single_transaction_create_booking(db, email, visit_time):
+    """The BookingWithStripeToken flow: one transaction with an atomic capacity check."""
+    customer = await get_or_create_customer(db, first_name="Guest", email=email)
+    booking = await insert_booking(
+        db, max_bookings_per_slot=MAX_BOOKINGS_PER_SLOT, restaurant_id=1,
+        customer_id=customer.id, visit_date=VISIT_DATE, visit_time=visit_time,
+        party_size=2, channel_code="ONLINE", status="confirmed"
+    )
+    if booking is None:
+        await db.rollback()
+        return None
+    await db.commit()
+    return booking
+
+
+def build_database(path: str):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Restaurant).values(id=1, name="TheHungryUnicorn",
+                                                     microsite_name="TheHungryUnicorn"))
+    return engine
+
+
+async def run_parallel(create_fn, path: str, slot_times):
+    """Create PARALLEL_BOOKINGS bookings concurrently; return (bookings/sec, fullest slot)."""
+    async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def book(number):
+        async with session_factory() as db:
+            return await create_fn(db, f"guest{number}@example.com",
+                                   slot_times[number % len(slot_times)])
+
+    try:
+        start = timer.perf_counter()
+        await asyncio.gather(*(book(number) for number in range(PARALLEL_BOOKINGS)))
+        elapsed = timer.perf_counter() - start
+
+        async with session_factory() as db:
+            fullest_slot = (await db.execute(
+                select(func.count(Booking.id)).group_by(Booking.visit_time)
+                .order_by(func.count(Booking.id).desc()).limit(1)
+            )).scalar()
+        return PARALLEL_BOOKINGS / elapsed, fullest_slot
+    finally:
+        await async_engine.dispose()
+
+
+async def bench_booking_creation():
+    """Compare the legacy two-commit flow with single-transaction booking creation."""
+
+    print(f"⏱️  {PARALLEL_BOOKINGS} parallel booking requests (capacity {MAX_BOOKINGS_PER_SLOT} per slot)")
+    print("=" * 70)
+    print(f"{'scenario':>10} | {'flow':>18} | {'req/s':>8} | {'fullest slot':>12} | {'overbooked':>10}")
+    print("-" * 70)
+
+    scenarios = [("one slot", SLOT_TIMES[:1]), ("spread", SLOT_TIMES)]
+    flows = [("legacy", legacy_create_booking),
+             ("single transaction", single_transaction_create_booking)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario, slot_times in scenarios:
+            for flow, create_fn in flows:
+                path = os.path.join(tmp, f"{scenario}_{flow}.db".replace(" ", "_"))
+                engine = build_database(path)
+                throughput, fullest_slot = await run_parallel(create_fn, path, slot_times)
+                overbooked = fullest_slot > MAX_BOOKINGS_PER_SLOT
+                print(f"{scenario:>10} | {flow:>18} | {throughput:>8.0f} | {fullest_slot:>12} | "
+                      f"{'YES' if overbooked else 'no':>10}")
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_booking_creation())
@@ -0,0 +1,108 @@
+# Path: debug/bench_booking_reference.py
+
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+
+# Add the mock API server to the path so its `app` package can be imported
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import create_db_engine, create_async_db_engine
+from app.models import Base, Restaurant, Customer, Booking
+from app.routers.booking import generate_booking_reference, insert_booking
+from app.seed import sequence_booking_reference
+
+EXISTING_BOOKINGS = [10_000, 100_000, 1_000_000]
+NEW_BOOKINGS = 2000
+SEED_BATCH_SIZE = 50_000
+VISIT_DATE = date.today() + timedelta(days=1)
+BOOKING_VALUES = dict(
+    restaurant_id=1, customer_id=1, visit_date=VISIT_DATE, visit_time=time(19, 0),
+    party_size=2, channel_code="ONLINE", status="confirmed"
+)
+
+
+async def legacy_create_booking(db):
+    """The original lookup loop: SELECT until a free reference is found, then insert."""
+    booking_reference = generate_booking_reference()
+    while (await db.execute(
+        select(Booking.id).where(Booking.booking_reference == booking_reference)
+    )).first():
+        booking_reference = generate_booking_reference()
+    booking = Booking(booking_reference=booking_reference, **BOOKING_VALUES)
+    db.add(booking)
+    await db.commit()
+    await db.refresh(booking)
+    return booking
+
+
+async def insert_retry_create_booking(db):
+    """The insert-retry allocator used by BookingWithStripeToken."""
+    booking = await insert_booking(db, **BOOKING_VALUES)
+    await db.commit()
+    return booking
+
+
+def build_database(path: str, existing_bookings: int):
+    """Create a database holding `existing_bookings` bookings, inserted in executemany batches."""
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Restaurant).values(id=1, name="TheHungryUnicorn",
+                                                     microsite_name="TheHungryUnicorn"))
+        connection.execute(insert(Customer).values(id=1, first_name="Bench",
+                                                   email="bench@example.com"))
+        for start in range(0, existing_bookings, SEED_BATCH_SIZE):
+            stop = min(start + SEED_BATCH_SIZE, existing_bookings)
+            connection.execute(insert(Booking), [
+                dict(BOOKING_VALUES, booking_reference=sequence_booking_reference(number))
+                for number in range(start, stop)
+            ])
+    engine.dispose()
+
+
+async def measure(create_fn, path: str) -> float:
+    """Create NEW_BOOKINGS bookings one transaction at a time and return bookings/sec."""
+    async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    try:
+        start = timer.perf_counter()
+        for _ in range(NEW_BOOKINGS):
+            async with session_factory() as db:
+                await create_fn(db)
+        return NEW_BOOKINGS / (timer.perf_counter() - start)
+    finally:
+        await async_engine.dispose()
+
+
+async def bench_booking_reference():
+    """Compare the lookup loop with insert-retry as the bookings table grows."""
+
+    print("⏱️  Benchmarking booking creation by existing table size")
+    print("=" * 64)
+    print(f"{'existing':>10} | {'seed':>7} | {'lookup loop':>13} | {'insert-retry':>14} | {'speedup':>7}")
+    print("-" * 64)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for existing_bookings in EXISTING_BOOKINGS:
+            path = os.path.join(tmp, f"bench_{existing_bookings}.db")
+            seed_start = timer.perf_counter()
+            build_database(path, existing_bookings)
+            seed_seconds = timer.perf_counter() - seed_start
+
+            legacy = await measure(legacy_create_booking, path)
+            insert_retry = await measure(insert_retry_create_booking, path)
+
+            print(f"{existing_bookings:>10,} | {seed_seconds:>6.1f}s | {legacy:>9,.0f}/sec | "
+                  f"{insert_retry:>10,.0f}/sec | {insert_retry / legacy:>6.2f}x")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_booking_reference())
@@ -0,0 +1,288 @@
+# Path: debug/bench_conversations.py
+
+"""
+End-to-end conversation replay benchmark.
+
+Replays a corpus of multi-turn conversations (booking, availability, modify,
+cancel, check) through build_graph() against the mock API, which it starts
+on a throwaway database, and an LLM backend chosen with --llm: the
+deterministic fake in-process (default) or over HTTP, or a real Ollama.
+The report gives per-turn and per-node latency percentiles, LLM and HTTP
+calls per turn and Python heap growth per conversation; --output writes the
+same numbers to a JSON file so runs can be compared between commits with
+--baseline.
+
+Examples:
+    python debug/bench_conversations.py --rounds 5
+    python debug/bench_conversations.py --llm fake-http --first-token-ms 100 --output results.json
+    python debug/bench_conversations.py --output after.json --baseline before.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import tempfile
+import time as timer
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+PORT = 8601
+# Point the agent at the mock API started below, and replay every LLM call rather than memoized ones
+os.environ["API_SERVER_URL"] = f"http://127.0.0.1:{PORT}"
+os.environ["LLM_CACHE_SIZE"] = "0"
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.graph import build_graph
+from agent.llm import LLMRegistry, llm_registry
+from agent.nodes import api_client
+from agent.state import AgentState
+from fake_ollama import FakeLLM, install_fake_llm, start_fake_ollama
+from load_test import git_commit, start_server
+
+# Conversations as lists of messages; {date} is a different day each round so bookings never fill a slot
+CONVERSATIONS = {
+    "booking": [
+        "Hi, do you have tables on {date} for 4?",
+        "Book a table for 4 on {date} at 7pm",
+        "My name is Jane Smith, phone 07700 900123",
+    ],
+    "availability": [
+        "What times are available on {date} for 2 people?",
+        "Do you have any tables free on {date} for 6?",
+    ],
+    "modify": [
+        "Book a table for 2 on {date} at 12pm, my name is Sam Lee, phone 07700 900456",
+        "Can you change my booking to 8pm?",
+    ],
+    "cancel": [
+        "Book a table for 3 on {date} at 1pm, my name is Alex Kim, phone 07700 900789",
+        "Please cancel my booking",
+    ],
+    "check": [
+        "Book a table for 2 on {date} at 7:30pm, my name is Priya Shah, phone 07700 900321",
+        "What time is my reservation?",
+    ],
+}
+
+
+class Counter:
+    """Counts the agent's HTTP calls to the booking API through a requests response hook."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, response, *args, **kwargs):
+        self.count += 1
+        return response
+
+
+def new_samples() -> Dict[str, Any]:
+    return {"turns": [], "llm_calls": [], "http_calls": [], "nodes": defaultdict(list)}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    def pick(pct: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))], 2)
+
+    return {"count": len(ordered), "mean_ms": round(sum(ordered) / len(ordered), 2),
+            "p50_ms": pick(50), "p90_ms": pick(90), "p99_ms": pick(99), "max_ms": round(ordered[-1], 2)}
+
+
+def llm_calls() -> int:
+    return sum(stats["calls"] for stats in llm_registry.stats().values())
+
+
+def run_conversation(app, messages: List[str], visit_date: date, http_calls: Counter,
+                     samples: Dict[str, Any]) -> List[str]:
+    """
+    Replay one conversation the way main_cli.py carries state between turns.
+
+    Node timings come from stream_mode="updates", which yields as each node
+    finishes. Returns the agent's replies.
+    """
+    state = AgentState()
+    replies = []
+    for template in messages:
+        state.user_message = template.format(date=visit_date.isoformat())
+        llm_before, http_before = llm_calls(), http_calls.count
+
+        final: Dict[str, Any] = {}
+        start = last = timer.perf_counter()
+        for mode, chunk in app.stream(state, stream_mode=["updates", "values"]):
+            now = timer.perf_counter()
+            if mode == "updates":
+                for node in chunk:
+                    samples["nodes"][node].append((now - last) * 1000)
+                last = now
+            else:
+                final = chunk
+        samples["turns"].append((timer.perf_counter() - start) * 1000)
+        samples["llm_calls"].append(llm_calls() - llm_before)
+        samples["http_calls"].append(http_calls.count - http_before)
+
+        replies.append(final.get("agent_response", ""))
+        state.conversation_history = final.get("conversation_history", [])
+        state.booking_context = final.get("booking_context", {})
+        state.api_response = None
+        state.agent_response = ""
+    return replies
+
+
+def run_corpus(app, rounds: int, http_calls: Counter, samples: Dict[str, Any], first_day: int = 1) -> None:
+    for round_number in range(rounds):
+        for index, messages in enumerate(CONVERSATIONS.values()):
+            # 28 distinct days inside the 30 days of seeded slots
+            visit_date = date.today() + timedelta(days=first_day + (round_number * len(CONVERSATIONS) + index) % 28)
+            run_conversation(app, messages, visit_date, http_calls, samples)
+
+
+def measure_memory(app, rounds: int, http_calls: Counter) -> Dict[str, Any]:
+    """Python heap growth over further rounds, traced after a warm-up round."""
+    scratch = new_samples()
+    tracemalloc.start()
+    try:
+        run_corpus(app, 1, http_calls, scratch)
+        gc.collect()
+        baseline, _ = tracemalloc.get_traced_memory()
+        run_corpus(app, rounds, http_calls, scratch, first_day=15)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    conversations = rounds * len(CONVERSATIONS)
+    return {
+        "conversations": conversations,
+        "heap_growth_kib": round((current - baseline) / 1024, 1),
+        "heap_growth_per_conversation_kib": round((current - baseline) / 1024 / conversations, 2),
+        "heap_peak_kib": round(peak / 1024, 1),
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def install_backend(args: argparse.Namespace):
+    """Point llm_registry at the chosen LLM backend; returns a cleanup function."""
+    if args.llm == "ollama":
+        return lambda: None
+    fake = FakeLLM(first_token_ms=args.first_token_ms, tokens_per_second=args.tokens_per_second)
+    if args.llm == "fake":
+        install_fake_llm(llm_registry, fake)
+        return lambda: [llm_registry.unregister(name) for name in llm_registry.configs]
+
+    server, base_url = start_fake_ollama(fake=fake)
+    http_registry = LLMRegistry(base_url=base_url)
+    for name in llm_registry.configs:
+        llm_registry.register(name, http_registry.get(name))
+
+    def cleanup():
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+        http_registry.close()
+        server.shutdown()
+    return cleanup
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    app = build_graph()
+    http_calls = Counter()
+    api_client.session.hooks["response"].append(http_calls)
+    samples = new_samples()
+
+    # One untimed round warms imports, connections and the server's caches
+    run_corpus(app, 1, http_calls, new_samples())
+    start = timer.perf_counter()
+    run_corpus(app, args.rounds, http_calls, samples)
+    elapsed = timer.perf_counter() - start
+    turns = len(samples["turns"])
+
+    return {
+        "git_commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "elapsed_seconds": round(elapsed, 3),
+        "conversations": args.rounds * len(CONVERSATIONS),
+        "turns": turns,
+        "turn_latency": percentiles(samples["turns"]),
+        "node_latency": {node: percentiles(values) for node, values in samples["nodes"].items()},
+        "llm_calls_per_turn": round(sum(samples["llm_calls"]) / turns, 3),
+        "http_calls_per_turn": round(sum(samples["http_calls"]) / turns, 3),
+        "memory": measure_memory(app, args.memory_rounds, http_calls),
+    }
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"\n📊 {result['conversations']} conversations, {result['turns']} turns "
+          f"(LLM: {result['config']['llm']}), {result['elapsed_seconds']:.1f}s")
+    print("=" * 78)
+    print(f"{'':>20} | {'count':>6} | {'mean':>8} | {'p50':>8} | {'p90':>8} | {'p99':>8}")
+    print("-" * 78)
+    rows = dict(turn=result["turn_latency"], **result["node_latency"])
+    for name, summary in rows.items():
+        print(f"{name:>20} | {summary['count']:>6} | {summary['mean_ms']:>6.2f}ms | {summary['p50_ms']:>6.2f}ms | "
+              f"{summary['p90_ms']:>6.2f}ms | {summary['p99_ms']:>6.2f}ms")
+    print("-" * 78)
+    memory = result["memory"]
+    print(f"LLM calls per turn:  {result['llm_calls_per_turn']:.2f}")
+    print(f"HTTP calls per turn: {result['http_calls_per_turn']:.2f}")
+    print(f"Heap growth:         {memory['heap_growth_per_conversation_kib']:.2f} KiB per conversation "
+          f"over {memory['conversations']} conversations (peak RSS {memory['max_rss_mib']:.0f} MiB)")
+
+    if baseline:
+        print(f"\n🔁 Compared with {baseline.get('git_commit') or 'baseline'}")
+        print("-" * 60)
+        base_rows = dict(turn=baseline["turn_latency"], **baseline["node_latency"])
+        for name, summary in rows.items():
+            if name not in base_rows or not base_rows[name]["p50_ms"]:
+                continue
+            before, after = base_rows[name]["p50_ms"], summary["p50_ms"]
+            print(f"{name:>20} | p50 {before:>7.2f}ms -> {after:>7.2f}ms ({after / before - 1:+.1%})")
+        for key in ("llm_calls_per_turn", "http_calls_per_turn"):
+            print(f"{key:>20} | {baseline[key]:.2f} -> {result[key]:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay multi-turn conversations through the agent graph.")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed passes over the conversation corpus")
+    parser.add_argument("--memory-rounds", type=int, default=2, help="Passes traced for heap growth")
+    parser.add_argument("--llm", choices=["fake", "fake-http", "ollama"], default="fake",
+                        help="LLM backend: in-process fake, fake over the Ollama HTTP API, or OLLAMA_BASE_URL")
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Fake LLM delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Fake LLM generation speed; 0 is instant")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a previous --output file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(PORT, 1, f"sqlite:///{os.path.join(tmp, 'conversations.db')}")
+        cleanup = install_backend(args)
+        try:
+            result = run_benchmark(args)
+        finally:
+            cleanup()
+            api_client.close()
+            server.terminate()
+            server.wait()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
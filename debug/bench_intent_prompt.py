@@ -0,0 +1,110 @@
+# Path: debug/bench_intent_prompt.py
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.nodes import build_intent_prompt
+from agent.prompt_builder import estimate_tokens
+from agent.prompts import INTENT_CLASSIFICATION_PROMPT, INTENT_CLASSIFICATION_TURN
+from agent.state import AgentState
+
+# A booking conversation: (user message, booking context after the turn, assistant reply)
+CONVERSATION = [
+    ("Hi, do you have tables this Friday?", {"date": "2025-10-24"},
+     "I'd be happy to check Friday for you! How many people will be joining you?"),
+    ("For 4 people please", {"date": "2025-10-24", "party_size": 4, "time": None},
+     "Good news! On Friday 24 October we have tables for 4 people at 12:00 PM, 1:00 PM, 6:00 PM, "
+     "7:00 PM and 7:30 PM. Which time would you like me to book?"),
+    ("7:30 sounds great, let's book it", {"date": "2025-10-24", "party_size": 4, "time": "19:30"},
+     "Lovely choice! To complete the booking for 4 people on Friday 24 October at 7:30 PM, could you "
+     "give me the name for the reservation and a contact phone number?"),
+    ("It's Jane Smith, 07700 900123", {"date": "2025-10-24", "party_size": 4, "time": "19:30",
+                                       "customer_name": "Jane Smith", "phone": "07700 900123"},
+     "Your table is booked! Your booking reference is ABC1234: 4 people on Friday 24 October at 7:30 PM, "
+     "under the name Jane Smith. Please keep the reference handy to check or cancel your booking."),
+    ("Do you have vegetarian options?", {"date": "2025-10-24", "party_size": 4, "time": "19:30",
+                                         "customer_name": "Jane Smith", "phone": "07700 900123",
+                                         "booking_reference": "ABC1234"},
+     "Yes! Our menu has a wide range of vegetarian dishes, including seasonal starters, a wild mushroom "
+     "risotto and a roasted vegetable wellington, and the kitchen is happy to adapt most dishes."),
+    ("Actually can we make that 6 people?", {"date": "2025-10-24", "party_size": 4, "time": "19:30",
+                                             "customer_name": "Jane Smith", "phone": "07700 900123",
+                                             "booking_reference": "ABC1234", "new_party_size": 6},
+     "Done! Booking ABC1234 is now for 6 people on Friday 24 October at 7:30 PM."),
+    ("What time is my reservation again?", {"date": "2025-10-24", "party_size": 6, "time": "19:30",
+                                            "customer_name": "Jane Smith", "phone": "07700 900123",
+                                            "booking_reference": "ABC1234"},
+     "Booking ABC1234 is for 6 people on Friday 24 October at 7:30 PM, under the name Jane Smith."),
+]
+
+# How a chatty LLM tends to end its replies; appended to every reply for the verbose run
+VERBOSE_TAIL = (" If you have any other questions about your visit, our menu, dietary requirements, parking or "
+                "accessibility, just let me know and I'll be happy to help. We look forward to welcoming you to "
+                "TheHungryUnicorn!")
+
+
+def legacy_intent_prompt(state):
+    """The original layout: last 4 messages and indented context placed above the instructions."""
+    header, instructions = INTENT_CLASSIFICATION_PROMPT.split("\n\n", 1)
+    context = "".join(f"{msg['role'].title()}: {msg['content']}\n" for msg in state.conversation_history[-4:])
+    return (header.replace(" at the end of this prompt", "") + "\n\nCONTEXT:" +
+            INTENT_CLASSIFICATION_TURN.split("CONTEXT:", 1)[1].format(
+                conversation_history=context,
+                current_booking_context=json.dumps(state.booking_context, indent=2),
+                user_message=state.user_message) + "\n" + instructions)
+
+
+def uncached_tokens(prompt, previous):
+    """Tokens after the prefix shared with the previous call, which a prefix cache cannot reuse."""
+    return estimate_tokens(prompt[len(os.path.commonprefix([prompt, previous])):])
+
+
+def run_conversation(reply_tail=""):
+    """Print per-turn token counts; returns the totals per layout as [tokens, uncached]."""
+    print(f"{'turn':>4} | {'before':>7} | {'after':>7} | {'before uncached':>15} | {'after uncached':>14}")
+    print("-" * 76)
+
+    state = AgentState()
+    previous = {"before": "", "after": ""}
+    totals = {"before": [0, 0], "after": [0, 0]}
+    for number, (message, context, reply) in enumerate(CONVERSATION, 1):
+        state.user_message = message
+        prompts = {"before": legacy_intent_prompt(state), "after": build_intent_prompt(state)}
+        row = []
+        for layout, prompt in prompts.items():
+            tokens, uncached = estimate_tokens(prompt), uncached_tokens(prompt, previous[layout])
+            totals[layout][0] += tokens
+            totals[layout][1] += uncached
+            previous[layout] = prompt
+            row.append((tokens, uncached))
+        print(f"{number:>4} | {row[0][0]:>7} | {row[1][0]:>7} | {row[0][1]:>15} | {row[1][1]:>14}")
+
+        state.booking_context = context
+        state.conversation_history += [{"role": "user", "content": message},
+                                       {"role": "assistant", "content": reply + reply_tail}]
+
+    before, after = totals["before"], totals["after"]
+    print("-" * 76)
+    print(f"{'all':>4} | {before[0]:>7} | {after[0]:>7} | {before[1]:>15} | {after[1]:>14}")
+    print(f"Prompt tokens {after[0] / before[0] - 1:+.0%}; "
+          f"tokens the model evaluates with a prefix cache {after[1] / before[1] - 1:+.0%}")
+    return totals
+
+
+def bench_intent_prompt():
+    """Report intent prompt tokens per turn, total and not reusable from the prefix cache."""
+
+    print(f"⏱️  Intent prompt size over a {len(CONVERSATION)}-turn conversation (~4 chars/token)")
+    print("=" * 76)
+    run_conversation()
+    print()
+    print("⏱️  Same conversation with verbose assistant replies")
+    print("=" * 76)
+    run_conversation(VERBOSE_TAIL)
+
+
+if __name__ == "__main__":
+    bench_intent_prompt()
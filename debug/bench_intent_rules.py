@@ -0,0 +1,96 @@
+# Path: debug/bench_intent_rules.py
+
+import argparse
+import os
+import sys
+import time as timer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.state import AgentState
+from agent.llm import llm_registry
+from agent.nodes import (
+    INTENT_RULE_THRESHOLD, build_intent_prompt, apply_rule_intent, classify_intent_with_rules
+)
+
+# The messages from debug/test_intents.py: (message, expected intent, booking context)
+CORPUS = [
+    ("Check my booking ABC123", "check_booking", {}),
+    ("What time is my reservation?", "check_booking", {}),
+    ("Can you tell me the details of my booking?", "check_booking", {}),
+    ("What times are available for Friday?", "check_availability", {}),
+    ("Do you have any tables free this weekend?", "check_availability", {}),
+    ("Are you open tomorrow for dinner?", "check_availability", {}),
+    ("Book a table for 4 people tomorrow at 7pm", "make_booking", {}),
+    ("I'd like to make a reservation", "make_booking", {}),
+    ("Reserve a table for tonight", "make_booking", {}),
+    ("Cancel my booking ABC123", "cancel_booking", {}),
+    ("I need to cancel my reservation for tomorrow", "cancel_booking", {}),
+    ("Delete my booking please", "cancel_booking", {}),
+    ("Change my booking from 6pm to 8pm", "modify_booking", {}),
+    ("Reschedule my reservation to next week", "modify_booking", {}),
+    ("Update my booking for 6 people instead of 4", "modify_booking", {}),
+    # The conversation flow, with the context gathered by the earlier steps
+    ("I'd like to book a table", "make_booking", {}),
+    ("For tomorrow at 7pm", "make_booking", {}),
+    ("For 4 people", "make_booking", {"date": "tomorrow", "time": "7pm"}),
+    ("My name is John Smith, phone 123-456-7890", "make_booking",
+     {"date": "tomorrow", "time": "7pm", "party_size": 4}),
+]
+ROUNDS = 1000
+
+
+def measure_llm_latency():
+    """Time one LLM classification of the first corpus message; None if Ollama is not reachable."""
+    state = AgentState(user_message=CORPUS[0][0])
+    try:
+        start = timer.perf_counter()
+        llm_registry.invoke("classification", build_intent_prompt(state))
+        return (timer.perf_counter() - start) * 1000
+    except Exception as e:
+        print(f"LLM not reachable ({type(e).__name__}); pass --llm-latency-ms to estimate savings")
+        return None
+
+
+def bench_intent_rules(llm_latency_ms=None):
+    """Report rule accuracy, how many LLM calls the fast path avoids, and the time it saves."""
+
+    print(f"⏱️  Rule-based intent fast path on {len(CORPUS)} messages (threshold {INTENT_RULE_THRESHOLD})")
+    print("=" * 96)
+    print(f"{'message':<46} | {'expected':>18} | {'rules':>18} | {'conf':>4} | {'path':>4}")
+    print("-" * 96)
+
+    correct = avoided = 0
+    for message, expected, context in CORPUS:
+        result = classify_intent_with_rules(message, context)
+        fast = apply_rule_intent(AgentState(user_message=message, booking_context=dict(context)))
+        correct += result["intent"] == expected
+        avoided += fast
+        mark = "" if result["intent"] == expected else " ❌"
+        print(f"{message[:46]:<46} | {expected:>18} | {result['intent']:>18} | "
+              f"{result['confidence']:.2f} | {'rule' if fast else 'LLM':>4}{mark}")
+
+    start = timer.perf_counter()
+    for _ in range(ROUNDS):
+        for message, _, context in CORPUS:
+            apply_rule_intent(AgentState(user_message=message, booking_context=dict(context)))
+    rule_us = (timer.perf_counter() - start) / (ROUNDS * len(CORPUS)) * 1e6
+
+    print("-" * 96)
+    print(f"Rule accuracy:       {correct}/{len(CORPUS)} ({correct / len(CORPUS):.0%})")
+    print(f"LLM calls avoided:   {avoided}/{len(CORPUS)} ({avoided / len(CORPUS):.0%})")
+    print(f"Rule fast path cost: {rule_us:.1f}µs per message")
+
+    llm_latency_ms = llm_latency_ms or measure_llm_latency()
+    if llm_latency_ms:
+        saved = avoided * llm_latency_ms / len(CORPUS)
+        print(f"LLM classification:  {llm_latency_ms:.0f}ms per call")
+        print(f"Mean saving:         {saved:.0f}ms per message ({avoided} × {llm_latency_ms:.0f}ms over {len(CORPUS)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rule-based intent fast path")
+    parser.add_argument("--llm-latency-ms", type=float,
+                        help="LLM classification latency to assume instead of measuring it")
+    args = parser.parse_args()
+    bench_intent_rules(args.llm_latency_ms)
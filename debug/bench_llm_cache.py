@@ -0,0 +1,85 @@
+# Path: debug/bench_llm_cache.py
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time as timer
+
+PORT = 8600
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Messages the intent rules leave to the LLM, with repeats and trivially different variants
+MESSAGES = [
+    "Can I bring my dog?", "can i bring my dog", "Do you do birthday cakes?", "do you do birthday cakes",
+    "Can you help me?", "can you help me??", "Hmm, not sure yet", "hmm, not sure yet.",
+    "Could we do something on Friday?", "could we do something on friday?",
+    "Is it ok if we are a bit late?", "Is it ok if we are a bit late?", "What about the 25th?",
+    "Can I bring my dog?", "Can you help me?", "Do you do birthday cakes?",
+]
+
+
+def run_messages():
+    """Child process: classify MESSAGES with fresh state and print the counters as JSON."""
+    sys.path.append(ROOT)
+    from agent.llm import llm_registry
+    from agent.llm_cache import llm_cache
+    from agent.nodes import classify_intent
+    from agent.state import AgentState
+
+    start = timer.perf_counter()
+    for message in MESSAGES:
+        classify_intent(AgentState(user_message=message))
+    elapsed = timer.perf_counter() - start
+    print(json.dumps({"elapsed_ms": elapsed * 1000, "llm_calls": llm_registry.stats()["classification"]["calls"],
+                      "cache": llm_cache.stats()}))
+
+
+def run_process(env):
+    """Run the messages in a new process and return its counters."""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_llm_cache(llm_latency_ms):
+    """Compare LLM classification calls with the cache off, in memory, and across restarts via SQLite."""
+
+    sys.path.append(ROOT)
+    from fake_ollama import FakeLLM, start_fake_ollama
+
+    server, _ = start_fake_ollama(PORT, FakeLLM(first_token_ms=llm_latency_ms))
+
+    print(f"⏱️  {len(MESSAGES)} messages through classify_intent, {llm_latency_ms:g}ms per LLM call (fake Ollama)")
+    print("=" * 74)
+    print(f"{'cache':>26} | {'LLM calls':>9} | {'hit rate':>8} | {'disk hits':>9} | {'total ms':>8}")
+    print("-" * 74)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = {**os.environ, "OLLAMA_BASE_URL": f"http://127.0.0.1:{PORT}", "LLM_CACHE_PATH": ""}
+            sqlite_env = {**base, "LLM_CACHE_PATH": os.path.join(tmp, "llm_cache.db")}
+            runs = [
+                ("off", {**base, "LLM_CACHE_SIZE": "0"}),
+                ("memory", base),
+                ("SQLite, first process", sqlite_env),
+                ("SQLite, after restart", sqlite_env),
+            ]
+            for label, env in runs:
+                result = run_process(env)
+                print(f"{label:>26} | {result['llm_calls']:>9} | {result['cache']['hit_rate']:>8.0%} | "
+                      f"{result['cache']['disk_hits']:>9} | {result['elapsed_ms']:>8.0f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the LLM response cache")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="Simulated LLM latency per call")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_messages()
+    else:
+        bench_llm_cache(args.llm_latency_ms)
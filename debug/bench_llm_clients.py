@@ -0,0 +1,55 @@
+# Path: debug/bench_llm_clients.py
+
+import os
+import sys
+import time as timer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_community.chat_models import ChatOllama
+from agent.llm import LLMRegistry
+from fake_ollama import start_fake_ollama
+
+CALLS = 300
+
+
+def per_call_client(base_url):
+    """The original generate_response: a new ChatOllama (and connection) for every turn."""
+    return lambda prompt: ChatOllama(model="llama3.2", base_url=base_url).invoke(prompt).content
+
+
+def measure(call, handler):
+    """Return (ms per call, connections opened) over CALLS calls."""
+    handler.connections = 0
+    start = timer.perf_counter()
+    for _ in range(CALLS):
+        call("Say ok")
+    elapsed = timer.perf_counter() - start
+    return elapsed / CALLS * 1000, handler.connections
+
+
+def bench_llm_clients():
+    """Compare constructing an LLM client per call with the shared registry."""
+
+    server, base_url = start_fake_ollama()
+    registry = LLMRegistry(base_url=base_url)
+
+    print(f"⏱️  {CALLS} LLM calls against an instant fake Ollama (debug/fake_ollama.py)")
+    print("=" * 58)
+    print(f"{'client':>24} | {'ms/call':>8} | {'connections':>11}")
+    print("-" * 58)
+    try:
+        for mode, call in [("new ChatOllama per call", per_call_client(base_url)),
+                           ("LLMRegistry", lambda prompt: registry.invoke("generation", prompt))]:
+            per_call, connections = measure(call, server.RequestHandlerClass)
+            print(f"{mode:>24} | {per_call:>8.3f} | {connections:>11}")
+        print("-" * 58)
+        print(f"Registry stats: {registry.stats()['generation']}")
+    finally:
+        registry.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    bench_llm_clients()
@@ -0,0 +1,93 @@
+# Path: debug/bench_logging.py
+
+import json
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PORT = 8599
+os.environ["API_SERVER_URL"] = f"http://127.0.0.1:{PORT}"
+
+from load_test import start_server
+from agent.state import AgentState
+from agent.graph import should_continue_after_parameters
+from agent.nodes import (
+    build_intent_prompt, apply_intent_response, process_parameters,
+    execute_api_call, build_response_prompt, record_exchange
+)
+from utils.log import configure_logging
+
+TURNS = 300
+# What the intent LLM returns for an availability question; the LLM itself is not benchmarked
+LLM_RESPONSE = json.dumps({
+    "intent": "check_availability",
+    "parameters": {"date": str(date.today() + timedelta(days=1)), "party_size": 2},
+    "needs_clarification": False,
+    "clarification_message": ""
+})
+MODES = [
+    ("off (WARNING)", {"level": "WARNING"}),
+    ("DEBUG, text", {"level": "DEBUG", "fmt": "text"}),
+    ("DEBUG, json", {"level": "DEBUG", "fmt": "json"}),
+    ("DEBUG, 10% sampled", {"level": "DEBUG", "fmt": "text", "sample_rate": 0.1}),
+]
+
+
+def run_turn(state):
+    """One agent turn without the LLMs: every node and router that logs, plus a real API call."""
+    state.user_message = "Any tables for two tomorrow?"
+    build_intent_prompt(state)
+    apply_intent_response(state, LLM_RESPONSE)
+    process_parameters(state)
+    if should_continue_after_parameters(state) == "execute_api_call":
+        execute_api_call(state)
+    build_response_prompt(state)
+    record_exchange(state, "We have tables available.")
+    state.conversation_history = state.conversation_history[-4:]
+
+
+def measure(log_file, **options):
+    """Return (mean ms per turn, bytes logged per turn) with logging configured by options."""
+    configure_logging(stream=log_file, **options)
+    state = AgentState()
+    run_turn(state)  # warm the connection pool
+    log_file.flush()
+    logged_before = log_file.tell()
+    start = timer.perf_counter()
+    for _ in range(TURNS):
+        run_turn(state)
+    elapsed = timer.perf_counter() - start
+    log_file.flush()
+    return elapsed / TURNS * 1000, (log_file.tell() - logged_before) / TURNS
+
+
+def bench_logging():
+    """Per-turn overhead of logging off, on, as JSON and sampled."""
+
+    print(f"⏱️  {TURNS} agent turns (availability check against a local server)")
+    print("=" * 60)
+    print(f"{'logging':>20} | {'ms/turn':>8} | {'overhead':>9} | {'bytes/turn':>10}")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(PORT, 1, f"sqlite:///{os.path.join(tmp, 'logging.db')}")
+        try:
+            with open(os.path.join(tmp, "agent.log"), "w") as log_file:
+                baseline = None
+                for mode, options in MODES:
+                    per_turn, logged = measure(log_file, **options)
+                    baseline = baseline or per_turn
+                    print(f"{mode:>20} | {per_turn:>8.3f} | {per_turn - baseline:>+7.3f}ms | {logged:>10.0f}")
+        finally:
+            server.terminate()
+            server.wait()
+            configure_logging()
+
+
+if __name__ == "__main__":
+    bench_logging()
@@ -0,0 +1,78 @@
+# Path: debug/bench_parameter_extraction.py
+
+import argparse
+import os
+import sys
+import time as timer
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.nodes import extract_parameters_with_rules
+from bench_intent_rules import measure_llm_latency
+
+TODAY = date.today()
+TOMORROW = str(TODAY + timedelta(days=1))
+
+# The cases from debug/test_intents.py::test_parameter_extraction, then wider coverage
+CASES = [
+    ("Book a table for 4 people tomorrow at 7pm, my name is John Smith, phone 123-456-7890",
+     {"party_size": 4, "customer_name": "John Smith", "phone": "123-456-7890"}),
+    ("Check my booking ABC123", {"booking_reference": "ABC123"}),
+    ("Cancel reservation REF456", {"booking_reference": "REF456"}),
+    ("Table for two people please", {"party_size": 2}),
+    ("Book a table for 4 people tomorrow at 7pm", {"party_size": 4, "date": TOMORROW, "time": "19:00"}),
+    ("Are you free tonight for 2?", {"date": str(TODAY), "party_size": 2}),
+    ("party of 3 on 2026-12-01 at 19:30", {"party_size": 3, "date": "2026-12-01", "time": "19:30"}),
+    ("just the two of us at 8.30pm", {"party_size": 2, "time": "20:30"}),
+    ("Reserve a table at noon under the name Jones", {"time": "12:00", "customer_name": "Jones"}),
+    ("I'm Sarah, mobile +44 7700 900123", {"customer_name": "Sarah", "phone": "+44 7700 900123"}),
+    ("Cancel my booking ABC1234", {"booking_reference": "ABC1234"}),
+    ("What times are available in 3 days for six?",
+     {"date": str(TODAY + timedelta(days=3)), "party_size": 6}),
+]
+ROUNDS = 2000
+
+
+def bench_parameter_extraction(llm_latency_ms=None):
+    """Report per-field accuracy and per-message latency of the local extractor."""
+
+    print(f"⏱️  extract_parameters_with_rules on {len(CASES)} messages")
+    print("=" * 78)
+
+    fields_correct = fields_total = exact = 0
+    for message, expected in CASES:
+        extracted = extract_parameters_with_rules(message)
+        correct = sum(extracted.get(key) == value for key, value in expected.items())
+        fields_correct += correct
+        fields_total += len(expected)
+        exact += correct == len(expected)
+        status = "✅" if correct == len(expected) else "❌"
+        print(f"{status} {message[:60]:<60} {correct}/{len(expected)}")
+        if correct != len(expected):
+            print(f"   expected {expected}, got {extracted}")
+
+    messages = [message for message, _ in CASES]
+    start = timer.perf_counter()
+    for _ in range(ROUNDS):
+        for message in messages:
+            extract_parameters_with_rules(message)
+    extraction_us = (timer.perf_counter() - start) / (ROUNDS * len(messages)) * 1e6
+
+    print("-" * 78)
+    print(f"Fields extracted:  {fields_correct}/{fields_total} ({fields_correct / fields_total:.0%})")
+    print(f"Messages correct:  {exact}/{len(CASES)}")
+    print(f"Extraction cost:   {extraction_us:.1f}µs per message (one scan)")
+
+    llm_latency_ms = llm_latency_ms or measure_llm_latency()
+    if llm_latency_ms:
+        print(f"LLM extraction:    {llm_latency_ms:.0f}ms per call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the local parameter extractor")
+    parser.add_argument("--llm-latency-ms", type=float,
+                        help="LLM classification latency to assume instead of measuring it")
+    args = parser.parse_args()
+    bench_parameter_extraction(args.llm_latency_ms)
@@ -0,0 +1,110 @@
+# Path: debug/bench_sqlite_concurrency.py
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time as timer
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from mock_server import seed_database, SLOT_TIMES
+from app.database import create_db_engine
+from app.models import Base, Customer, Booking
+from app.routers.availability import build_availability_query
+
+THREADS = [1, 4, 16]
+DURATION_SECONDS = 3.0
+WRITE_RATIO = 0.2
+
+
+def run_mixed_workload(engine, threads: int):
+    """Run availability reads and booking inserts from `threads` threads for a fixed time."""
+    Session = sessionmaker(bind=engine)
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = timer.perf_counter() + DURATION_SECONDS
+
+    def worker(worker_id: int):
+        rng = random.Random(worker_id)
+        sequence = 0
+        while timer.perf_counter() < deadline:
+            visit_date = date.today() + timedelta(days=rng.randrange(7))
+            db = Session()
+            try:
+                if rng.random() < WRITE_RATIO:
+                    sequence += 1
+                    db.add(Booking(
+                        booking_reference=f"T{worker_id:02d}{sequence:07d}", restaurant_id=1,
+                        customer_id=1, visit_date=visit_date, visit_time=rng.choice(SLOT_TIMES),
+                        party_size=2, channel_code="ONLINE", status="confirmed"
+                    ))
+                    db.commit()
+                    kind = "writes"
+                else:
+                    db.execute(build_availability_query(1, visit_date, visit_date, 2)).all()
+                    kind = "reads"
+            except OperationalError:
+                db.rollback()
+                kind = "errors"
+            finally:
+                db.close()
+            with lock:
+                counters[kind] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = timer.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = timer.perf_counter() - start
+    return counters, elapsed
+
+
+def prepare(engine):
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    seed_database(Session)
+    db = Session()
+    db.add(Customer(first_name="Bench", surname="Mark", email="bench@example.com"))
+    db.commit()
+    db.close()
+
+
+def bench_sqlite_concurrency():
+    """Compare the default engine with the tuned WAL engine under mixed load."""
+
+    print("⏱️  Benchmarking mixed read/write throughput")
+    print(f"   {int(WRITE_RATIO * 100)}% writes, {DURATION_SECONDS:.0f}s per run")
+    print("=" * 72)
+    print(f"{'engine':>8} | {'threads':>7} | {'reads/s':>8} | {'writes/s':>8} | {'total/s':>8} | {'lock errors':>11}")
+    print("-" * 72)
+
+    configurations = {
+        "default": lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+        "tuned": lambda url: create_db_engine(url),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in configurations.items():
+            for threads in THREADS:
+                url = f"sqlite:///{os.path.join(tmp, f'{name}_{threads}.db')}"
+                engine = factory(url)
+                prepare(engine)
+                counters, elapsed = run_mixed_workload(engine, threads)
+                total = counters["reads"] + counters["writes"]
+                print(f"{name:>8} | {threads:>7} | {counters['reads'] / elapsed:>8.0f} | "
+                      f"{counters['writes'] / elapsed:>8.0f} | {total / elapsed:>8.0f} | "
+                      f"{counters['errors']:>11}")
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    bench_sqlite_concurrency()
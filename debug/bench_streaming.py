@@ -0,0 +1,69 @@
+# Path: debug/bench_streaming.py
+
+import argparse
+import os
+import sys
+import time as timer
+
+PORT = 8599
+# Point the agent at the fake Ollama before it creates its LLM clients
+os.environ["OLLAMA_BASE_URL"] = f"http://127.0.0.1:{PORT}"
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.graph import build_graph, stream_turn
+from agent.state import AgentState
+from fake_ollama import FakeLLM, start_fake_ollama
+
+MESSAGE = "What are your opening hours?"
+TURNS = 5
+
+
+def blocking_turn(app):
+    """The current CLI/web path: nothing is shown until app.invoke returns."""
+    start = timer.perf_counter()
+    app.invoke(AgentState(user_message=MESSAGE))
+    elapsed = (timer.perf_counter() - start) * 1000
+    return elapsed, elapsed
+
+
+def streamed_turn(app):
+    """The streaming path: the first token is shown as soon as the model produces it."""
+    turn = stream_turn(app, AgentState(user_message=MESSAGE))
+    for _ in turn:
+        pass
+    return turn.first_token_ms, turn.total_ms
+
+
+def bench_streaming(tokens, tokens_per_second, first_token_delay_ms):
+    """Compare time to first visible text with and without streaming the reply."""
+
+    reply = " ".join(f"word{index}" for index in range(tokens))
+    fake = FakeLLM(first_token_ms=first_token_delay_ms, tokens_per_second=tokens_per_second,
+                   responses={"general_inquiry": reply})
+    server, _ = start_fake_ollama(PORT, fake)
+    app = build_graph()
+
+    print(f"⏱️  '{MESSAGE}' x{TURNS}: {tokens} tokens at {tokens_per_second:g} tok/s, "
+          f"{first_token_delay_ms:g}ms to first token (fake Ollama)")
+    print("=" * 62)
+    print(f"{'mode':>10} | {'first text ms':>13} | {'full reply ms':>13}")
+    print("-" * 62)
+    try:
+        for mode, run in [("blocking", blocking_turn), ("streaming", streamed_turn)]:
+            timings = [run(app) for _ in range(TURNS)]
+            first = sum(timing[0] for timing in timings) / TURNS
+            total = sum(timing[1] for timing in timings) / TURNS
+            print(f"{mode:>10} | {first:>13.0f} | {total:>13.0f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark time to first token of streamed replies")
+    parser.add_argument("--tokens", type=int, default=60, help="Tokens per reply")
+    parser.add_argument("--tokens-per-second", type=float, default=30.0, help="Generation speed")
+    parser.add_argument("--first-token-ms", type=float, default=200.0, help="Prompt evaluation time")
+    args = parser.parse_args()
+    bench_streaming(args.tokens, args.tokens_per_second, args.first_token_ms)
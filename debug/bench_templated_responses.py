@@ -0,0 +1,83 @@
+# Path: debug/bench_templated_responses.py
+
+import argparse
+import os
+import sys
+import time as timer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.state import AgentState
+from agent.responses import render_response
+from bench_intent_rules import measure_llm_latency
+
+CUSTOMER = {"first_name": "Jane", "surname": "Smith", "email": "jane@example.com"}
+
+# API results as BookingAPIClient returns them, for each templated intent and a few that are not
+TURNS = [
+    ("check_availability", {"status": 200, "data": {
+        "restaurant": "TheHungryUnicorn", "visit_date": "2025-10-24", "party_size": 4, "total_slots": 3,
+        "available_slots": [{"time": "12:00:00", "available": True}, {"time": "13:00:00", "available": False},
+                            {"time": "19:30:00", "available": True}]}}, {}),
+    ("check_availability", {"status": 200, "data": {
+        "restaurant": "TheHungryUnicorn", "visit_date": "2025-10-25", "party_size": 8, "total_slots": 1,
+        "available_slots": [{"time": "19:00:00", "available": False}]}}, {}),
+    ("make_booking", {"status": 201, "data": {
+        "booking_reference": "ABC1234", "visit_date": "2025-10-24", "visit_time": "19:30:00",
+        "party_size": 4, "customer": CUSTOMER}}, {}),
+    ("make_booking", {"status": 409, "error": {"detail": "Time slot is fully booked"}},
+     {"date": "2025-10-24", "time": "19:00"}),
+    ("check_booking", {"status": 200, "data": {
+        "booking_reference": "ABC1234", "visit_date": "2025-10-24", "visit_time": "19:30:00",
+        "party_size": 4, "status": "confirmed", "customer": CUSTOMER}}, {"booking_reference": "ABC1234"}),
+    ("check_booking", {"status": 404, "error": {"detail": "Booking not found"}}, {"booking_reference": "XYZ9999"}),
+    ("cancel_booking", {"status": 200, "data": {
+        "booking_reference": "ABC1234", "status": "cancelled", "message": "Booking cancelled"}},
+     {"booking_reference": "ABC1234"}),
+    ("cancel_booking", {"status": 500, "error": "Connection error: API server is not running"},
+     {"booking_reference": "ABC1234"}),
+    ("modify_booking", {"status": 200, "data": {"booking_reference": "ABC1234", "message": "Booking updated"}},
+     {"booking_reference": "ABC1234"}),
+    ("general_inquiry", None, {}),
+]
+ROUNDS = 10000
+
+
+def bench_templated_responses(llm_latency_ms=None):
+    """Count the turns answered without an LLM generation call and what rendering costs."""
+
+    print(f"⏱️  render_response on {len(TURNS)} API results")
+    print("=" * 78)
+
+    states = [AgentState(intent=intent, api_response=response, booking_context=context)
+              for intent, response, context in TURNS]
+    templated = 0
+    for state in states:
+        reply = render_response(state)
+        templated += reply is not None
+        print(f"{state.intent:>18} {state.api_response.get('status') if state.api_response else '-':>4} | "
+              f"{reply if reply is not None else '(LLM)'}")
+
+    start = timer.perf_counter()
+    for _ in range(ROUNDS):
+        for state in states:
+            render_response(state)
+    render_us = (timer.perf_counter() - start) / (ROUNDS * len(states)) * 1e6
+
+    print("-" * 78)
+    print(f"Templated replies:  {templated}/{len(states)} turns need no LLM generation call")
+    print(f"Render cost:        {render_us:.1f}µs per turn")
+
+    llm_latency_ms = llm_latency_ms or measure_llm_latency()
+    if llm_latency_ms:
+        print(f"LLM generation:     {llm_latency_ms:.0f}ms per call, "
+              f"{llm_latency_ms * templated / len(states):.0f}ms saved per turn on this mix")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark templated response generation")
+    parser.add_argument("--llm-latency-ms", type=float,
+                        help="LLM latency to assume instead of measuring it")
+    args = parser.parse_args()
+    bench_templated_responses(args.llm_latency_ms)
@@ -0,0 +1,275 @@
+# Path: debug/fake_ollama.py
+
+"""
+A deterministic stand-in for Ollama, for benchmarking and testing the agent without a model.
+
+Replies are derived from the prompt: intent classification prompts get the
+JSON the local rules produce (or a scripted reply), response generation
+prompts get canned text per intent, and polish prompts return the draft.
+Latency is simulated as a delay before the first token plus a fixed number
+of tokens per second.
+
+Use it in-process with FakeChatModel and LLMRegistry.register, or run it as
+an HTTP server speaking the Ollama chat API:
+
+    python debug/fake_ollama.py --port 11434 --first-token-ms 200 --tokens-per-second 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.pydantic_v1 import Field
+
+from agent.llm_cache import normalize_prompt
+from agent.nodes import classify_intent_with_rules, extract_parameters_with_rules
+from agent.prompts import INTENT_CLASSIFICATION_PROMPT, RESPONSE_GENERATION_PROMPT, RESPONSE_POLISH_PROMPT
+
+MODEL = "llama3.2"
+USER_MESSAGE = re.compile(r'Current User Message: "(.*)"\s*$', re.DOTALL)
+BOOKING_CONTEXT = re.compile(r"Current Booking Context \(information already gathered\):\n(.*?)\n\n", re.DOTALL)
+RESPONSE_INTENT = re.compile(r"User's Intent: (\w+)")
+POLISH_DRAFT = re.compile(r"Reply: (.*)\n\nRephrased reply:", re.DOTALL)
+TOKEN = re.compile(r"\s*\S+")
+
+PARAMETER_FIELDS = ["date", "time", "party_size", "customer_name", "phone", "booking_reference",
+                    "new_date", "new_time", "new_party_size"]
+
+# Canned response generation replies per intent
+RESPONSES = {
+    "general_inquiry": ("Thanks for asking! TheHungryUnicorn is open every day from noon until 10pm, and we'd "
+                        "love to see you. Let me know if you'd like to check availability or book a table."),
+    "modify_booking": ("All done! I've updated your booking with the new details. Your booking reference stays "
+                       "the same, so keep it handy in case you need to make any more changes."),
+}
+DEFAULT_RESPONSE = ("Thanks for your message! I've looked into that for you. Is there anything else I can "
+                    "help you with for your visit to TheHungryUnicorn?")
+
+
+class FakeLLM:
+    """
+    Produces deterministic replies to the agent's prompts with simulated latency.
+
+    Attributes:
+        first_token_ms (float): Delay before the first token (prompt evaluation)
+        tokens_per_second (float): Generation speed after the first token; 0 streams instantly
+        scripted (dict): Classification replies by user message, overriding the rules;
+            messages are matched case- and punctuation-insensitively
+        responses (dict): Response generation text by intent, overriding RESPONSES
+        fail_after_tokens (int): If set, replies to anything but classification prompts
+            raise ConnectionError after this many tokens, like a dropped stream
+    """
+
+    def __init__(self, first_token_ms: float = 0.0, tokens_per_second: float = 0.0,
+                 scripted: Optional[Dict[str, Dict[str, Any]]] = None,
+                 responses: Optional[Dict[str, str]] = None,
+                 fail_after_tokens: Optional[int] = None):
+        self.first_token_ms = first_token_ms
+        self.tokens_per_second = tokens_per_second
+        self.fail_after_tokens = fail_after_tokens
+        self.scripted = {normalize_prompt(message).casefold(): reply for message, reply in (scripted or {}).items()}
+        self.responses = {**RESPONSES, **(responses or {})}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def reply(self, prompt: str) -> str:
+        """The full reply to a prompt."""
+        with self._lock:
+            self.calls += 1
+        if prompt.startswith(INTENT_CLASSIFICATION_PROMPT):
+            return json.dumps(self.classify(prompt))
+        if prompt.startswith(RESPONSE_POLISH_PROMPT.split("{", 1)[0]):
+            draft = POLISH_DRAFT.search(prompt)
+            return draft.group(1).strip() if draft else DEFAULT_RESPONSE
+        if prompt.startswith(RESPONSE_GENERATION_PROMPT.split("{", 1)[0]):
+            intent = RESPONSE_INTENT.search(prompt)
+            return self.responses.get(intent.group(1) if intent else "", DEFAULT_RESPONSE)
+        return DEFAULT_RESPONSE
+
+    def classify(self, prompt: str) -> Dict[str, Any]:
+        """The classification JSON for an intent prompt: scripted, else from the local rules."""
+        message_match = USER_MESSAGE.search(prompt)
+        message = message_match.group(1) if message_match else ""
+        scripted = self.scripted.get(normalize_prompt(message).casefold())
+        if scripted is not None:
+            return scripted
+
+        context_match = BOOKING_CONTEXT.search(prompt)
+        try:
+            context = json.loads(context_match.group(1)) if context_match else {}
+        except ValueError:
+            context = {}
+        rule = classify_intent_with_rules(message, context)
+        extracted = extract_parameters_with_rules(message)
+        return {
+            "intent": rule["intent"],
+            "parameters": {field: extracted.get(field) for field in PARAMETER_FIELDS},
+            "confidence": rule["confidence"],
+            "needs_clarification": False,
+            "clarification_message": None
+        }
+
+    def tokens(self, prompt: str) -> Iterator[Tuple[float, str]]:
+        """Yields (delay in seconds before the token, token) for the reply to a prompt."""
+        fails = self.fail_after_tokens is not None and not prompt.startswith(INTENT_CLASSIFICATION_PROMPT)
+        for index, token in enumerate(TOKEN.findall(self.reply(prompt))):
+            if fails and index == self.fail_after_tokens:
+                raise ConnectionError("fake Ollama stream dropped")
+            if index == 0:
+                yield self.first_token_ms / 1000, token
+            else:
+                yield (1 / self.tokens_per_second if self.tokens_per_second else 0.0), token
+
+
+def _prompt(messages: List[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+class FakeChatModel(BaseChatModel):
+    """In-process chat model backed by FakeLLM; register it with LLMRegistry.register."""
+
+    fake: Any = Field(default_factory=FakeLLM)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-ollama"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = "".join(chunk.text for chunk in self._stream(messages, stop, run_manager, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = "".join([chunk.text async for chunk in self._astream(messages, stop, run_manager, **kwargs)])
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for delay, token in self.fake.tokens(_prompt(messages)):
+            if delay:
+                time.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        for delay, token in self.fake.tokens(_prompt(messages)):
+            if delay:
+                await asyncio.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def install_fake_llm(registry, fake: Optional[FakeLLM] = None) -> FakeLLM:
+    """Registers an in-process FakeChatModel for every client the registry configures."""
+    fake = fake or FakeLLM()
+    for name in registry.configs:
+        registry.register(name, FakeChatModel(fake=fake))
+    return fake
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Serves /api/chat (streamed or not), /api/generate model loads and /api/tags like Ollama."""
+
+    protocol_version = "HTTP/1.1"
+    fake = FakeLLM()
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        # Like Ollama's Go server; otherwise Nagle delays every kept-alive response by ~40ms
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        type(self).connections += 1
+
+    def do_GET(self):
+        if self.path != "/api/tags":
+            return self.send_json(404, {"error": "not found"})
+        self.send_json(200, {"models": [{"name": f"{MODEL}:latest", "model": f"{MODEL}:latest"}]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = body.get("model", MODEL)
+        if self.path == "/api/generate" and not body.get("prompt"):
+            # An empty generate request only loads the model (LLMRegistry.warm_up)
+            return self.send_json(200, {"model": model, "response": "", "done": True})
+        if self.path != "/api/chat":
+            return self.send_json(404, {"error": "not found"})
+
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+        if body.get("stream", True) is False:
+            text = ""
+            for delay, token in self.fake.tokens(prompt):
+                time.sleep(delay)
+                text += token
+            return self.send_json(200, self.chunk(model, text, done=True))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for delay, token in self.fake.tokens(prompt):
+            if delay:
+                time.sleep(delay)
+            self.send_line(self.chunk(model, token, done=False))
+        self.send_line(self.chunk(model, "", done=True))
+        self.wfile.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def chunk(model: str, content: str, done: bool) -> Dict[str, Any]:
+        return {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": content}, "done": done}
+
+    def send_line(self, body: Dict[str, Any]) -> None:
+        line = json.dumps(body).encode() + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake_ollama(port: int = 0, fake: Optional[FakeLLM] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Serve a FakeLLM over HTTP from a background thread.
+
+    Returns:
+        Tuple of (server, base URL); call server.shutdown() when done.
+        The handler class is per server, so its `connections` count is too.
+    """
+    handler = type("FakeOllamaHandler", (FakeOllamaHandler,), {"fake": fake or FakeLLM(), "connections": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a deterministic stand-in for the Ollama chat API")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Generation speed; 0 is instant")
+    args = parser.parse_args()
+    fake = FakeLLM(first_token_ms=args.first_token_ms, tokens_per_second=args.tokens_per_second)
+    handler = type("FakeOllamaHandler", (FakeOllamaHandler,), {"fake": fake})
+    print(f"Fake Ollama serving {MODEL} on http://127.0.0.1:{args.port}")
+    ThreadingHTTPServer(("127.0.0.1", args.port), handler).serve_forever()
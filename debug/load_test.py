@@ -0,0 +1,347 @@
+# Path: debug/load_test.py
+
+"""
+Load generator for the mock booking API.
+
+Drives a running server (or one it starts itself with --start-server) from
+concurrent asyncio workers over a pooled httpx client. Each scenario is a
+weighted mix of API operations; the report gives throughput, latency
+percentiles and error rates per operation, and --output writes the same
+numbers to a JSON file so runs can be compared between commits with
+--baseline.
+
+Examples:
+    python debug/load_test.py --scenario mixed --concurrency 32 --duration 30
+    python debug/load_test.py --start-server --workers 4 --scenario availability \\
+        --output results.json --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time as timer
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.append(SERVER_DIR)
+
+from app.init_db import CANCELLATION_REASONS, SAMPLE_TIMES
+from app.routers.availability import MOCK_BEARER_TOKEN
+
+AUTH_HEADERS = {"Authorization": f"Bearer {MOCK_BEARER_TOKEN}"}
+
+# Relative weights of each operation per scenario
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "availability": {"availability_search": 1},
+    "range": {"availability_range_search": 1},
+    "booking": {"create_booking": 1},
+    "lookup": {"get_booking": 1},
+    "update": {"update_booking": 1},
+    "cancel": {"cancel_booking": 1},
+    "mixed": {
+        "availability_search": 55,
+        "availability_range_search": 10,
+        "get_booking": 15,
+        "create_booking": 12,
+        "update_booking": 5,
+        "cancel_booking": 3
+    },
+}
+
+# 409 means the slot was full: an expected answer under load, not a failure
+EXPECTED_STATUSES = {200, 409}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@dataclass
+class OperationStats:
+    """Latencies and outcomes recorded for one operation."""
+
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    transport_errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def errors(self) -> int:
+        unexpected = sum(count for status, count in self.statuses.items()
+                         if status not in EXPECTED_STATUSES)
+        return unexpected + self.transport_errors
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throughput_rps": self.requests / elapsed if elapsed else 0.0,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "errors": self.errors,
+            "transport_errors": self.transport_errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency_ms": {
+                "p50": percentile(self.latencies_ms, 50),
+                "p90": percentile(self.latencies_ms, 90),
+                "p99": percentile(self.latencies_ms, 99),
+                "max": max(self.latencies_ms, default=0.0),
+            },
+        }
+
+
+class LoadTest:
+    """Runs one scenario against the booking API and collects per-operation stats."""
+
+    def __init__(self, client: httpx.AsyncClient, restaurant: str, days: int, seed: int):
+        self.client = client
+        self.base_path = f"/api/ConsumerApi/v1/Restaurant/{restaurant}"
+        self.restaurant = restaurant
+        self.days = days
+        self.rng = random.Random(seed)
+        self.references: List[str] = []
+        self.stats: Dict[str, OperationStats] = {}
+
+    def _visit_date(self) -> str:
+        return str(date.today() + timedelta(days=self.rng.randrange(self.days)))
+
+    def _visit_time(self) -> str:
+        return self.rng.choice(SAMPLE_TIMES).strftime("%H:%M")
+
+    async def availability_search(self) -> httpx.Response:
+        return await self.client.post(f"{self.base_path}/AvailabilitySearch", data={
+            "VisitDate": self._visit_date(), "PartySize": self.rng.randint(1, 6),
+            "ChannelCode": "ONLINE"
+        })
+
+    async def availability_range_search(self) -> httpx.Response:
+        start = date.today() + timedelta(days=self.rng.randrange(self.days))
+        return await self.client.post(f"{self.base_path}/AvailabilityRangeSearch", data={
+            "StartDate": str(start), "EndDate": str(start + timedelta(days=6)),
+            "PartySize": self.rng.randint(1, 6), "ChannelCode": "ONLINE"
+        })
+
+    async def create_booking(self) -> httpx.Response:
+        number = self.rng.randrange(10 ** 9)
+        response = await self.client.post(f"{self.base_path}/BookingWithStripeToken", data={
+            "VisitDate": self._visit_date(), "VisitTime": self._visit_time(),
+            "PartySize": self.rng.randint(1, 6), "ChannelCode": "ONLINE",
+            "Customer[FirstName]": "Load", "Customer[Surname]": "Test",
+            "Customer[Email]": f"load{number}@example.com"
+        })
+        if response.status_code == 200:
+            self.references.append(response.json()["booking_reference"])
+        return response
+
+    async def get_booking(self) -> httpx.Response:
+        reference = self.rng.choice(self.references)
+        return await self.client.get(f"{self.base_path}/Booking/{reference}")
+
+    async def update_booking(self) -> httpx.Response:
+        reference = self.rng.choice(self.references)
+        return await self.client.patch(f"{self.base_path}/Booking/{reference}", data={
+            "PartySize": self.rng.randint(1, 6),
+            "SpecialRequests": self.rng.choice(["Window seat", "High chair", "Quiet table"])
+        })
+
+    async def cancel_booking(self) -> httpx.Response:
+        reference = self.references.pop(self.rng.randrange(len(self.references)))
+        return await self.client.post(f"{self.base_path}/Booking/{reference}/Cancel", data={
+            "micrositeName": self.restaurant, "bookingReference": reference,
+            "cancellationReasonId": self.rng.choice(CANCELLATION_REASONS)["id"]
+        })
+
+    async def run_operation(self, name: str) -> None:
+        # Lookups, updates and cancellations need an existing booking
+        if name in ("get_booking", "update_booking", "cancel_booking") and not self.references:
+            name = "create_booking"
+
+        stats = self.stats.setdefault(name, OperationStats())
+        start = timer.perf_counter()
+        try:
+            response = await getattr(self, name)()
+        except httpx.HTTPError:
+            stats.transport_errors += 1
+        else:
+            stats.statuses[response.status_code] += 1
+        stats.latencies_ms.append((timer.perf_counter() - start) * 1000)
+
+    async def prefill(self, bookings: int) -> None:
+        """Create bookings up front so lookup, update and cancel have targets."""
+        for _ in range(bookings):
+            await self.create_booking()
+
+    async def run(self, scenario: Dict[str, int], concurrency: int, duration: float,
+                  max_requests: Optional[int]) -> float:
+        """Run workers until the duration or request budget is used up; return elapsed seconds."""
+        names = list(scenario)
+        weights = [scenario[name] for name in names]
+        deadline = timer.perf_counter() + duration
+        remaining = [max_requests if max_requests is not None else float("inf")]
+
+        async def worker() -> None:
+            while remaining[0] > 0 and timer.perf_counter() < deadline:
+                remaining[0] -= 1
+                await self.run_operation(self.rng.choices(names, weights)[0])
+
+        start = timer.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return timer.perf_counter() - start
+
+
+def start_server(port: int, workers: int, database_url: Optional[str]) -> subprocess.Popen:
+    """Launch the mock API without auto-reload and wait until it answers."""
+    try:
+        httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+    except httpx.HTTPError:
+        pass
+    else:
+        raise RuntimeError(f"Port {port} is already serving; stop that server or drop --start-server")
+
+    env = dict(os.environ, SERVER_PORT=str(port), SERVER_WORKERS=str(workers),
+               SERVER_RELOAD="false")
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    process = subprocess.Popen([sys.executable, "-m", "app"], cwd=SERVER_DIR, env=env)
+
+    deadline = timer.perf_counter() + 60
+    while timer.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        timer.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not start within 60 seconds")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=SERVER_DIR).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"\n📊 Scenario '{result['config']['scenario']}' - {result['config']['concurrency']} "
+          f"clients, {result['elapsed_seconds']:.1f}s")
+    print("=" * 86)
+    print(f"{'operation':>26} | {'requests':>8} | {'req/s':>8} | {'errors':>7} | "
+          f"{'p50':>8} | {'p90':>8} | {'p99':>8}")
+    print("-" * 86)
+    rows = dict(result["operations"], total=result["totals"])
+    for name, summary in rows.items():
+        latency = summary["latency_ms"]
+        print(f"{name:>26} | {summary['requests']:>8} | {summary['throughput_rps']:>8.1f} | "
+              f"{summary['error_rate']:>6.1%} | {latency['p50']:>6.1f}ms | "
+              f"{latency['p90']:>6.1f}ms | {latency['p99']:>6.1f}ms")
+
+    if baseline:
+        print(f"\n🔁 Compared with {baseline.get('git_commit') or 'baseline'}")
+        print("-" * 60)
+        base_rows = dict(baseline["operations"], total=baseline["totals"])
+        for name, summary in rows.items():
+            if name not in base_rows:
+                continue
+            before = base_rows[name]
+            throughput = summary["throughput_rps"] / (before["throughput_rps"] or 1) - 1
+            p99 = summary["latency_ms"]["p99"] / (before["latency_ms"]["p99"] or 1) - 1
+            print(f"{name:>26} | req/s {throughput:>+7.1%} | p99 {p99:>+7.1%}")
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency,
+                          max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, headers=AUTH_HEADERS,
+                                 limits=limits, timeout=args.timeout) as client:
+        load_test = LoadTest(client, args.restaurant, args.days, args.seed)
+        await load_test.prefill(args.prefill)
+        load_test.stats.clear()
+        elapsed = await load_test.run(SCENARIOS[args.scenario], args.concurrency,
+                                      args.duration, args.requests)
+
+    totals = OperationStats()
+    for stats in load_test.stats.values():
+        totals.latencies_ms.extend(stats.latencies_ms)
+        totals.statuses.update(stats.statuses)
+        totals.transport_errors += stats.transport_errors
+
+    return {
+        "git_commit": git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items()
+                   if key not in ("output", "baseline")},
+        "elapsed_seconds": elapsed,
+        "totals": totals.summary(elapsed),
+        "operations": {name: stats.summary(elapsed)
+                       for name, stats in sorted(load_test.stats.items())},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test the mock booking API.")
+    parser.add_argument("--base-url", default="http://localhost:8547")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="Stop after this many requests, even before --duration")
+    parser.add_argument("--prefill", type=int, default=50,
+                        help="Bookings created before timing starts")
+    parser.add_argument("--restaurant", default="TheHungryUnicorn")
+    parser.add_argument("--days", type=int, default=30, help="Visit dates span today + N days")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-server", action="store_true",
+                        help="Start the mock API on --base-url's port for the run")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="uvicorn worker processes with --start-server")
+    parser.add_argument("--database-url", default=None,
+                        help="DATABASE_URL for the server started with --start-server")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with a previous --output file")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.start_server:
+        server = start_server(httpx.URL(args.base_url).port or 80, args.workers,
+                              args.database_url)
+    try:
+        result = asyncio.run(run_load_test(args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
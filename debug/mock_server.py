@@ -0,0 +1,89 @@
+# Path: debug/mock_server.py
+
+"""Helpers for running the mock booking API in-process against a throwaway database."""
+
+import os
+import sys
+from datetime import date, time, timedelta
+
+# Add the mock API server to the path so its `app` package can be imported
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import availability_cache
+from app.database import create_db_engine, create_async_db_engine, get_db
+from app.metrics import MetricsMiddleware, install_query_hooks, request_metrics
+from app.query_audit import query_audit
+from app.models import Base, Restaurant, AvailabilitySlot, CancellationReason
+from app.routers import availability, booking
+
+RESTAURANT = "TheHungryUnicorn"
+BASE_PATH = f"/api/ConsumerApi/v1/Restaurant/{RESTAURANT}"
+AUTH_HEADERS = {"Authorization": f"Bearer {availability.MOCK_BEARER_TOKEN}"}
+SLOT_TIMES = [time(12, 0), time(12, 30), time(13, 0), time(13, 30),
+              time(19, 0), time(19, 30), time(20, 0), time(20, 30)]
+
+
+def seed_database(session_factory, days: int = 7) -> None:
+    """Insert one restaurant, `days` days of slots and the cancellation reasons."""
+    db = session_factory()
+    try:
+        restaurant = Restaurant(name=RESTAURANT, microsite_name=RESTAURANT)
+        db.add(restaurant)
+        db.flush()
+        for day in range(days):
+            for slot_time in SLOT_TIMES:
+                db.add(AvailabilitySlot(
+                    restaurant_id=restaurant.id,
+                    date=date.today() + timedelta(days=day),
+                    time=slot_time,
+                    max_party_size=8,
+                    available=True
+                ))
+        db.add(CancellationReason(id=1, reason="Customer Request",
+                                  description="Customer requested cancellation"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def create_test_client(db_path: str):
+    """
+    Build a TestClient for the booking routers backed by a fresh SQLite file.
+
+    Returns:
+        Tuple of (TestClient, engine, async_engine). The synchronous engine can
+        be used to inspect the database directly; the async engine is the one
+        serving requests, so attach statement listeners to its sync_engine.
+    """
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    seed_database(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+    async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{db_path}")
+    async_session_factory = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    app = FastAPI()
+    app.include_router(availability.router)
+    app.include_router(booking.router)
+    app.add_middleware(MetricsMiddleware, audit=query_audit)
+    install_query_hooks(async_engine.sync_engine)
+
+    async def override_get_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    # The availability cache, request metrics and query audit are process-wide;
+    # start each client with them empty
+    availability_cache.clear()
+    request_metrics.clear()
+    query_audit.clear()
+    return TestClient(app), engine, async_engine
@@ -0,0 +1,127 @@
+# Path: debug/test_availability_cache.py
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+from app.cache import AvailabilityCache, availability_cache
+
+TOMORROW = str(date.today() + timedelta(days=1))
+DAY_AFTER = str(date.today() + timedelta(days=2))
+
+
+def search(client, visit_date, party_size=2):
+    response = client.post(f"{BASE_PATH}/AvailabilitySearch", headers=AUTH_HEADERS, data={
+        "VisitDate": visit_date, "PartySize": party_size, "ChannelCode": "ONLINE"
+    })
+    return {slot["time"]: slot["current_bookings"] for slot in response.json()["available_slots"]}
+
+
+def test_lru_and_ttl():
+    """Entries are evicted least-recently-used first and expire after the TTL."""
+
+    print("🧪 Testing LRU eviction and TTL expiry")
+    print("=" * 50)
+
+    cache = AvailabilityCache(max_entries=2, ttl_seconds=0.05)
+    day = date.today()
+    cache.set((1, day, 2), "a")
+    cache.set((1, day, 4), "b")
+    assert cache.get((1, day, 2)) == "a"        # touch -> (1, day, 4) is now oldest
+    cache.set((1, day, 6), "c")
+    assert cache.get((1, day, 4)) is None
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.06)
+    assert cache.get((1, day, 2)) is None
+    assert cache.stats()["expirations"] == 1
+    print(f"   ✅ {cache.stats()}")
+
+
+def test_stale_generation_is_dropped():
+    """A result computed before an invalidation must not be cached."""
+
+    print("\n🧪 Testing stale write protection")
+    print("=" * 50)
+
+    cache = AvailabilityCache()
+    day = date.today()
+    generation = cache.generation(1, day)
+    cache.invalidate(1, day)                      # a booking lands mid-computation
+    cache.set((1, day, 2), "stale", generation=generation)
+    assert cache.get((1, day, 2)) is None
+    assert cache.stats()["stale_writes"] == 1
+    print("   ✅ Stale result discarded")
+
+
+def test_generations_stay_bounded():
+    """Invalidating many dates keeps the generation table bounded without losing stale protection."""
+
+    print("\n🧪 Testing generation pruning")
+    print("=" * 50)
+
+    cache = AvailabilityCache(max_entries=4)
+    day = date.today()
+    generation = cache.generation(1, day)
+    cache.invalidate(1, day)                      # a booking lands mid-computation...
+    for offset in range(1, 1000):                 # ...and the date's generation is pruned
+        cache.invalidate(1, day + timedelta(days=offset))
+    assert cache.stats()["tracked_dates"] <= 2 * cache.max_entries
+
+    cache.set((1, day, 2), "stale", generation=generation)
+    assert cache.get((1, day, 2)) is None
+    cache.set((1, day, 2), "fresh", generation=cache.generation(1, day))
+    assert cache.get((1, day, 2)) == "fresh"
+    print(f"   ✅ {cache.stats()['tracked_dates']} dates tracked after 1000 invalidations")
+
+
+def test_booking_writes_invalidate_affected_dates():
+    """Create, update and cancel must each drop the cached dates they touch."""
+
+    print("\n🧪 Testing write-through invalidation")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "cache.db"))
+
+        assert search(client, TOMORROW)["19:00:00"] == 0
+        search(client, TOMORROW, party_size=4)
+        search(client, DAY_AFTER)
+        assert search(client, TOMORROW)["19:00:00"] == 0
+        assert availability_cache.stats()["hits"] == 1
+
+        reference = client.post(f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+            "VisitDate": TOMORROW, "VisitTime": "19:00", "PartySize": 2, "ChannelCode": "ONLINE",
+            "Customer[FirstName]": "Jane", "Customer[Email]": "jane@example.com"
+        }).json()["booking_reference"]
+        # Both party sizes for tomorrow are dropped, the other date is kept
+        assert availability_cache.stats()["invalidations"] == 2
+        assert search(client, TOMORROW)["19:00:00"] == 1
+        print("   ✅ Create invalidated the booked date")
+
+        client.patch(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS,
+                     data={"VisitDate": DAY_AFTER})
+        assert search(client, TOMORROW)["19:00:00"] == 0
+        assert search(client, DAY_AFTER)["19:00:00"] == 1
+        print("   ✅ Update invalidated the old and new dates")
+
+        client.post(f"{BASE_PATH}/Booking/{reference}/Cancel", headers=AUTH_HEADERS, data={
+            "micrositeName": "TheHungryUnicorn", "bookingReference": reference,
+            "cancellationReasonId": 1
+        })
+        assert search(client, DAY_AFTER)["19:00:00"] == 0
+        print("   ✅ Cancel invalidated the booking date")
+
+        print(f"   📊 {availability_cache.stats()}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    test_lru_and_ttl()
+    test_stale_generation_is_dropped()
+    test_booking_writes_invalidate_affected_dates()
@@ -0,0 +1,114 @@
+# Path: debug/test_booking_concurrency.py
+
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from collections import Counter
+from datetime import date, timedelta
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+from app.models import Booking, Customer
+from app.routers.availability import MAX_BOOKINGS_PER_SLOT
+
+PARALLEL_BOOKINGS = 300
+TOMORROW = str(date.today() + timedelta(days=1))
+DAY_AFTER = str(date.today() + timedelta(days=2))
+# Slots filled to capacity tomorrow, whose bookings then all try to move to one slot
+SOURCE_TIMES = ["12:00", "12:30", "13:00", "13:30"]
+
+
+async def book_same_slot(app, count):
+    """Fire `count` booking requests at the same slot at once and return their status codes."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+        async def book(number):
+            response = await client.post(
+                f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+                    "VisitDate": TOMORROW, "VisitTime": "19:00", "PartySize": 2,
+                    "ChannelCode": "ONLINE", "Customer[FirstName]": "Guest",
+                    "Customer[Email]": f"guest{number}@example.com"
+                }
+            )
+            return response.status_code
+
+        return await asyncio.gather(*(book(number) for number in range(count)))
+
+
+async def move_to_same_slot(app, references):
+    """Move every booking to 19:00 the day after tomorrow at once and return the status codes."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+        async def move(reference):
+            response = await client.patch(
+                f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS,
+                data={"VisitDate": DAY_AFTER, "VisitTime": "19:00"}
+            )
+            return response.status_code
+
+        return await asyncio.gather(*(move(reference) for reference in references))
+
+
+def test_parallel_bookings_never_overbook():
+    """Hundreds of simultaneous bookings for one slot confirm exactly the slot's capacity."""
+
+    print(f"🧪 Firing {PARALLEL_BOOKINGS} parallel bookings at one slot")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "concurrency.db"))
+
+        start = timer.perf_counter()
+        statuses = Counter(asyncio.run(book_same_slot(client.app, PARALLEL_BOOKINGS)))
+        elapsed = timer.perf_counter() - start
+
+        assert statuses == {200: MAX_BOOKINGS_PER_SLOT, 409: PARALLEL_BOOKINGS - MAX_BOOKINGS_PER_SLOT}, statuses
+        with Session(engine) as db:
+            assert db.scalar(select(func.count(Booking.id))) == MAX_BOOKINGS_PER_SLOT
+            # Customers of rejected bookings are rolled back with them
+            assert db.scalar(select(func.count(Customer.id))) == MAX_BOOKINGS_PER_SLOT
+
+        print(f"   ✅ {dict(statuses)} in {elapsed:.2f}s ({PARALLEL_BOOKINGS / elapsed:.0f} req/s)")
+        engine.dispose()
+
+
+def test_parallel_moves_never_overbook():
+    """Bookings moved into one slot at the same time confirm no more than the slot's capacity."""
+
+    print("🧪 Moving bookings from four full slots into one slot in parallel")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "moves.db"))
+        references = []
+        for visit_time in SOURCE_TIMES:
+            for number in range(MAX_BOOKINGS_PER_SLOT):
+                references.append(client.post(f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+                    "VisitDate": TOMORROW, "VisitTime": visit_time, "PartySize": 2, "ChannelCode": "ONLINE",
+                    "Customer[FirstName]": "Guest", "Customer[Email]": f"guest{visit_time}{number}@example.com"
+                }).json()["booking_reference"])
+
+        statuses = Counter(asyncio.run(move_to_same_slot(client.app, references)))
+
+        assert statuses == {200: MAX_BOOKINGS_PER_SLOT, 409: len(references) - MAX_BOOKINGS_PER_SLOT}, statuses
+        with Session(engine) as db:
+            moved = db.scalar(select(func.count(Booking.id)).where(
+                Booking.visit_date == date.fromisoformat(DAY_AFTER), Booking.status == "confirmed"
+            ))
+            assert moved == MAX_BOOKINGS_PER_SLOT
+
+        print(f"   ✅ {dict(statuses)}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    test_parallel_bookings_never_overbook()
+    test_parallel_moves_never_overbook()
@@ -0,0 +1,77 @@
+# Path: debug/test_booking_reference.py
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+from app.models import Booking, Customer
+from app.routers import booking
+
+TOMORROW = str(date.today() + timedelta(days=1))
+
+
+def create_booking(client, email):
+    return client.post(f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+        "VisitDate": TOMORROW, "VisitTime": "19:00", "PartySize": 2, "ChannelCode": "ONLINE",
+        "Customer[FirstName]": "Jane", "Customer[Email]": email
+    })
+
+
+def test_reference_collision_is_retried():
+    """A reference that is already taken is retried instead of failing the booking."""
+
+    print("🧪 Testing booking reference collisions")
+    print("=" * 50)
+
+    original = booking.generate_booking_reference
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "reference.db"))
+        try:
+            references = iter(["TAKEN01", "TAKEN01", "FRESH02"])
+            booking.generate_booking_reference = lambda: next(references)
+
+            first = create_booking(client, "first@example.com")
+            second = create_booking(client, "second@example.com")
+            assert first.json()["booking_reference"] == "TAKEN01"
+            assert second.status_code == 200, second.text
+            assert second.json()["booking_reference"] == "FRESH02"
+            print("   ✅ Colliding reference retried with a fresh one")
+
+            booking.generate_booking_reference = lambda: "TAKEN01"
+            exhausted = create_booking(client, "third@example.com")
+            assert exhausted.status_code == 503
+            print(f"   ✅ Gave up after {booking.MAX_REFERENCE_ATTEMPTS} attempts")
+
+            with Session(engine) as db:
+                assert db.scalar(select(func.count(Booking.id))) == 2
+                # The new customer is rolled back with the booking that failed
+                assert db.scalar(select(func.count(Customer.id))) == 2
+        finally:
+            booking.generate_booking_reference = original
+            engine.dispose()
+
+
+def test_generated_references():
+    """References use the 7-character uppercase alphanumeric format."""
+
+    print("\n🧪 Testing booking reference format")
+    print("=" * 50)
+
+    references = {booking.generate_booking_reference() for _ in range(10000)}
+    assert len(references) == 10000
+    for reference in references:
+        assert len(reference) == booking.BOOKING_REFERENCE_LENGTH
+        assert set(reference) <= set(booking.BOOKING_REFERENCE_ALPHABET)
+    print("   ✅ 10,000 distinct, well-formed references")
+
+
+if __name__ == "__main__":
+    test_reference_collision_is_retried()
+    test_generated_references()
@@ -0,0 +1,169 @@
+# Path: debug/test_fake_ollama.py
+
+import asyncio
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent.async_nodes
+import agent.nodes
+from agent.async_nodes import agenerate_response
+from agent.graph import build_graph
+from agent.llm import LLMRegistry
+from agent.llm_cache import LLMResponseCache, llm_cache
+from agent.nodes import GENERATION_INTERRUPTED, build_intent_prompt, classify_intent, generate_response
+from agent.responses import render_response
+from agent.state import AgentState
+from fake_ollama import FakeLLM, RESPONSES, TOKEN, install_fake_llm, start_fake_ollama
+
+
+def test_graph_runs_on_in_process_fake():
+    """A turn that needs the LLM runs through build_graph() with the same reply every time."""
+
+    print("🧪 Testing the graph against the in-process fake LLM")
+    print("=" * 50)
+
+    from agent.llm import llm_registry
+    fake = install_fake_llm(llm_registry, FakeLLM(scripted={
+        "Can I bring my dog?": {"intent": "general_inquiry", "parameters": {}, "confidence": 0.9,
+                                "needs_clarification": False, "clarification_message": None}
+    }))
+    try:
+        app = build_graph()
+        replies = [app.invoke(AgentState(user_message="can I bring my dog"))["agent_response"] for _ in range(2)]
+        print(f"✅ {fake.calls} LLM calls, reply: {replies[0][:50]}...")
+        assert replies[0] == replies[1] == RESPONSES["general_inquiry"]
+        assert fake.calls >= 2
+    finally:
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+
+
+def test_http_server_speaks_ollama_chat_api():
+    """ChatOllama clients get rule-derived classification JSON from the HTTP server."""
+
+    print("🧪 Testing the fake Ollama HTTP server")
+    print("=" * 50)
+
+    server, base_url = start_fake_ollama()
+    registry = LLMRegistry(base_url=base_url)
+    try:
+        assert registry.warm_up()["llama3.2"] is not None
+        prompt = build_intent_prompt(AgentState(user_message="Book a table for 4 people at 7pm"))
+        reply = json.loads(registry.invoke("classification", prompt))
+        print(f"✅ Classification: {reply['intent']} {reply['parameters']}")
+        assert reply["intent"] == "make_booking"
+        assert reply["parameters"]["party_size"] == 4
+        assert reply["parameters"]["time"] == "19:00"
+        assert "".join(registry.stream("generation", "Hello")).startswith("Thanks")
+    finally:
+        registry.close()
+        server.shutdown()
+
+
+def test_cache_keys_keep_message_case():
+    """Prompts differing in whitespace or punctuation share a cache key; ones differing in case do not."""
+
+    print("🧪 Testing LLM cache key normalization")
+    print("=" * 50)
+
+    def key(message: str) -> str:
+        return LLMResponseCache.key("classification", "llama3.2", build_intent_prompt(AgentState(user_message=message)))
+
+    assert key("Can I bring my dog?") == key("Can I  bring my dog")
+    assert key("My name is Jane Smith") != key("my name is jane smith")
+    assert key("Check booking ABC1234") != key("check booking abc1234")
+    print("✅ Case-only variants get their own cache entries")
+
+
+def test_relative_date_in_history_expires_cached_classification(monkeypatch):
+    """A classification whose history mentions "tomorrow" expires at midnight even if the message does not."""
+
+    print("🧪 Testing relative dates in the cached classification history")
+    print("=" * 50)
+
+    from agent.llm import llm_registry
+    install_fake_llm(llm_registry, FakeLLM())
+    monkeypatch.setattr(llm_cache, "ttl_seconds", 7 * 86400.0)
+    llm_cache.clear()
+    try:
+        midnight = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()).timestamp()
+        for history, expires_by_midnight in ((["Hello", "Hi, how can I help?"], False),
+                                             (["A table for two tomorrow at 7pm", "Shall I book it?"], True)):
+            llm_cache.clear()
+            state = AgentState(user_message="Sounds good to me", conversation_history=[
+                {"role": "user", "content": history[0]}, {"role": "assistant", "content": history[1]}
+            ])
+            classify_intent(state)
+            [(expires_at, _)] = llm_cache._entries.values()
+            assert (expires_at <= midnight) is expires_by_midnight
+        print("✅ Only the reply after a date-relative turn expires at midnight")
+    finally:
+        llm_cache.clear()
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+
+
+def cancelled_state() -> AgentState:
+    return AgentState(user_message="Please cancel ABC1234", intent="cancel_booking",
+                      booking_context={"booking_reference": "ABC1234"},
+                      api_response={"status": 200, "data": {"booking_reference": "ABC1234", "status": "cancelled"}})
+
+
+def test_polish_failing_mid_stream_streams_only_the_template(monkeypatch):
+    """With RESPONSE_POLISH on, a polish stream that drops partway sends the template once and nothing else."""
+
+    print("🧪 Testing a polish stream that fails partway")
+    print("=" * 50)
+
+    from agent.llm import llm_registry
+    install_fake_llm(llm_registry, FakeLLM(fail_after_tokens=3))
+    monkeypatch.setattr(agent.nodes, "RESPONSE_POLISH", True)
+    monkeypatch.setattr(agent.async_nodes, "RESPONSE_POLISH", True)
+    try:
+        template = render_response(cancelled_state())
+        for run in (lambda config: generate_response(cancelled_state(), config),
+                    lambda config: asyncio.run(agenerate_response(cancelled_state(), config))):
+            tokens = []
+            state = run({"configurable": {"on_token": tokens.append}})
+            print(f"✅ Streamed {tokens}")
+            assert tokens == [template]
+            assert state.agent_response == template
+    finally:
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+
+
+def test_generation_failing_mid_stream_continues_the_partial_reply():
+    """A generation stream that drops partway ends with a notice, and the history keeps what was streamed."""
+
+    print("🧪 Testing a generation stream that fails partway")
+    print("=" * 50)
+
+    from agent.llm import llm_registry
+    install_fake_llm(llm_registry, FakeLLM(fail_after_tokens=3))
+    try:
+        partial = "".join(TOKEN.findall(RESPONSES["general_inquiry"])[:3])
+        for run in (lambda state, config: generate_response(state, config),
+                    lambda state, config: asyncio.run(agenerate_response(state, config))):
+            tokens = []
+            state = AgentState(user_message="When are you open?", intent="general_inquiry")
+            state = run(state, {"configurable": {"on_token": tokens.append}})
+            print(f"✅ Streamed {''.join(tokens)!r}")
+            assert "".join(tokens) == partial + GENERATION_INTERRUPTED
+            assert state.agent_response == "".join(tokens)
+            assert state.conversation_history[-1] == {"role": "assistant", "content": "".join(tokens)}
+    finally:
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+
+
+if __name__ == "__main__":
+    test_graph_runs_on_in_process_fake()
+    test_http_server_speaks_ollama_chat_api()
+    test_cache_keys_keep_message_case()
+    test_generation_failing_mid_stream_continues_the_partial_reply()
@@ -0,0 +1,125 @@
+# Path: debug/test_query_budgets.py
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+from app.metrics import RequestQueries, request_metrics
+from app.query_audit import QueryAudit, QueryBudgetExceeded, query_audit, query_budget
+from app.routers import booking
+
+BOOKING_ROUTE = "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/{booking_reference}"
+CREATE_ROUTE = "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/BookingWithStripeToken"
+
+
+def test_endpoints_stay_within_query_budgets():
+    """Every router endpoint, including a cancelled booking lookup, stays within its declared budget."""
+
+    print("🧪 Testing endpoint query budgets")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "budgets.db"))
+        visit_date = str(date.today() + timedelta(days=1))
+
+        client.post(f"{BASE_PATH}/AvailabilitySearch", headers=AUTH_HEADERS, data={
+            "VisitDate": visit_date, "PartySize": 2, "ChannelCode": "ONLINE"
+        })
+        client.post(f"{BASE_PATH}/AvailabilityRangeSearch", headers=AUTH_HEADERS, data={
+            "StartDate": visit_date, "EndDate": str(date.today() + timedelta(days=6)),
+            "PartySize": 2, "ChannelCode": "ONLINE"
+        })
+        reference = client.post(f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+            "VisitDate": visit_date, "VisitTime": "19:00", "PartySize": 2, "ChannelCode": "ONLINE",
+            "Customer[FirstName]": "Jane", "Customer[Surname]": "Smith",
+            "Customer[Email]": "jane.smith@example.com", "Customer[Mobile]": "07700900123"
+        }).json()["booking_reference"]
+        client.patch(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS,
+                     data={"PartySize": 4, "VisitTime": "20:00"})
+        client.post(f"{BASE_PATH}/Booking/{reference}/Cancel", headers=AUTH_HEADERS, data={
+            "micrositeName": "TheHungryUnicorn", "bookingReference": reference, "cancellationReasonId": 1
+        })
+
+        request_metrics.clear()
+        cancelled = client.get(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS).json()
+        lookup = request_metrics.stats()["routes"][f"GET {BOOKING_ROUTE}"]
+        print(f"   Cancelled booking lookup: {lookup['statements']} statements, "
+              f"reason {cancelled['cancellation_reason']}")
+        assert cancelled["cancellation_reason"]["reason"] == "Customer Request"
+        assert lookup["statements"] == 2
+
+        query_audit.assert_clean()
+        print("   ✅ No repeated statements or budget overruns")
+        engine.dispose()
+
+
+def test_reference_retries_do_not_count_against_the_budget():
+    """Inserts retried after reference collisions are counted as failed, not as an N+1 or an overrun."""
+
+    print("🧪 Testing query budgets with reference collisions")
+    print("=" * 50)
+
+    original = booking.generate_booking_reference
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "retries.db"))
+        try:
+            attempts = booking.MAX_REFERENCE_ATTEMPTS
+            references = iter(["TAKEN01"] * attempts + ["FRESH02"])
+            booking.generate_booking_reference = lambda: next(references)
+            for email in ("first@example.com", "second@example.com"):
+                response = client.post(f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+                    "VisitDate": str(date.today() + timedelta(days=1)), "VisitTime": "19:00",
+                    "PartySize": 2, "ChannelCode": "ONLINE",
+                    "Customer[FirstName]": "Jane", "Customer[Email]": email
+                })
+                assert response.status_code == 200, response.text
+
+            create = request_metrics.stats()["routes"][f"POST {CREATE_ROUTE}"]
+            print(f"   Two creates: {create['statements']} statements, {create['failed_statements']} failed")
+            assert create["failed_statements"] == attempts - 1
+            query_audit.assert_clean()
+            print("   ✅ Retried inserts are not reported")
+        finally:
+            booking.generate_booking_reference = original
+            engine.dispose()
+
+
+def test_repeated_statements_and_overruns_are_flagged():
+    """A statement repeated per row and a request over its budget both fail assert_clean()."""
+
+    print("🧪 Testing N+1 detection")
+    print("=" * 50)
+
+    audit = QueryAudit(repeat_threshold=2)
+
+    @query_budget(3)
+    async def endpoint():
+        pass
+
+    queries = RequestQueries()
+    queries.statements["SELECT restaurants.id FROM restaurants WHERE restaurants.name = ?"] = 1
+    queries.statements["SELECT count(bookings.id) FROM bookings WHERE bookings.visit_time = ?"] = 8
+    queries.count = 9
+
+    found = audit.check_request("POST", "/AvailabilitySearch", endpoint, queries)
+    assert [violation["kind"] for violation in found] == ["repeated_statement", "over_budget"]
+    assert found[0]["count"] == 8
+
+    with pytest.raises(QueryBudgetExceeded) as error:
+        audit.assert_clean()
+    print(f"   ✅ {error.value}")
+
+    audit.clear()
+    audit.assert_clean()
+
+
+if __name__ == "__main__":
+    test_endpoints_stay_within_query_budgets()
+    test_reference_retries_do_not_count_against_the_budget()
+    test_repeated_statements_and_overruns_are_flagged()
@@ -0,0 +1,98 @@
+# Path: debug/test_query_plans.py
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+
+
+def capture_router_statements(client, engine):
+    """Drive every router endpoint once and record each SQL statement issued."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    visit_date = str(date.today() + timedelta(days=1))
+
+    client.post(f"{BASE_PATH}/AvailabilitySearch", headers=AUTH_HEADERS, data={
+        "VisitDate": visit_date, "PartySize": 2, "ChannelCode": "ONLINE"
+    })
+    client.post(f"{BASE_PATH}/AvailabilityRangeSearch", headers=AUTH_HEADERS, data={
+        "StartDate": visit_date, "EndDate": str(date.today() + timedelta(days=7)),
+        "PartySize": 2, "ChannelCode": "ONLINE"
+    })
+    created = client.post(f"{BASE_PATH}/BookingWithStripeToken", headers=AUTH_HEADERS, data={
+        "VisitDate": visit_date, "VisitTime": "19:00", "PartySize": 2,
+        "ChannelCode": "ONLINE", "Customer[FirstName]": "John",
+        "Customer[Surname]": "Smith", "Customer[Email]": "john.smith@example.com",
+        "Customer[Mobile]": "1234567890"
+    }).json()
+    reference = created["booking_reference"]
+
+    client.get(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS)
+    client.patch(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS, data={"PartySize": 4})
+    client.patch(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS, data={"VisitTime": "20:00"})
+    client.post(f"{BASE_PATH}/Booking/{reference}/Cancel", headers=AUTH_HEADERS, data={
+        "micrositeName": "TheHungryUnicorn", "bookingReference": reference,
+        "cancellationReasonId": 1
+    })
+    client.get(f"{BASE_PATH}/Booking/{reference}", headers=AUTH_HEADERS)
+
+    event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def test_router_queries_use_indexes():
+    """Every SELECT/UPDATE/DELETE, and every INSERT ... SELECT, issued by the routers must be index-driven."""
+
+    print("🔎 Checking router query plans")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "plans.db"))
+        statements = capture_router_statements(client, async_engine.sync_engine)
+
+        failures = []
+        checked = 0
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for statement, parameters in statements:
+                verb = statement.lstrip().upper()
+                # A plain INSERT ... VALUES reads nothing; INSERT ... SELECT (the
+                # capacity-checked booking insert) counts the slot's bookings
+                if not (verb.startswith(("SELECT", "UPDATE", "DELETE"))
+                        or (verb.startswith("INSERT") and "SELECT" in verb)):
+                    continue
+                checked += 1
+                plan = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                details = [row[-1] for row in plan]
+                full_scans = [d for d in details
+                              if d.startswith("SCAN") and "USING" not in d and d != "SCAN CONSTANT ROW"]
+
+                status = "❌" if full_scans else "✅"
+                print(f"{status} {' '.join(statement.split())[:90]}")
+                for detail in details:
+                    print(f"      {detail}")
+                if full_scans:
+                    failures.append((statement, full_scans))
+        finally:
+            raw.close()
+            engine.dispose()
+
+    print(f"\n📊 {checked - len(failures)}/{checked} queries use an index")
+    assert checked > 0, "No router queries were captured"
+    assert not failures, f"Full table scans found: {failures}"
+
+
+if __name__ == "__main__":
+    test_router_queries_use_indexes()
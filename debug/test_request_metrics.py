@@ -0,0 +1,61 @@
+# Path: debug/test_request_metrics.py
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import create_test_client, BASE_PATH, AUTH_HEADERS
+from app.metrics import request_metrics
+
+AVAILABILITY_ROUTE = "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/AvailabilitySearch"
+BOOKING_ROUTE = "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/{booking_reference}"
+
+
+def test_requests_and_statements_are_recorded_per_route():
+    """Requests are counted per route template and status, with the SQL statements each issued."""
+
+    print("🧪 Testing request metrics")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client, engine, async_engine = create_test_client(os.path.join(tmp, "metrics.db"))
+        visit_date = str(date.today() + timedelta(days=1))
+
+        for _ in range(2):
+            client.post(f"{BASE_PATH}/AvailabilitySearch", headers=AUTH_HEADERS, data={
+                "VisitDate": visit_date, "PartySize": 2, "ChannelCode": "ONLINE"
+            })
+        client.get(f"{BASE_PATH}/Booking/NOPE123", headers=AUTH_HEADERS)
+        client.get(f"{BASE_PATH}/Booking/NOPE456", headers=AUTH_HEADERS)
+        client.get("/no/such/path")
+
+        routes = request_metrics.stats()["routes"]
+        for name, route in routes.items():
+            print(f"   {name}: {route}")
+
+        availability = routes[f"POST {AVAILABILITY_ROUTE}"]
+        assert availability["requests"] == 2
+        assert availability["responses"] == {200: 2}
+        # The second search is served from the availability cache
+        assert availability["statements"] >= 1
+
+        lookups = routes[f"GET {BOOKING_ROUTE}"]
+        assert lookups["responses"] == {404: 2}
+        assert lookups["statements"] >= 2
+        assert routes["GET unmatched"]["responses"] == {404: 1}
+        assert request_metrics.stats()["in_flight"] == 0
+
+        text = request_metrics.render()
+        assert (f'http_requests_total{{method="GET",route="{BOOKING_ROUTE}",status="404"}} 2') in text
+        assert (f'http_request_duration_seconds_bucket{{method="POST",route="{AVAILABILITY_ROUTE}",'
+                f'le="+Inf"}} 2') in text
+        assert "# TYPE db_statements_per_request histogram" in text
+        print("   ✅ Prometheus text rendered")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    test_requests_and_statements_are_recorded_per_route()
@@ -0,0 +1,44 @@
+# Path: debug/test_seed.py
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Booking, Customer
+from app.seed import seed
+
+
+def test_bookings_reference_existing_customers():
+    """Bookings seeded after customers were deleted only point at customers that still exist."""
+
+    print("🧪 Testing seeded booking customers")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'seed.db')}")
+        try:
+            seed(engine, restaurants=1, days=1, customers=50, bookings=0, start_date=date.today())
+            with Session(engine) as db:
+                db.execute(delete(Customer).where(Customer.id % 2 == 0))
+                db.commit()
+
+            seed(engine, restaurants=2, days=7, customers=0, bookings=200, start_date=date.today())
+            with Session(engine) as db:
+                orphans = db.scalar(
+                    select(func.count(Booking.id)).where(Booking.customer_id.not_in(select(Customer.id)))
+                )
+            assert orphans == 0
+            print("   ✅ Every booking has a customer")
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    test_bookings_reference_existing_customers()
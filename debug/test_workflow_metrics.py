@@ -0,0 +1,76 @@
+# Path: debug/test_workflow_metrics.py
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.graph import build_graph, stream_turn
+from agent.state import AgentState
+from fake_ollama import FakeLLM, install_fake_llm
+from utils.metrics import Histogram, WorkflowMetrics, add_http_time, add_llm_time, workflow_metrics
+
+
+def test_graph_records_node_metrics():
+    """A turn through build_graph() records wall and LLM time per node and the branch each router took."""
+
+    print("🧪 Testing per-node workflow metrics")
+    print("=" * 50)
+
+    from agent.llm import llm_registry
+    install_fake_llm(llm_registry, FakeLLM(first_token_ms=5))
+    workflow_metrics.reset()
+    try:
+        app = build_graph()
+        app.invoke(AgentState(user_message="Can I bring my dog?"))
+        turn = stream_turn(app, AgentState(user_message="Is there parking nearby?"))
+        "".join(turn)
+
+        stats = workflow_metrics.stats()
+        print(workflow_metrics.format_table())
+        assert stats["classify_intent"]["calls"] == 2
+        assert stats["generate_response"]["llm_ms"]["mean"] >= 5
+        assert stats["generate_response"]["wall_ms"]["max"] >= stats["generate_response"]["llm_ms"]["max"]
+        assert stats["generate_response"]["state_bytes"]["mean"] > 0
+        assert stats["should_continue_after_parameters"]["routes"] == {"generate_response": 2}
+        assert "execute_api_call" not in stats or stats["execute_api_call"]["calls"] == 0
+    finally:
+        for name in llm_registry.configs:
+            llm_registry.unregister(name)
+
+
+def test_wrappers_attribute_time_to_the_running_node():
+    """LLM and HTTP time reported inside a node is charged to it, and not outside one."""
+
+    print("🧪 Testing LLM/HTTP time attribution")
+    print("=" * 50)
+
+    metrics = WorkflowMetrics(enabled=True)
+
+    def node(state, config=None):
+        add_llm_time(120.0)
+        add_http_time(30.0)
+        return {"seen_config": config is not None}
+
+    wrapped = metrics.node("node", node)
+    wrapped({}, config={"configurable": {}})
+    add_llm_time(999.0)
+
+    summary = metrics.stats()["node"]
+    print(f"✅ LLM {summary['llm_ms']['mean']}ms, HTTP {summary['http_ms']['mean']}ms")
+    assert summary["llm_ms"]["mean"] == 120.0
+    assert summary["http_ms"]["mean"] == 30.0
+    assert summary["llm_ms"]["p50"] == 120.0
+
+    histogram = Histogram([1, 10, 100])
+    for value in [0.5, 5, 5, 50, 500]:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 10
+    assert histogram.quantile(1.0) == 500
+    assert WorkflowMetrics(enabled=False).node("node", node) is node
+
+
+if __name__ == "__main__":
+    test_graph_records_node_metrics()
+    test_wrappers_attribute_time_to_the_running_node()
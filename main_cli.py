@@ -1,30 +1,40 @@
-from agent.graph import build_graph
+from agent.graph import build_graph, stream_turn
 from agent.state import AgentState
+from agent.llm import llm_registry
+from utils.log import configure_logging
+from utils.metrics import workflow_metrics
 
 def run_cli():
     """Starts the terminal-based chat interface."""
+    configure_logging()
+    # Load the model now rather than on the first message
+    llm_registry.warm_up()
     app = build_graph()
     
     # Initialize the state using your dataclass
     # This object will be updated and reused in each loop iteration.
     current_state = AgentState()
     
-    print("Restaurant Booking Agent (CLI) is ready. Type 'quit' to exit.")
+    print("Restaurant Booking Agent (CLI) is ready. Type 'metrics' for per-node timings or 'quit' to exit.")
     
     while True:
         user_input = input("You: ")
         if user_input.lower() == 'quit':
             break
+        if user_input.lower() == 'metrics':
+            print(workflow_metrics.format_table())
+            continue
             
         # Update the state with the new user message for this turn
         current_state.user_message = user_input
         
-        # Invoke the graph. It takes the state dataclass, runs, and returns a dictionary.
-        final_state_dict = app.invoke(current_state)
-        
-        # FIX: Access the result using dictionary keys, not attributes.
-        agent_response_text = final_state_dict.get('agent_response', "Sorry, I encountered an issue and couldn't respond.")
-        print(f"Agent: {agent_response_text}")
+        # Run the graph, printing the reply as it is generated. The final state is a dictionary.
+        print("Agent: ", end="", flush=True)
+        turn = stream_turn(app, current_state)
+        for token in turn:
+            print(token, end="", flush=True)
+        print()
+        final_state_dict = turn.result
         
         # Update the conversation history in our state object for the next turn
         current_state.conversation_history = final_state_dict.get('conversation_history', [])
@@ -1,7 +1,10 @@
 import streamlit as st
 import json
-from agent.graph import build_graph
+from agent.graph import build_graph, stream_turn
 from agent.state import AgentState
+from agent.llm import llm_registry
+from utils.log import configure_logging
+from utils.metrics import workflow_metrics
 
 # Page configuration
 st.set_page_config(
@@ -69,10 +72,15 @@ with st.sidebar:
             st.json(st.session_state.state.booking_context)
             st.text(f"Intent: {getattr(st.session_state.state, 'intent', 'None')}")
             st.text(f"Messages: {len(st.session_state.state.conversation_history)}")
+        # Process-wide, so they include every session's turns
+        st.caption("Node timings")
+        st.dataframe(workflow_metrics.rows(), hide_index=True)
 
 # Initialize graph and session state
 if "app" not in st.session_state:
     with st.spinner("Initializing booking agent..."):
+        configure_logging()
+        llm_registry.warm_up()
         st.session_state.app = build_graph()
     st.success("✅ Booking agent ready!")
 
@@ -154,8 +162,10 @@ if prompt := st.chat_input("Type your message here... (e.g., 'Book a table for 4
     with st.chat_message("assistant"):
         with st.spinner("Processing your request..."):
             try:
-                # Invoke the graph
-                final_state_dict = st.session_state.app.invoke(st.session_state.state)
+                # Run the graph, streaming the reply into the chat as it is generated
+                turn = stream_turn(st.session_state.app, st.session_state.state)
+                st.write_stream(turn)
+                final_state_dict = turn.result
                 
                 # Extract response
                 agent_response = final_state_dict.get(
@@ -163,9 +173,6 @@ if prompt := st.chat_input("Type your message here... (e.g., 'Book a table for 4
                     "I apologize, but I encountered an issue processing your request."
                 )
                 
-                # Display response
-                st.markdown(agent_response)
-                
                 # Update persistent state
                 st.session_state.state.conversation_history = final_state_dict.get(
                     'conversation_history', 
@@ -1,6 +1,15 @@
+import os
+
 import uvicorn
 
+HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+PORT = int(os.getenv("SERVER_PORT", "8547"))
+# Auto-reload is meant for development; disable it (and add workers) for load testing
+RELOAD = os.getenv("SERVER_RELOAD", "true").lower() in ("1", "true", "yes")
+WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app", host="0.0.0.0", port=8547, reload=True, reload_dirs=["app"]
-    )
+    if RELOAD and WORKERS == 1:
+        uvicorn.run("app.main:app", host=HOST, port=PORT, reload=True, reload_dirs=["app"])
+    else:
+        uvicorn.run("app.main:app", host=HOST, port=PORT, workers=WORKERS)
@@ -0,0 +1,213 @@
+"""
+Availability Cache.
+
+This module provides a bounded, in-process LRU + TTL cache for availability
+search results. Slot availability only changes when bookings are created,
+updated or cancelled, so the booking router invalidates the affected
+(restaurant, date) entries on every write instead of relying on expiry alone.
+
+The cache lives in the memory of a single server process. When running several
+uvicorn workers each worker keeps its own cache and only sees its own
+invalidations, so the TTL bounds how stale another worker's entries can get.
+
+Author: AI Assistant
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Set, Tuple
+
+# Cache key: (restaurant_id, visit_date, party_size)
+CacheKey = Tuple[int, date, int]
+
+
+class AvailabilityCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and (restaurant, date) invalidation.
+
+    Entries are keyed by (restaurant_id, visit_date, party_size). A secondary
+    index from (restaurant_id, visit_date) to the cached party sizes lets a
+    booking write drop exactly the entries for the dates it touched.
+
+    Each (restaurant_id, visit_date) also carries a generation number that is
+    bumped on invalidation. Readers capture the generation before computing a
+    result and pass it to set(), so a result computed before a concurrent
+    booking write is discarded instead of being cached stale.
+
+    Generations come from one increasing counter. To keep the table bounded,
+    generations of dates with no cached entries are dropped once it holds more
+    than twice max_entries; dropped dates then report the highest generation
+    dropped, so a reader that captured an older one still sees a change.
+
+    Attributes:
+        max_entries (int): Maximum number of cached results before LRU eviction
+        ttl_seconds (float): Lifetime of a cached result in seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._party_sizes: Dict[Tuple[int, date], Set[int]] = {}
+        self._generations: Dict[Tuple[int, date], int] = {}
+        self._last_generation = 0
+        self._pruned_generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is active (a size or TTL of 0 disables it)."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def generation(self, restaurant_id: int, visit_date: date) -> int:
+        """Return the current generation for a (restaurant, date) pair."""
+        with self._lock:
+            return self._generations.get((restaurant_id, visit_date), self._pruned_generation)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """
+        Look up a cached availability result.
+
+        Args:
+            key: (restaurant_id, visit_date, party_size)
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: CacheKey, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store an availability result, evicting the least recently used entry if full.
+
+        Args:
+            key: (restaurant_id, visit_date, party_size)
+            value: Result to cache; callers must treat it as read-only
+            generation: Generation captured before computing the value. If the
+                (restaurant, date) was invalidated since, the value is dropped.
+        """
+        if not self.enabled:
+            return
+
+        restaurant_id, visit_date, party_size = key
+        with self._lock:
+            current = self._generations.get((restaurant_id, visit_date), self._pruned_generation)
+            if generation is not None and generation != current:
+                self.stale_writes += 1
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            self._party_sizes.setdefault((restaurant_id, visit_date), set()).add(party_size)
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, restaurant_id: int, visit_date: date) -> int:
+        """
+        Drop every cached party size for a restaurant on a given date.
+
+        Args:
+            restaurant_id: ID of the restaurant whose bookings changed
+            visit_date: Date whose availability changed
+
+        Returns:
+            int: Number of entries removed
+        """
+        pair = (restaurant_id, visit_date)
+        with self._lock:
+            self._last_generation += 1
+            self._generations[pair] = self._last_generation
+            party_sizes = self._party_sizes.pop(pair, set())
+            for party_size in party_sizes:
+                self._entries.pop((restaurant_id, visit_date, party_size), None)
+            self.invalidations += len(party_sizes)
+            if len(self._generations) > 2 * self.max_entries:
+                self._prune_generations()
+            return len(party_sizes)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._party_sizes.clear()
+            self._generations.clear()
+            self._last_generation = self._pruned_generation = 0
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.invalidations = self.stale_writes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters for sizing and monitoring.
+
+        Returns:
+            Dict with size limits, current size, hit/miss/eviction counters
+            and the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_writes": self.stale_writes,
+                "tracked_dates": len(self._generations)
+            }
+
+    def _prune_generations(self) -> None:
+        """Forget generations of dates with no cached entries (lock must be held)."""
+        for pair in [pair for pair in self._generations if pair not in self._party_sizes]:
+            self._pruned_generation = max(self._pruned_generation, self._generations.pop(pair))
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and its secondary index reference (lock must be held)."""
+        self._entries.pop(key, None)
+        restaurant_id, visit_date, party_size = key
+        party_sizes = self._party_sizes.get((restaurant_id, visit_date))
+        if party_sizes is not None:
+            party_sizes.discard(party_size)
+            if not party_sizes:
+                del self._party_sizes[(restaurant_id, visit_date)]
+
+
+# Shared cache instance used by the availability and booking routers
+availability_cache = AvailabilityCache(
+    max_entries=int(os.getenv("AVAILABILITY_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("AVAILABILITY_CACHE_TTL", "30"))
+)
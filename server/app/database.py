@@ -2,54 +2,241 @@
 Database Configuration and Session Management.
 
 This module sets up the SQLite database connection, session management,
-and declarative base for the restaurant booking mock API.
+and declarative base for the restaurant booking mock API. The engine is
+configured through the DATABASE_URL and DB_* environment variables.
+Request handlers use an aiosqlite-backed AsyncSession; schema creation and
+data seeding use the synchronous engine.
 
 Author: AI Assistant
 """
 
-from typing import Generator
+import os
+from typing import AsyncGenerator, List, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
-# SQLite database URL - creates file in project root
-SQLALCHEMY_DATABASE_URL = "sqlite:///./restaurant_booking.db"
+# SQLite database URL - creates file in project root unless overridden
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./restaurant_booking.db")
 
-# Create SQLAlchemy engine with SQLite-specific configuration
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Required for SQLite threading
+# The request handlers use the same database through the aiosqlite driver
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
 )
 
-# Create session factory
+# Connection-level SQLite settings applied through PRAGMAs on every new connection
+SQLITE_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-65536"))  # negative = KiB, i.e. 64 MiB
+
+# Pool sizing is per uvicorn worker process: pool_size + max_overflow caps the
+# number of requests that can hold a database connection at the same time.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+
+def _is_memory_database(database_url: str) -> bool:
+    """Return True for SQLite URLs that point at an in-memory database."""
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+
+def create_db_engine(
+    database_url: str = SQLALCHEMY_DATABASE_URL,
+    journal_mode: Optional[str] = SQLITE_JOURNAL_MODE,
+    synchronous: Optional[str] = SQLITE_SYNCHRONOUS,
+    busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS,
+    mmap_size: int = SQLITE_MMAP_SIZE,
+    cache_size: int = SQLITE_CACHE_SIZE,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT
+) -> Engine:
+    """
+    Create a SQLAlchemy engine tuned for concurrent access to SQLite.
+
+    Every new DBAPI connection is configured through a connect event with:
+    - journal_mode=WAL so readers no longer block behind a writer
+    - synchronous=NORMAL, which is durable in WAL mode and avoids an fsync per commit
+    - busy_timeout so concurrent writers wait for the lock instead of failing
+    - mmap_size and cache_size to serve reads from memory
+
+    File databases use a QueuePool sized per uvicorn worker process;
+    in-memory databases use a StaticPool so every session shares one connection.
+    Defaults come from the DB_* environment variables.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        journal_mode: SQLite journal mode, or None to keep the SQLite default
+        synchronous: SQLite synchronous level, or None to keep the default
+        busy_timeout_ms: How long a connection waits for a lock, in milliseconds
+        mmap_size: Bytes of the database file to memory-map (0 disables)
+        cache_size: SQLite page cache size (negative values are KiB)
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections allowed beyond pool_size under load
+        pool_timeout: Seconds to wait for a free pooled connection
+
+    Returns:
+        Engine: Configured SQLAlchemy engine
+    """
+    is_sqlite = database_url.startswith("sqlite")
+    engine_kwargs = {}
+
+    if is_sqlite:
+        # Required for SQLite threading
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if _is_memory_database(database_url):
+            engine_kwargs["poolclass"] = StaticPool
+            journal_mode = None  # WAL is not available for in-memory databases
+        else:
+            engine_kwargs.update(
+                poolclass=QueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout
+            )
+
+    db_engine = create_engine(database_url, **engine_kwargs)
+
+    if is_sqlite:
+        _install_sqlite_pragmas(db_engine, _sqlite_pragmas(
+            journal_mode, synchronous, busy_timeout_ms, mmap_size, cache_size
+        ))
+
+    return db_engine
+
+
+def create_async_db_engine(
+    database_url: str = ASYNC_DATABASE_URL,
+    journal_mode: Optional[str] = SQLITE_JOURNAL_MODE,
+    synchronous: Optional[str] = SQLITE_SYNCHRONOUS,
+    busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS,
+    mmap_size: int = SQLITE_MMAP_SIZE,
+    cache_size: int = SQLITE_CACHE_SIZE,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT
+) -> AsyncEngine:
+    """
+    Create an asyncio engine with the same SQLite tuning as create_db_engine().
+
+    Used by the FastAPI routers so database I/O awaits instead of blocking
+    the event loop. With aiosqlite each connection runs on its own thread,
+    so concurrent requests holding different pooled connections overlap.
+
+    Args:
+        database_url: SQLAlchemy async database URL (e.g. sqlite+aiosqlite:///...)
+        journal_mode: SQLite journal mode, or None to keep the SQLite default
+        synchronous: SQLite synchronous level, or None to keep the default
+        busy_timeout_ms: How long a connection waits for a lock, in milliseconds
+        mmap_size: Bytes of the database file to memory-map (0 disables)
+        cache_size: SQLite page cache size (negative values are KiB)
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections allowed beyond pool_size under load
+        pool_timeout: Seconds to wait for a free pooled connection
+
+    Returns:
+        AsyncEngine: Configured SQLAlchemy async engine
+    """
+    is_sqlite = database_url.startswith("sqlite")
+    engine_kwargs = {}
+
+    if is_sqlite:
+        if _is_memory_database(database_url):
+            engine_kwargs["poolclass"] = StaticPool
+            journal_mode = None  # WAL is not available for in-memory databases
+        else:
+            engine_kwargs.update(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout
+            )
+
+    db_engine = create_async_engine(database_url, **engine_kwargs)
+
+    if is_sqlite:
+        _install_sqlite_pragmas(db_engine.sync_engine, _sqlite_pragmas(
+            journal_mode, synchronous, busy_timeout_ms, mmap_size, cache_size
+        ))
+
+    return db_engine
+
+
+def _sqlite_pragmas(
+    journal_mode: Optional[str],
+    synchronous: Optional[str],
+    busy_timeout_ms: int,
+    mmap_size: int,
+    cache_size: int
+) -> List[str]:
+    """Build the PRAGMA statements applied to every new SQLite connection."""
+    pragmas = []
+    if journal_mode:
+        pragmas.append(f"PRAGMA journal_mode={journal_mode}")
+    if synchronous:
+        pragmas.append(f"PRAGMA synchronous={synchronous}")
+    pragmas.append(f"PRAGMA busy_timeout={busy_timeout_ms}")
+    pragmas.append(f"PRAGMA mmap_size={mmap_size}")
+    pragmas.append(f"PRAGMA cache_size={cache_size}")
+    return pragmas
+
+
+def _install_sqlite_pragmas(db_engine: Engine, pragmas: List[str]) -> None:
+    """Run the given PRAGMA statements whenever the engine opens a connection."""
+
+    @event.listens_for(db_engine, "connect")
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+# Create the shared SQLAlchemy engines: the synchronous engine is used for
+# schema creation and seeding, the async engine by the request handlers
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 # Create declarative base for all models
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Database session dependency for FastAPI.
+    Async database session dependency for FastAPI.
 
-    Creates a new database session for each request and ensures
-    it's properly closed after the request completes.
+    Creates a new async database session for each request and ensures
+    it's properly closed after the request completes. Queries must be
+    awaited, so they never block the event loop.
 
     Yields:
-        Session: SQLAlchemy database session
+        AsyncSession: SQLAlchemy async database session
 
     Example:
         Use as a FastAPI dependency:
         ```python
         @app.get("/example")
-        def example_endpoint(db: Session = Depends(get_db)):
-            # Use db session here
-            pass
+        async def example_endpoint(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(Restaurant))
         ```
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
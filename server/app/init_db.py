@@ -11,9 +11,43 @@ Author: AI Assistant
 import random
 from datetime import time, datetime, timedelta
 
+from sqlalchemy import inspect, text
+
 from app.database import engine, SessionLocal
 from app.models import Base, Restaurant, AvailabilitySlot, CancellationReason
 
+# Lunch and dinner times offered every day
+SAMPLE_TIMES = [
+    time(12, 0),   # 12:00 PM
+    time(12, 30),  # 12:30 PM
+    time(13, 0),   # 1:00 PM
+    time(13, 30),  # 1:30 PM
+    time(19, 0),   # 7:00 PM
+    time(19, 30),  # 7:30 PM
+    time(20, 0),   # 8:00 PM
+    time(20, 30),  # 8:30 PM
+]
+
+CANCELLATION_REASONS = [
+    {
+        "id": 1,
+        "reason": "Customer Request",
+        "description": "Customer requested cancellation"
+    },
+    {
+        "id": 2,
+        "reason": "Restaurant Closure",
+        "description": "Restaurant temporarily closed"
+    },
+    {
+        "id": 3,
+        "reason": "Weather",
+        "description": "Cancelled due to weather conditions"
+    },
+    {"id": 4, "reason": "Emergency", "description": "Emergency cancellation"},
+    {"id": 5, "reason": "No Show", "description": "Customer did not show up"}
+]
+
 
 def create_tables() -> None:
     """
@@ -25,6 +59,43 @@ def create_tables() -> None:
     Base.metadata.create_all(bind=engine)
 
 
+def upgrade_schema() -> None:
+    """
+    Bring an existing database file up to date with the model indexes.
+
+    create_all() only creates missing tables, so databases created before the
+    composite indexes were introduced never receive them. This function creates
+    any index declared on the models that is missing from the database. It is
+    idempotent and safe to run on every startup.
+
+    Before adding the unique (restaurant_id, date, time) index on availability
+    slots, duplicate slots are removed, keeping the oldest row of each group.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as connection:
+        if AvailabilitySlot.__tablename__ in existing_tables:
+            existing_indexes = {
+                index["name"]
+                for index in inspector.get_indexes(AvailabilitySlot.__tablename__)
+            }
+            if "uq_availability_slots_restaurant_date_time" not in existing_indexes:
+                result = connection.execute(text(
+                    "DELETE FROM availability_slots WHERE id NOT IN ("
+                    "SELECT MIN(id) FROM availability_slots "
+                    "GROUP BY restaurant_id, date, time)"
+                ))
+                if result.rowcount:
+                    print(f"Removed {result.rowcount} duplicate availability slots")
+
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+
+
 def init_sample_data() -> None:
     """
     Initialize database with sample data for testing.
@@ -58,22 +129,11 @@ def init_sample_data() -> None:
         db.refresh(restaurant)
 
         # Create sample availability slots for the next 30 days
-        sample_times = [
-            time(12, 0),   # 12:00 PM
-            time(12, 30),  # 12:30 PM
-            time(13, 0),   # 1:00 PM
-            time(13, 30),  # 1:30 PM
-            time(19, 0),   # 7:00 PM
-            time(19, 30),  # 7:30 PM
-            time(20, 0),   # 8:00 PM
-            time(20, 30),  # 8:30 PM
-        ]
-
         start_date = datetime.now().date()
 
         for i in range(30):  # Next 30 days
             current_date = start_date + timedelta(days=i)
-            for slot_time in sample_times:
+            for slot_time in SAMPLE_TIMES:
                 # Randomly make some slots unavailable
                 available = random.random() > 0.2  # 80% availability
 
@@ -87,27 +147,7 @@ def init_sample_data() -> None:
                 db.add(slot)
 
         # Create sample cancellation reasons
-        cancellation_reasons = [
-            {
-                "id": 1,
-                "reason": "Customer Request",
-                "description": "Customer requested cancellation"
-            },
-            {
-                "id": 2,
-                "reason": "Restaurant Closure",
-                "description": "Restaurant temporarily closed"
-            },
-            {
-                "id": 3,
-                "reason": "Weather",
-                "description": "Cancelled due to weather conditions"
-            },
-            {"id": 4, "reason": "Emergency", "description": "Emergency cancellation"},
-            {"id": 5, "reason": "No Show", "description": "Customer did not show up"}
-        ]
-
-        for reason_data in cancellation_reasons:
+        for reason_data in CANCELLATION_REASONS:
             reason = CancellationReason(**reason_data)
             db.add(reason)
 
@@ -124,6 +164,8 @@ def init_sample_data() -> None:
 if __name__ == "__main__":
     print("Creating database tables...")
     create_tables()
+    print("Upgrading database indexes...")
+    upgrade_schema()
     print("Initializing sample data...")
     init_sample_data()
     print("Database setup complete!")
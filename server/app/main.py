@@ -10,13 +10,20 @@ Version: 1.0.0
 """
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.routers import availability, booking
-from app.database import engine
+from app.cache import availability_cache
+from app.database import engine, async_engine
+from app.metrics import (
+    CONTENT_TYPE, REQUEST_METRICS, MetricsMiddleware, install_query_hooks, request_metrics
+)
+from app.query_audit import QUERY_AUDIT, query_audit
 from app.models import Base
 import app.init_db as init_db
 
-# Create database tables on startup
+# Create database tables on startup and add any indexes missing from older files
 Base.metadata.create_all(bind=engine)
+init_db.upgrade_schema()
 
 app = FastAPI(
     title="Restaurant Booking Mock API",
@@ -33,6 +40,13 @@ app = FastAPI(
 app.include_router(availability.router)
 app.include_router(booking.router)
 
+# Record per-route latency and the SQL statements each request issues,
+# checking them for N+1 patterns and query budgets when QUERY_AUDIT is set
+if REQUEST_METRICS or QUERY_AUDIT:
+    app.add_middleware(MetricsMiddleware, audit=query_audit if QUERY_AUDIT else None)
+    install_query_hooks(engine)
+    install_query_hooks(async_engine.sync_engine)
+
 
 @app.on_event("startup")
 async def startup_event() -> None:
@@ -62,6 +76,10 @@ async def root() -> dict:
                 "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
                 "AvailabilitySearch"
             ),
+            "availability_range_search": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
+                "AvailabilityRangeSearch"
+            ),
             "create_booking": (
                 "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
                 "BookingWithStripeToken"
@@ -78,7 +96,33 @@ async def root() -> dict:
                 "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
                 "{booking_reference}"
             ),
+            "cache_stats": "/cache/stats",
+            "metrics": "/metrics",
             "docs": "/docs",
             "redoc": "/redoc"
         }
     }
+
+
+@app.get("/cache/stats", summary="Availability Cache Statistics", tags=["Root"])
+async def cache_stats() -> dict:
+    """
+    Get availability cache counters.
+
+    Returns:
+        dict: Cache size limits, current size and hit/miss/eviction counters,
+        useful for sizing AVAILABILITY_CACHE_SIZE and AVAILABILITY_CACHE_TTL.
+    """
+    return availability_cache.stats()
+
+
+@app.get("/metrics", summary="Request Metrics", tags=["Root"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Get per-route request metrics in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: Request counts by status, latency and SQL statement
+        histograms per route, and the number of requests in flight.
+    """
+    return PlainTextResponse(request_metrics.render(), media_type=CONTENT_TYPE)
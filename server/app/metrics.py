@@ -0,0 +1,286 @@
+"""
+Request Metrics.
+
+This module records per-route request counts, latency histograms, in-flight
+requests and the SQL statements each request issues, and renders them in the
+Prometheus text exposition format for the /metrics endpoint.
+
+MetricsMiddleware is a plain ASGI middleware, so the route handler runs in the
+request's own task and SQLAlchemy cursor events (installed on an engine with
+install_query_hooks) can charge each statement to the request through a
+context variable. Routes are labelled by their path template rather than the
+raw URL, so booking references do not create a series per booking.
+
+Like the availability cache, metrics live in the memory of a single server
+process; with several uvicorn workers each worker reports its own.
+
+Author: AI Assistant
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Set REQUEST_METRICS=false to serve requests without the middleware
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "true").lower() in ("1", "true", "yes")
+
+# Histogram bucket upper bounds: request latency in seconds, statements per request
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Starlette appends "; charset=utf-8" to text media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+UNMATCHED_ROUTE = "unmatched"
+
+# (method, route template)
+RouteKey = Tuple[str, str]
+
+
+class RequestQueries:
+    """
+    SQL statements issued while handling one request.
+
+    `count` and `seconds` include statements that raised, `failed` counts those
+    alone, and `statements` counts the successful executions of each statement text.
+    """
+
+    __slots__ = ("count", "failed", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+
+_current_request: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram rendered as cumulative Prometheus buckets."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteStats:
+    """Responses by status, latency and SQL statements for one (method, route)."""
+
+    def __init__(self):
+        self.responses: Counter = Counter()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+        self.failed_queries = 0
+
+
+class RequestMetrics:
+    """
+    Thread-safe request and SQL statement counters for the Prometheus endpoint.
+
+    Attributes:
+        in_flight (int): Requests currently being handled
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self._routes: Dict[RouteKey, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float,
+                         queries: RequestQueries) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.responses[status] += 1
+            stats.latency.observe(seconds)
+            stats.queries.observe(queries.count)
+            stats.query_seconds += queries.seconds
+            stats.failed_queries += queries.failed
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-route counts and means as a dict, for tests and debugging."""
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "routes": {
+                    f"{method} {route}": {
+                        "requests": stats.latency.count,
+                        "responses": dict(stats.responses),
+                        "mean_seconds": round(stats.latency.sum / stats.latency.count, 6),
+                        "statements": int(stats.queries.sum),
+                        "failed_statements": stats.failed_queries,
+                        "statement_seconds": round(stats.query_seconds, 6),
+                    }
+                    for (method, route), stats in self._routes.items()
+                },
+            }
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP http_requests_in_flight Requests currently being handled.",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP http_requests_total Requests handled, by method, route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route), stats in routes:
+                for status, count in sorted(stats.responses.items()):
+                    lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+
+            lines += ["# HELP http_request_duration_seconds Request latency, by method and route.",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for (method, route), stats in routes:
+                lines += stats.latency.samples("http_request_duration_seconds", _labels(method, route))
+
+            lines += ["# HELP db_statements_per_request SQL statements issued per request, by method and route.",
+                      "# TYPE db_statements_per_request histogram"]
+            for (method, route), stats in routes:
+                lines += stats.queries.samples("db_statements_per_request", _labels(method, route))
+
+            lines += ["# HELP db_statement_seconds_total Time spent executing SQL statements, by method and route.",
+                      "# TYPE db_statement_seconds_total counter"]
+            for (method, route), stats in routes:
+                lines.append(f"db_statement_seconds_total{{{_labels(method, route)}}} {stats.query_seconds:.6f}")
+
+            lines += ["# HELP db_statement_errors_total SQL statements that raised, by method and route.",
+                      "# TYPE db_statement_errors_total counter"]
+            for (method, route), stats in routes:
+                lines.append(f"db_statement_errors_total{{{_labels(method, route)}}} {stats.failed_queries}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+request_metrics = RequestMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current_request.get()
+    if queries is not None:
+        queries.count += 1
+        queries.seconds += time.perf_counter() - context._metrics_start
+        queries.statements[statement] += 1
+
+
+def _handle_error(exception_context):
+    # Failed statements (e.g. a booking insert retried after a reference
+    # collision) never reach after_cursor_execute
+    queries = _current_request.get()
+    context = exception_context.execution_context
+    if queries is not None and context is not None and hasattr(context, "_metrics_start"):
+        queries.count += 1
+        queries.failed += 1
+        queries.seconds += time.perf_counter() - context._metrics_start
+
+
+def install_query_hooks(db_engine: Engine) -> None:
+    """
+    Count the statements an engine executes against the current request.
+
+    For an AsyncEngine pass its sync_engine. Installing twice is a no-op.
+    """
+    if not event.contains(db_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(db_engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request in a RequestMetrics.
+
+    Args:
+        app: The ASGI application to wrap
+        metrics: Where to record requests (defaults to request_metrics)
+        audit: Optional QueryAudit (app.query_audit) checking each request's statements
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics, audit: Optional[Any] = None):
+        self.app = app
+        self.metrics = metrics
+        self.audit = audit
+        self._route_paths: Dict[Callable, str] = {}
+
+    def _route(self, scope) -> str:
+        """The path template of the route that handled the request."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if endpoint not in self._route_paths:
+            paths = [route.path for route in scope["app"].routes if getattr(route, "endpoint", None) is endpoint]
+            self._route_paths[endpoint] = paths[0] if paths else UNMATCHED_ROUTE
+        return self._route_paths[endpoint]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        queries = RequestQueries()
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _current_request.set(queries)
+        self.metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_request.reset(token)
+            route = self._route(scope)
+            self.metrics.request_finished(scope["method"], route, status, elapsed, queries)
+            if self.audit is not None:
+                self.audit.check_request(scope["method"], route, scope.get("endpoint"), queries)
@@ -12,7 +12,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, Date, Time, Text, ForeignKey
+    Column, Integer, String, DateTime, Boolean, Date, Time, Text, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 
@@ -113,9 +113,19 @@ class Booking(Base):
         status (str): Booking status (confirmed/cancelled/completed)
         created_at (datetime): Timestamp when booking was created
         updated_at (datetime): Timestamp when booking was last updated
+
+    Indexes:
+        ix_bookings_slot_lookup: (restaurant_id, visit_date, visit_time, status)
+            used to count confirmed bookings per availability slot
     """
 
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index(
+            "ix_bookings_slot_lookup",
+            "restaurant_id", "visit_date", "visit_time", "status"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     booking_reference = Column(String, unique=True, index=True, nullable=False)
@@ -153,9 +163,28 @@ class AvailabilitySlot(Base):
         max_party_size (int): Maximum party size for this slot
         available (bool): Whether the slot is available for booking
         created_at (datetime): Timestamp when slot was created
+
+    Indexes:
+        ix_availability_slots_search: (restaurant_id, date, max_party_size)
+            used by availability searches
+        uq_availability_slots_restaurant_date_time: unique (restaurant_id, date, time)
+            so a restaurant cannot have two slots at the same date and time
     """
 
     __tablename__ = "availability_slots"
+    __table_args__ = (
+        Index(
+            "ix_availability_slots_search",
+            "restaurant_id", "date", "max_party_size"
+        ),
+        # Declared as a unique index rather than a UniqueConstraint so it can be
+        # added to existing SQLite databases with CREATE INDEX (see init_db.py)
+        Index(
+            "uq_availability_slots_restaurant_date_time",
+            "restaurant_id", "date", "time",
+            unique=True
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
@@ -0,0 +1,130 @@
+"""
+Query Audit.
+
+This module is an opt-in N+1 query detector for development and test runs.
+It reads the statements MetricsMiddleware counts per request (see
+app.metrics) and flags two kinds of regression:
+
+- the same parameterized statement executed more than QUERY_REPEAT_THRESHOLD
+  times in one request, the signature of a query issued per row
+- more statements than the budget an endpoint declares with @query_budget
+
+Only successful statements count: a statement that raised and was retried,
+like a booking insert whose reference collided, is not a per-row query.
+
+Violations are logged as warnings and kept until cleared, so a test can
+drive the endpoints and then call query_audit.assert_clean(). Enable it on
+the server with QUERY_AUDIT=true; the debug test client always enables it.
+
+Author: AI Assistant
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from app.metrics import RequestQueries
+
+# Opt-in: checking every request is meant for development and test runs
+QUERY_AUDIT = os.getenv("QUERY_AUDIT", "false").lower() in ("1", "true", "yes")
+# A statement run more times than this in one request is reported as repeated
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "2"))
+
+log = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by QueryAudit.assert_clean() when requests broke their query budgets."""
+
+
+def query_budget(max_statements: int) -> Callable:
+    """
+    Declare the most SQL statements an endpoint may issue per request.
+
+    Apply it below the router decorator so FastAPI registers the annotated function:
+
+        @router.get("/{restaurant_name}/Booking/{booking_reference}")
+        @query_budget(2)
+        async def get_booking(...):
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.query_budget = max_statements
+        return endpoint
+    return decorator
+
+
+class QueryAudit:
+    """
+    Checks each request's statements for repeats and budget overruns.
+
+    Attributes:
+        repeat_threshold (int): Executions of one statement allowed per request
+        violations (list): Dicts describing each violation since the last clear()
+    """
+
+    def __init__(self, repeat_threshold: int = QUERY_REPEAT_THRESHOLD):
+        self.repeat_threshold = repeat_threshold
+        self.violations: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def check_request(self, method: str, route: str, endpoint: Optional[Callable],
+                      queries: RequestQueries) -> List[Dict[str, Any]]:
+        """
+        Record the violations of one request.
+
+        Returns:
+            list: The violations found, empty if the request was clean
+        """
+        found = []
+        for statement, count in queries.statements.items():
+            if count > self.repeat_threshold:
+                found.append({
+                    "kind": "repeated_statement", "method": method, "route": route,
+                    "count": count, "statement": " ".join(statement.split())
+                })
+        budget = getattr(endpoint, "query_budget", None)
+        succeeded = queries.count - queries.failed
+        if budget is not None and succeeded > budget:
+            found.append({
+                "kind": "over_budget", "method": method, "route": route,
+                "count": succeeded, "budget": budget
+            })
+
+        for violation in found:
+            if violation["kind"] == "repeated_statement":
+                log.warning("Possible N+1 in %s %s: statement ran %d times: %s",
+                            method, route, violation["count"], violation["statement"][:200])
+            else:
+                log.warning("%s %s issued %d SQL statements, over its budget of %d",
+                            method, route, violation["count"], violation["budget"])
+        if found:
+            with self._lock:
+                self.violations.extend(found)
+        return found
+
+    def assert_clean(self) -> None:
+        """
+        Fail if any request since the last clear() broke a rule.
+
+        Raises:
+            QueryBudgetExceeded: Listing every violation
+        """
+        with self._lock:
+            violations = list(self.violations)
+        if violations:
+            lines = [
+                f"{v['method']} {v['route']}: " + (
+                    f"{v['count']} statements, budget {v['budget']}" if v["kind"] == "over_budget"
+                    else f"statement ran {v['count']} times: {v['statement'][:120]}"
+                )
+                for v in violations
+            ]
+            raise QueryBudgetExceeded("Query audit failed:\n" + "\n".join(lines))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.violations.clear()
+
+
+query_audit = QueryAudit()
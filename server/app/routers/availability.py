@@ -7,14 +7,17 @@ including time slot availability checks and booking constraint validation.
 Author: AI Assistant
 """
 
-from datetime import date
-from typing import Dict, Any
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional
 
 from fastapi import APIRouter, Form, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import availability_cache
 from app.database import get_db
 from app.models import Restaurant, AvailabilitySlot, Booking
+from app.query_audit import query_budget
 
 router = APIRouter(prefix="/api/ConsumerApi/v1/Restaurant", tags=["availability"])
 
@@ -26,6 +29,12 @@ MOCK_BEARER_TOKEN = (
     "2094SB3J3XW-KdBc0DY9a2Jiu_56ud8"
 )
 
+# Simple capacity rule: allow up to 3 confirmed bookings per time slot
+MAX_BOOKINGS_PER_SLOT = 3
+
+# Longest date range accepted by a single range search
+MAX_RANGE_DAYS = 31
+
 
 def verify_token(authorization: str = Header(...)) -> str:
     """
@@ -56,17 +65,157 @@ def verify_token(authorization: str = Header(...)) -> str:
     return token
 
 
+def build_availability_query(
+    restaurant_id: int,
+    start_date: date,
+    end_date: date,
+    party_size: int
+) -> Select:
+    """
+    Build the set-based availability query for a date range.
+
+    Availability slots are LEFT JOINed against confirmed bookings at the same
+    date and time and grouped per slot, so the booking counts for every slot
+    on every date come back in a single round trip instead of one COUNT query
+    per slot.
+
+    Args:
+        restaurant_id: ID of the restaurant to search
+        start_date: First visit date to include
+        end_date: Last visit date to include (inclusive)
+        party_size: Number of people in the party
+
+    Returns:
+        Select yielding (date, time, max_party_size, available, booking_count)
+        rows ordered by date and time
+    """
+    existing_bookings = func.count(Booking.id)
+    return select(
+        AvailabilitySlot.date,
+        AvailabilitySlot.time,
+        AvailabilitySlot.max_party_size,
+        AvailabilitySlot.available,
+        existing_bookings
+    ).outerjoin(
+        Booking,
+        and_(
+            Booking.restaurant_id == AvailabilitySlot.restaurant_id,
+            Booking.visit_date == AvailabilitySlot.date,
+            Booking.visit_time == AvailabilitySlot.time,
+            Booking.status == "confirmed"
+        )
+    ).where(
+        AvailabilitySlot.restaurant_id == restaurant_id,
+        AvailabilitySlot.date >= start_date,
+        AvailabilitySlot.date <= end_date,
+        AvailabilitySlot.max_party_size >= party_size
+    ).group_by(
+        AvailabilitySlot.id
+    ).order_by(
+        AvailabilitySlot.date, AvailabilitySlot.time, AvailabilitySlot.id
+    )
+
+
+def group_slots_by_date(rows: Iterable[Row]) -> Dict[date, List[Dict[str, Any]]]:
+    """
+    Shape availability query rows into the API's slot payload.
+
+    Args:
+        rows: Rows produced by build_availability_query()
+
+    Returns:
+        Dict mapping each date that has slots to a list of slot dicts ordered
+        by time, each with the slot time, availability flag, max party size
+        and current booking count
+    """
+    slots_by_date: Dict[date, List[Dict[str, Any]]] = {}
+    for slot_date, slot_time, max_party_size, available, booking_count in rows:
+        slots_by_date.setdefault(slot_date, []).append({
+            "time": slot_time.strftime("%H:%M:%S"),
+            "available": bool(available) and booking_count < MAX_BOOKINGS_PER_SLOT,
+            "max_party_size": max_party_size,
+            "current_bookings": booking_count
+        })
+    return slots_by_date
+
+
+async def get_available_slots_by_date(
+    db: AsyncSession,
+    restaurant_id: int,
+    start_date: date,
+    end_date: date,
+    party_size: int
+) -> Dict[date, List[Dict[str, Any]]]:
+    """
+    Compute slot availability for every date in a range in one query.
+
+    Args:
+        db: Async database session
+        restaurant_id: ID of the restaurant to search
+        start_date: First visit date to include
+        end_date: Last visit date to include (inclusive)
+        party_size: Number of people in the party
+
+    Returns:
+        Dict mapping each date that has slots to its list of slot dicts
+    """
+    result = await db.execute(
+        build_availability_query(restaurant_id, start_date, end_date, party_size)
+    )
+    return group_slots_by_date(result.all())
+
+
+async def get_available_slots(
+    db: AsyncSession,
+    restaurant_id: int,
+    visit_date: date,
+    party_size: int
+) -> List[Dict[str, Any]]:
+    """
+    Compute slot availability for a single date in one query.
+
+    Args:
+        db: Async database session
+        restaurant_id: ID of the restaurant to search
+        visit_date: The desired visit date
+        party_size: Number of people in the party
+
+    Returns:
+        List of slot dicts ordered by time
+    """
+    slots_by_date = await get_available_slots_by_date(
+        db, restaurant_id, visit_date, visit_date, party_size
+    )
+    return slots_by_date.get(visit_date, [])
+
+
+async def get_restaurant_by_name(db: AsyncSession, restaurant_name: str) -> Optional[Restaurant]:
+    """
+    Look up a restaurant by its unique name.
+
+    Args:
+        db: Async database session
+        restaurant_name: The name of the restaurant
+
+    Returns:
+        The matching Restaurant, or None if it does not exist
+    """
+    result = await db.execute(select(Restaurant).where(Restaurant.name == restaurant_name))
+    return result.scalars().first()
+
+
 @router.post(
     "/{restaurant_name}/AvailabilitySearch",
     summary="Search Available Time Slots",
     response_description="Available booking slots with availability status"
 )
+@query_budget(2)
 async def availability_search(
     restaurant_name: str,
     VisitDate: date = Form(..., description="Visit date in YYYY-MM-DD format"),
     PartySize: int = Form(..., description="Number of people in the party"),
     ChannelCode: str = Form(..., description="Booking channel (e.g., 'ONLINE')"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(verify_token)
 ) -> Dict[str, Any]:
     """
@@ -74,14 +223,15 @@ async def availability_search(
 
     Retrieves available time slots for a specific restaurant, date, and party size.
     The system checks base availability slots and current booking counts to determine
-    real-time availability.
+    real-time availability, using a single grouped query for all slots. Results
+    are served from the in-process availability cache when possible.
 
     Args:
         restaurant_name: The name of the restaurant
         VisitDate: The desired visit date
         PartySize: Number of people in the party
         ChannelCode: The booking channel identifier
-        db: Database session dependency
+        db: Async database session dependency
         token: Authentication token dependency
 
     Returns:
@@ -92,38 +242,17 @@ async def availability_search(
         HTTPException: 401 if authentication fails
     """
     # Find restaurant by name
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
+    restaurant = await get_restaurant_by_name(db, restaurant_name)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Get availability slots for the requested date
-    slots = db.query(AvailabilitySlot).filter(
-        AvailabilitySlot.restaurant_id == restaurant.id,
-        AvailabilitySlot.date == VisitDate,
-        AvailabilitySlot.max_party_size >= PartySize
-    ).all()
-
-    # Check for existing bookings at each slot time
-    available_slots = []
-    for slot in slots:
-        # Count existing bookings for this time slot
-        existing_bookings = db.query(Booking).filter(
-            Booking.restaurant_id == restaurant.id,
-            Booking.visit_date == VisitDate,
-            Booking.visit_time == slot.time,
-            Booking.status == "confirmed"
-        ).count()
-
-        # Simple logic: allow up to 3 bookings per time slot
-        max_bookings_per_slot = 3
-        is_available = slot.available and existing_bookings < max_bookings_per_slot
-
-        available_slots.append({
-            "time": slot.time.strftime("%H:%M:%S"),
-            "available": is_available,
-            "max_party_size": slot.max_party_size,
-            "current_bookings": existing_bookings
-        })
+    # Serve from cache; booking writes invalidate the affected dates
+    cache_key = (restaurant.id, VisitDate, PartySize)
+    available_slots = availability_cache.get(cache_key)
+    if available_slots is None:
+        generation = availability_cache.generation(restaurant.id, VisitDate)
+        available_slots = await get_available_slots(db, restaurant.id, VisitDate, PartySize)
+        availability_cache.set(cache_key, available_slots, generation=generation)
 
     return {
         "restaurant": restaurant_name,
@@ -134,3 +263,84 @@ async def availability_search(
         "available_slots": available_slots,
         "total_slots": len(available_slots)
     }
+
+
+@router.post(
+    "/{restaurant_name}/AvailabilityRangeSearch",
+    summary="Search Available Time Slots Across a Date Range",
+    response_description="Available booking slots for each date in the range"
+)
+@query_budget(2)
+async def availability_range_search(
+    restaurant_name: str,
+    StartDate: date = Form(..., description="First visit date in YYYY-MM-DD format"),
+    EndDate: date = Form(..., description="Last visit date in YYYY-MM-DD format (inclusive)"),
+    PartySize: int = Form(..., description="Number of people in the party"),
+    ChannelCode: str = Form(..., description="Booking channel (e.g., 'ONLINE')"),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    """
+    Search for available booking slots across a range of dates.
+
+    Answers questions like "what's free this weekend?" in a single request
+    and a single grouped query, instead of one AvailabilitySearch call per day.
+    Every date in the range is listed, with an empty slot list for dates
+    without availability slots.
+
+    Args:
+        restaurant_name: The name of the restaurant
+        StartDate: The first visit date to search
+        EndDate: The last visit date to search (inclusive)
+        PartySize: Number of people in the party
+        ChannelCode: The booking channel identifier
+        db: Async database session dependency
+        token: Authentication token dependency
+
+    Returns:
+        Dict containing restaurant info and available time slots per date
+
+    Raises:
+        HTTPException: 400 if the date range is invalid or too long
+        HTTPException: 404 if restaurant not found
+        HTTPException: 401 if authentication fails
+    """
+    if EndDate < StartDate:
+        raise HTTPException(status_code=400, detail="EndDate must not be before StartDate")
+
+    range_days = (EndDate - StartDate).days + 1
+    if range_days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days"
+        )
+
+    # Find restaurant by name
+    restaurant = await get_restaurant_by_name(db, restaurant_name)
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+
+    slots_by_date = await get_available_slots_by_date(
+        db, restaurant.id, StartDate, EndDate, PartySize
+    )
+
+    dates = []
+    for offset in range(range_days):
+        visit_date = StartDate + timedelta(days=offset)
+        available_slots = slots_by_date.get(visit_date, [])
+        dates.append({
+            "visit_date": visit_date,
+            "available_slots": available_slots,
+            "total_slots": len(available_slots)
+        })
+
+    return {
+        "restaurant": restaurant_name,
+        "restaurant_id": restaurant.id,
+        "start_date": StartDate,
+        "end_date": EndDate,
+        "party_size": PartySize,
+        "channel_code": ChannelCode,
+        "dates": dates,
+        "total_slots": sum(entry["total_slots"] for entry in dates)
+    }
@@ -7,17 +7,23 @@ retrieval, updates, and cancellation of restaurant bookings.
 Author: AI Assistant
 """
 
-import random
+import secrets
 import string
 from datetime import date, time, datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Form, HTTPException, Depends, Header
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Insert, Update, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
 
+from app.cache import availability_cache
 from app.database import get_db
-from app.models import Restaurant, Customer, Booking, CancellationReason
+from app.models import Customer, Booking, CancellationReason
+from app.query_audit import query_budget
+from app.routers.availability import MAX_BOOKINGS_PER_SLOT, get_restaurant_by_name
 
 router = APIRouter(prefix="/api/ConsumerApi/v1/Restaurant", tags=["booking"])
 
@@ -29,6 +35,14 @@ MOCK_BEARER_TOKEN = (
     "2094SB3J3XW-KdBc0DY9a2Jiu_56ud8"
 )
 
+# Characters used in booking references: 36^7 (~78 billion) possible codes
+BOOKING_REFERENCE_ALPHABET = string.ascii_uppercase + string.digits
+BOOKING_REFERENCE_LENGTH = 7
+
+# Fresh references tried before giving up on an insert; a collision is already
+# unlikely (about 1 in 78,000 with a million bookings), two in a row far more so
+MAX_REFERENCE_ATTEMPTS = 5
+
 
 def verify_token(authorization: str = Header(...)) -> str:
     """
@@ -61,12 +75,160 @@ def verify_token(authorization: str = Header(...)) -> str:
 
 def generate_booking_reference() -> str:
     """
-    Generate a unique 7-character alphanumeric booking reference.
+    Generate a random 7-character alphanumeric booking reference.
+
+    References come from the OS random source, so worker processes never
+    share a generator state. Uniqueness is enforced by the unique index on
+    bookings.booking_reference; see insert_booking().
 
     Returns:
-        str: A unique booking reference code
+        str: A random booking reference code
+    """
+    return ''.join(
+        secrets.choice(BOOKING_REFERENCE_ALPHABET) for _ in range(BOOKING_REFERENCE_LENGTH)
+    )
+
+
+def _is_reference_collision(error: IntegrityError) -> bool:
+    """Return True if an IntegrityError was raised by the booking reference unique index."""
+    return "booking_reference" in str(error.orig)
+
+
+def build_capacity_checked_insert(values: Dict[str, Any], max_bookings_per_slot: int) -> Insert:
     """
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=7))
+    Build an INSERT that only adds the booking while its slot has room.
+
+    The row is inserted with INSERT ... SELECT ... WHERE (confirmed bookings
+    at the same restaurant, date and time) < max_bookings_per_slot, so the
+    capacity check and the insert are a single statement. SQLite takes the
+    write lock before evaluating it, so concurrent requests for the same
+    slot are serialised and can never overbook it.
+
+    Args:
+        values: Booking column values, including booking_reference
+        max_bookings_per_slot: Confirmed bookings allowed per time slot
+
+    Returns:
+        Insert returning the new Booking, or no row if the slot is full
+    """
+    columns = Booking.__table__.c
+    confirmed_bookings = select(func.count(Booking.id)).where(
+        Booking.restaurant_id == values["restaurant_id"],
+        Booking.visit_date == values["visit_date"],
+        Booking.visit_time == values["visit_time"],
+        Booking.status == "confirmed"
+    ).scalar_subquery()
+    row = select(
+        *(literal(value, columns[name].type).label(name) for name, value in values.items())
+    ).where(confirmed_bookings < max_bookings_per_slot)
+    return insert(Booking).from_select(list(values), row).returning(Booking)
+
+
+def build_capacity_checked_update(
+    booking_id: int,
+    restaurant_id: int,
+    values: Dict[str, Any],
+    max_bookings_per_slot: int
+) -> Update:
+    """
+    Build an UPDATE that only moves a booking to another slot while that slot has room.
+
+    The counterpart of build_capacity_checked_insert(): the capacity check is
+    part of the UPDATE's WHERE clause, so moving into a slot is serialised
+    with bookings made for it and can never overbook it.
+
+    Args:
+        booking_id: ID of the booking to update
+        restaurant_id: Restaurant of the booking
+        values: Column values to set, including the target visit_date and visit_time
+        max_bookings_per_slot: Confirmed bookings allowed per time slot
+
+    Returns:
+        Update whose rowcount is 0 if the target slot is full
+    """
+    slot_bookings = aliased(Booking)
+    confirmed_bookings = select(func.count(slot_bookings.id)).where(
+        slot_bookings.restaurant_id == restaurant_id,
+        slot_bookings.visit_date == values["visit_date"],
+        slot_bookings.visit_time == values["visit_time"],
+        slot_bookings.status == "confirmed"
+    ).scalar_subquery()
+    return (
+        update(Booking.__table__)
+        .where(Booking.id == booking_id, confirmed_bookings < max_bookings_per_slot)
+        .values(**values)
+    )
+
+
+async def insert_booking(
+    db: AsyncSession,
+    max_bookings_per_slot: Optional[int] = None,
+    **values: Any
+) -> Optional[Booking]:
+    """
+    Insert a booking under a freshly generated, unique booking reference.
+
+    Instead of looking the reference up before inserting, the INSERT is sent
+    straight away and the unique index on booking_reference arbitrates: on the
+    rare collision the statement fails on its own, without aborting the rest
+    of the transaction, and is retried with a new reference. This costs one
+    statement per booking regardless of table size and is safe across
+    worker processes sharing the database.
+
+    Args:
+        db: Async database session; the caller commits
+        max_bookings_per_slot: If given, only insert while the slot holds fewer
+            confirmed bookings (see build_capacity_checked_insert())
+        **values: Booking column values other than booking_reference
+
+    Returns:
+        The inserted booking, with its id and defaults populated, or None if
+        the slot is already full
+
+    Raises:
+        HTTPException: 503 if no free reference was found in MAX_REFERENCE_ATTEMPTS tries
+    """
+    for _ in range(MAX_REFERENCE_ATTEMPTS):
+        row = dict(values, booking_reference=generate_booking_reference())
+        if max_bookings_per_slot is None:
+            statement = insert(Booking).values(**row).returning(Booking)
+        else:
+            statement = build_capacity_checked_insert(row, max_bookings_per_slot)
+        try:
+            result = await db.execute(statement)
+        except IntegrityError as error:
+            if not _is_reference_collision(error):
+                raise
+            continue
+        return result.scalars().first()
+
+    raise HTTPException(status_code=503, detail="Could not allocate a booking reference")
+
+
+async def get_or_create_customer(db: AsyncSession, **values: Any) -> Customer:
+    """
+    Find the customer with the given email, or add a new one to the transaction.
+
+    A new customer is flushed rather than committed, so it only persists if
+    the booking that needs it is committed too.
+
+    Args:
+        db: Async database session; the caller commits
+        **values: Customer column values, including email
+
+    Returns:
+        Customer: The existing or newly inserted customer, with its id populated
+    """
+    if values.get("email"):
+        result = await db.execute(select(Customer).where(Customer.email == values["email"]))
+        customer = result.scalars().first()
+        if customer:
+            return customer
+
+    customer = Customer(**values)
+    db.add(customer)
+    await db.flush()
+    return customer
 
 
 class CustomerData(BaseModel):
@@ -89,6 +251,7 @@ class CustomerData(BaseModel):
 
 
 @router.post("/{restaurant_name}/BookingWithStripeToken")
+@query_budget(4)
 async def create_booking_with_stripe(
     restaurant_name: str,
     VisitDate: date = Form(...),
@@ -131,55 +294,41 @@ async def create_booking_with_stripe(
     RestaurantSmsMarketingOptInText: Optional[str] = Form(
         None, alias="Customer[RestaurantSmsMarketingOptInText]"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(verify_token)
 ):
     """
     Create a new booking with Stripe payment token
     """
     # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
+    restaurant = await get_restaurant_by_name(db, restaurant_name)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Create or find customer
-    customer = None
-    if Email:
-        customer = db.query(Customer).filter(Customer.email == Email).first()
-
-    if not customer:
-        customer = Customer(
-            title=Title,
-            first_name=FirstName,
-            surname=Surname,
-            mobile_country_code=MobileCountryCode,
-            mobile=Mobile,
-            phone_country_code=PhoneCountryCode,
-            phone=Phone,
-            email=Email,
-            receive_email_marketing=ReceiveEmailMarketing or False,
-            receive_sms_marketing=ReceiveSmsMarketing or False,
-            group_email_marketing_opt_in_text=GroupEmailMarketingOptInText,
-            group_sms_marketing_opt_in_text=GroupSmsMarketingOptInText,
-            receive_restaurant_email_marketing=ReceiveRestaurantEmailMarketing or False,
-            receive_restaurant_sms_marketing=ReceiveRestaurantSmsMarketing or False,
-            restaurant_email_marketing_opt_in_text=RestaurantEmailMarketingOptInText,
-            restaurant_sms_marketing_opt_in_text=RestaurantSmsMarketingOptInText
-        )
-        db.add(customer)
-        db.commit()
-        db.refresh(customer)
-
-    # Generate unique booking reference
-    booking_reference = generate_booking_reference()
-    while db.query(Booking).filter(
-        Booking.booking_reference == booking_reference
-    ).first():
-        booking_reference = generate_booking_reference()
-
-    # Create booking
-    booking = Booking(
-        booking_reference=booking_reference,
+    # Customer, capacity check and booking are written in one transaction
+    customer = await get_or_create_customer(
+        db,
+        title=Title,
+        first_name=FirstName,
+        surname=Surname,
+        mobile_country_code=MobileCountryCode,
+        mobile=Mobile,
+        phone_country_code=PhoneCountryCode,
+        phone=Phone,
+        email=Email,
+        receive_email_marketing=ReceiveEmailMarketing or False,
+        receive_sms_marketing=ReceiveSmsMarketing or False,
+        group_email_marketing_opt_in_text=GroupEmailMarketingOptInText,
+        group_sms_marketing_opt_in_text=GroupSmsMarketingOptInText,
+        receive_restaurant_email_marketing=ReceiveRestaurantEmailMarketing or False,
+        receive_restaurant_sms_marketing=ReceiveRestaurantSmsMarketing or False,
+        restaurant_email_marketing_opt_in_text=RestaurantEmailMarketingOptInText,
+        restaurant_sms_marketing_opt_in_text=RestaurantSmsMarketingOptInText
+    )
+
+    booking = await insert_booking(
+        db,
+        max_bookings_per_slot=MAX_BOOKINGS_PER_SLOT,
         restaurant_id=restaurant.id,
         customer_id=customer.id,
         visit_date=VisitDate,
@@ -191,13 +340,15 @@ async def create_booking_with_stripe(
         room_number=RoomNumber,
         status="confirmed"
     )
+    if booking is None:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Time slot is fully booked")
 
-    db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
+    availability_cache.invalidate(restaurant.id, VisitDate)
 
     return {
-        "booking_reference": booking_reference,
+        "booking_reference": booking.booking_reference,
         "booking_id": booking.id,
         "restaurant": restaurant_name,
         "visit_date": VisitDate,
@@ -221,13 +372,14 @@ async def create_booking_with_stripe(
 
 
 @router.post("/{restaurant_name}/Booking/{booking_reference}/Cancel")
+@query_budget(5)
 async def cancel_booking(
     restaurant_name: str,
     booking_reference: str,
     micrositeName: str = Form(...),
     bookingReference: str = Form(...),
     cancellationReasonId: int = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(verify_token)
 ):
     """
@@ -238,15 +390,18 @@ async def cancel_booking(
         raise HTTPException(status_code=400, detail="Booking reference mismatch")
 
     # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
+    restaurant = await get_restaurant_by_name(db, restaurant_name)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Find booking
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
+    result = await db.execute(
+        select(Booking).where(
+            Booking.booking_reference == booking_reference,
+            Booking.restaurant_id == restaurant.id
+        )
+    )
+    booking = result.scalars().first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
@@ -255,9 +410,7 @@ async def cancel_booking(
         raise HTTPException(status_code=400, detail="Booking is already cancelled")
 
     # Validate cancellation reason
-    cancellation_reason = db.query(CancellationReason).filter(
-        CancellationReason.id == cancellationReasonId
-    ).first()
+    cancellation_reason = await db.get(CancellationReason, cancellationReasonId)
     if not cancellation_reason:
         raise HTTPException(status_code=400, detail="Invalid cancellation reason")
 
@@ -266,11 +419,12 @@ async def cancel_booking(
     booking.cancellation_reason_id = cancellationReasonId
     booking.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
+    await db.refresh(booking)
+    availability_cache.invalidate(restaurant.id, booking.visit_date)
 
     return {
-        "booking_reference": booking_reference,
+        "booking_reference": booking.booking_reference,
         "booking_id": booking.id,
         "restaurant": restaurant_name,
         "microsite_name": micrositeName,
@@ -283,34 +437,40 @@ async def cancel_booking(
 
 
 @router.get("/{restaurant_name}/Booking/{booking_reference}")
+@query_budget(2)
 async def get_booking(
     restaurant_name: str,
     booking_reference: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(verify_token)
 ):
     """
     Get booking details by reference
     """
     # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
+    restaurant = await get_restaurant_by_name(db, restaurant_name)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Find booking with customer data
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
-    if not booking:
+    # Find booking with customer data and cancellation reason in one query
+    # (joined eagerly - lazy loads are not available on an AsyncSession)
+    result = await db.execute(
+        select(Booking, CancellationReason)
+        .options(joinedload(Booking.customer))
+        .outerjoin(CancellationReason, CancellationReason.id == Booking.cancellation_reason_id)
+        .where(
+            Booking.booking_reference == booking_reference,
+            Booking.restaurant_id == restaurant.id
+        )
+    )
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="Booking not found")
+    booking, reason = row
 
-    # Get cancellation reason if cancelled
+    # Report the cancellation reason if cancelled
     cancellation_reason = None
-    if booking.status == "cancelled" and booking.cancellation_reason_id:
-        reason = db.query(CancellationReason).filter(
-            CancellationReason.id == booking.cancellation_reason_id
-        ).first()
+    if booking.status == "cancelled":
         if reason:
             cancellation_reason = {
                 "id": reason.id,
@@ -319,7 +479,7 @@ async def get_booking(
             }
 
     return {
-        "booking_reference": booking_reference,
+        "booking_reference": booking.booking_reference,
         "booking_id": booking.id,
         "restaurant": restaurant_name,
         "visit_date": booking.visit_date,
@@ -346,6 +506,7 @@ async def get_booking(
 
 
 @router.patch("/{restaurant_name}/Booking/{booking_reference}")
+@query_budget(4)
 async def update_booking(
     restaurant_name: str,
     booking_reference: str,
@@ -354,22 +515,25 @@ async def update_booking(
     PartySize: Optional[int] = Form(None),
     SpecialRequests: Optional[str] = Form(None),
     IsLeaveTimeConfirmed: Optional[bool] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(verify_token)
 ):
     """
     Update an existing booking
     """
     # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
+    restaurant = await get_restaurant_by_name(db, restaurant_name)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Find booking
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
+    result = await db.execute(
+        select(Booking).where(
+            Booking.booking_reference == booking_reference,
+            Booking.restaurant_id == restaurant.id
+        )
+    )
+    booking = result.scalars().first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
@@ -379,41 +543,52 @@ async def update_booking(
 
     # Track updates
     updates = {}
-    updated = False
+    original_visit_date = booking.visit_date
 
     if VisitDate is not None and VisitDate != booking.visit_date:
-        booking.visit_date = VisitDate
         updates["visit_date"] = VisitDate
-        updated = True
 
     if VisitTime is not None and VisitTime != booking.visit_time:
-        booking.visit_time = VisitTime
         updates["visit_time"] = VisitTime
-        updated = True
 
     if PartySize is not None and PartySize != booking.party_size:
-        booking.party_size = PartySize
         updates["party_size"] = PartySize
-        updated = True
 
     if SpecialRequests is not None and SpecialRequests != booking.special_requests:
-        booking.special_requests = SpecialRequests
         updates["special_requests"] = SpecialRequests
-        updated = True
 
     if (IsLeaveTimeConfirmed is not None and
             IsLeaveTimeConfirmed != booking.is_leave_time_confirmed):
-        booking.is_leave_time_confirmed = IsLeaveTimeConfirmed
         updates["is_leave_time_confirmed"] = IsLeaveTimeConfirmed
-        updated = True
 
+    updated = bool(updates)
     if updated:
-        booking.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(booking)
+        moved = "visit_date" in updates or "visit_time" in updates
+        values = dict(updates, updated_at=datetime.utcnow())
+        if moved:
+            # Moving into another slot is checked against its capacity like a new booking
+            values.setdefault("visit_date", booking.visit_date)
+            values.setdefault("visit_time", booking.visit_time)
+            statement = build_capacity_checked_update(
+                booking.id, restaurant.id, values, MAX_BOOKINGS_PER_SLOT
+            )
+        else:
+            statement = update(Booking.__table__).where(Booking.id == booking.id).values(**values)
+
+        result = await db.execute(statement)
+        if moved and result.rowcount == 0:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Time slot is fully booked")
+        await db.commit()
+        await db.refresh(booking)
+
+        # A moved booking frees capacity on the old date and takes it on the new one
+        if moved:
+            availability_cache.invalidate(restaurant.id, original_visit_date)
+            availability_cache.invalidate(restaurant.id, booking.visit_date)
 
     return {
-        "booking_reference": booking_reference,
+        "booking_reference": booking.booking_reference,
         "booking_id": booking.id,
         "restaurant": restaurant_name,
         "updates": updates,
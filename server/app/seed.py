@@ -0,0 +1,328 @@
+"""
+Bulk Seed Data Generator.
+
+This module fills the database with production-sized data for load testing:
+thousands of restaurants, years of availability slots and millions of
+customers and bookings. Rows are generated from a seeded random generator,
+so the same arguments always produce the same dataset, and written with
+executemany() batches inside one transaction per table.
+
+Usage:
+    cd server
+    python -m app.seed --restaurants 1000 --days 730 --customers 1000000 --bookings 5000000
+
+Author: AI Assistant
+"""
+
+import argparse
+import random
+from array import array
+import time as timer
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.database import SQLALCHEMY_DATABASE_URL, create_db_engine
+from app.init_db import CANCELLATION_REASONS, SAMPLE_TIMES
+from app.models import (
+    Base, Restaurant, Customer, Booking, AvailabilitySlot, CancellationReason
+)
+from app.routers.availability import MAX_BOOKINGS_PER_SLOT
+from app.routers.booking import BOOKING_REFERENCE_ALPHABET, BOOKING_REFERENCE_LENGTH
+
+DEFAULT_BATCH_SIZE = 10_000
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael",
+               "Linda", "David", "Elizabeth", "Aisha", "Wei", "Priya", "Mateo", "Sofia"]
+SURNAMES = ["Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson",
+            "Davies", "Patel", "Khan", "Garcia", "Chen", "Murphy", "Evans", "Walker"]
+MAX_PARTY_SIZES = [4, 6, 8, 8, 10, 12]
+CHANNEL_CODES = ["ONLINE", "ONLINE", "ONLINE", "PHONE", "WALKIN"]
+
+
+def sequence_booking_reference(number: int) -> str:
+    """
+    Encode a sequence number as a 7-character booking reference.
+
+    Distinct numbers always give distinct references, so seeded bookings
+    never collide with each other on the unique booking_reference index.
+
+    Args:
+        number: Non-negative sequence number below 36^7
+
+    Returns:
+        str: The booking reference code
+    """
+    digits = []
+    for _ in range(BOOKING_REFERENCE_LENGTH):
+        number, remainder = divmod(number, len(BOOKING_REFERENCE_ALPHABET))
+        digits.append(BOOKING_REFERENCE_ALPHABET[remainder])
+    return "".join(reversed(digits))
+
+
+def insert_batches(engine: Engine, model: Any, rows: Iterable[Dict[str, Any]],
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Insert rows with one executemany() call per batch, in a single transaction.
+
+    Args:
+        engine: Engine to write to
+        model: Mapped class whose table receives the rows
+        rows: Row dicts; consumed lazily so large datasets never sit in memory
+        batch_size: Rows sent per executemany() call
+
+    Returns:
+        int: Number of rows inserted
+    """
+    statement = insert(model)
+    inserted = 0
+    batch: List[Dict[str, Any]] = []
+    with engine.begin() as connection:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                connection.execute(statement, batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            connection.execute(statement, batch)
+            inserted += len(batch)
+    return inserted
+
+
+def generate_restaurants(first_id: int, count: int, created_at: datetime,
+                         include_default: bool) -> Iterator[Dict[str, Any]]:
+    """Yield restaurant rows; the first is TheHungryUnicorn if it does not exist yet."""
+    for restaurant_id in range(first_id, first_id + count):
+        if include_default and restaurant_id == first_id:
+            name = "TheHungryUnicorn"
+        else:
+            name = f"Restaurant{restaurant_id:06d}"
+        yield {"id": restaurant_id, "name": name, "microsite_name": name,
+               "created_at": created_at}
+
+
+def generate_slots(rng: random.Random, restaurant_ids: range, start_date: date, days: int,
+                   created_at: datetime) -> Iterator[Dict[str, Any]]:
+    """Yield SAMPLE_TIMES slots per restaurant per day, 80% of them available."""
+    for restaurant_id in restaurant_ids:
+        max_party_size = rng.choice(MAX_PARTY_SIZES)
+        for day in range(days):
+            slot_date = start_date + timedelta(days=day)
+            for slot_time in SAMPLE_TIMES:
+                yield {
+                    "restaurant_id": restaurant_id,
+                    "date": slot_date,
+                    "time": slot_time,
+                    "max_party_size": max_party_size,
+                    "available": rng.random() > 0.2,
+                    "created_at": created_at
+                }
+
+
+def generate_customers(rng: random.Random, first_id: int, count: int,
+                       created_at: datetime) -> Iterator[Dict[str, Any]]:
+    """Yield customer rows with unique emails and random names and preferences."""
+    for customer_id in range(first_id, first_id + count):
+        first_name = rng.choice(FIRST_NAMES)
+        surname = rng.choice(SURNAMES)
+        yield {
+            "id": customer_id,
+            "first_name": first_name,
+            "surname": surname,
+            "email": f"{first_name.lower()}.{surname.lower()}.{customer_id}@example.com",
+            "mobile_country_code": "+44",
+            "mobile": f"07{rng.randrange(10 ** 9):09d}",
+            "receive_email_marketing": rng.random() < 0.3,
+            "receive_sms_marketing": rng.random() < 0.1,
+            "created_at": created_at
+        }
+
+
+def generate_bookings(rng: random.Random, first_number: int, count: int,
+                      restaurant_ids: range, customer_ids: Sequence[int], start_date: date,
+                      days: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield bookings spread randomly over the seeded slots.
+
+    At most MAX_BOOKINGS_PER_SLOT bookings per slot are confirmed, matching the
+    capacity rule of the booking API; about 10% of bookings, and any beyond a
+    slot's capacity, are cancelled with a random cancellation reason.
+    """
+    times_per_day = len(SAMPLE_TIMES)
+    slots_per_restaurant = days * times_per_day
+    confirmed = bytearray(len(restaurant_ids) * slots_per_restaurant)
+
+    for number in range(first_number, first_number + count):
+        slot = rng.randrange(len(confirmed))
+        restaurant_index, slot_in_restaurant = divmod(slot, slots_per_restaurant)
+        day, time_index = divmod(slot_in_restaurant, times_per_day)
+        visit_date = start_date + timedelta(days=day)
+        created_at = datetime.combine(visit_date, time(9, 0)) - timedelta(
+            days=rng.randrange(60)
+        )
+
+        if confirmed[slot] < MAX_BOOKINGS_PER_SLOT and rng.random() >= 0.1:
+            confirmed[slot] += 1
+            status, cancellation_reason_id = "confirmed", None
+        else:
+            status, cancellation_reason_id = "cancelled", rng.choice(CANCELLATION_REASONS)["id"]
+
+        yield {
+            "booking_reference": sequence_booking_reference(number),
+            "restaurant_id": restaurant_ids[restaurant_index],
+            "customer_id": rng.choice(customer_ids),
+            "visit_date": visit_date,
+            "visit_time": SAMPLE_TIMES[time_index],
+            "party_size": rng.randint(1, 4),
+            "channel_code": rng.choice(CHANNEL_CODES),
+            "special_requests": "Window seat please" if rng.random() < 0.05 else None,
+            "is_leave_time_confirmed": False,
+            "status": status,
+            "cancellation_reason_id": cancellation_reason_id,
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+
+
+def _next_id(engine: Engine, column: Any) -> int:
+    """Return one past the largest value of an integer column (1 for an empty table)."""
+    with engine.connect() as connection:
+        return (connection.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _customer_ids(engine: Engine) -> Sequence[int]:
+    """
+    Return every customer id in ascending order.
+
+    Ids are read rather than assumed to run from 1, since deletes or other
+    seeding leave gaps; a compact array keeps millions of them cheap.
+    """
+    with engine.connect() as connection:
+        return array("q", connection.execute(select(Customer.id).order_by(Customer.id)).scalars())
+
+
+def _report(table: str, rows: int, seconds: float) -> None:
+    rate = rows / seconds if seconds else 0.0
+    print(f"   {table:<20} {rows:>12,} rows {seconds:>8.1f}s {rate:>12,.0f} rows/sec")
+
+
+def seed(
+    engine: Engine,
+    restaurants: int,
+    days: int,
+    customers: int,
+    bookings: int,
+    start_date: date,
+    seed_value: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Generate and bulk insert a dataset of the requested size.
+
+    New rows are appended after any existing data, so seeding an already
+    initialised database keeps TheHungryUnicorn and its bookings.
+
+    Args:
+        engine: Engine to write to; tables are created if missing
+        restaurants: Number of restaurants to add
+        days: Days of availability slots per new restaurant, from start_date
+        customers: Number of customers to add
+        bookings: Number of bookings to add across the new restaurants' slots
+        start_date: First date with availability slots
+        seed_value: Random seed; the same seed and sizes give the same data
+        batch_size: Rows per executemany() call
+
+    Returns:
+        Dict mapping table names to the number of rows inserted
+
+    Raises:
+        ValueError: If bookings are requested without restaurants, days or customers
+    """
+    Base.metadata.create_all(bind=engine)
+    if bookings and not (restaurants and days and (customers or _next_id(engine, Customer.id) > 1)):
+        raise ValueError("Bookings need at least one new restaurant, one day and one customer")
+
+    rng = random.Random(seed_value)
+    created_at = datetime.combine(start_date, time(0, 0))
+    counts: Dict[str, int] = {}
+
+    def timed(table: str, model: Any, rows: Iterable[Dict[str, Any]]) -> None:
+        start = timer.perf_counter()
+        counts[table] = insert_batches(engine, model, rows, batch_size)
+        _report(table, counts[table], timer.perf_counter() - start)
+
+    if _next_id(engine, CancellationReason.id) == 1:
+        timed("cancellation_reasons", CancellationReason, CANCELLATION_REASONS)
+
+    first_restaurant_id = _next_id(engine, Restaurant.id)
+    with engine.connect() as connection:
+        include_default = connection.execute(
+            select(Restaurant.id).where(Restaurant.name == "TheHungryUnicorn")
+        ).first() is None
+    restaurant_ids = range(first_restaurant_id, first_restaurant_id + restaurants)
+    timed("restaurants", Restaurant,
+          generate_restaurants(first_restaurant_id, restaurants, created_at, include_default))
+    timed("availability_slots", AvailabilitySlot,
+          generate_slots(rng, restaurant_ids, start_date, days, created_at))
+
+    first_customer_id = _next_id(engine, Customer.id)
+    timed("customers", Customer,
+          generate_customers(rng, first_customer_id, customers, created_at))
+
+    if bookings:
+        customer_ids = _customer_ids(engine)
+        first_booking_number = _next_id(engine, Booking.id)
+        timed("bookings", Booking, generate_bookings(
+            rng, first_booking_number, bookings, restaurant_ids, customer_ids, start_date, days
+        ))
+
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk seed the booking database with production-sized data."
+    )
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL,
+                        help="SQLAlchemy database URL (default: DATABASE_URL)")
+    parser.add_argument("--restaurants", type=int, default=100,
+                        help="Restaurants to add (default: 100)")
+    parser.add_argument("--days", type=int, default=365,
+                        help="Days of availability slots per restaurant (default: 365)")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date.today(),
+                        help="First slot date in YYYY-MM-DD format (default: today)")
+    parser.add_argument("--customers", type=int, default=100_000,
+                        help="Customers to add (default: 100000)")
+    parser.add_argument("--bookings", type=int, default=1_000_000,
+                        help="Bookings to add (default: 1000000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for reproducible data (default: 0)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per executemany batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--reset", action="store_true",
+                        help="Drop and recreate all tables before seeding")
+    args = parser.parse_args(argv)
+
+    # Durability is irrelevant for throwaway load-test data
+    engine = create_db_engine(args.database_url, synchronous="OFF")
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+
+    print(f"Seeding {args.database_url} (seed={args.seed})")
+    start = timer.perf_counter()
+    try:
+        counts = seed(
+            engine, args.restaurants, args.days, args.customers, args.bookings,
+            args.start_date, args.seed, args.batch_size
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    _report("total", sum(counts.values()), timer.perf_counter() - start)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
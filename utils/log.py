@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+# "text" for key=value lines, "json" for one JSON object per line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Fraction of DEBUG/INFO events kept; warnings and errors are never sampled
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+REDACTED = "***"
+SENSITIVE_FIELD = re.compile(r"authorization|token|password|secret", re.IGNORECASE)
+BEARER_TOKEN = re.compile(r"(Bearer\s+)\S+", re.IGNORECASE)
+
+_sample_rate = LOG_SAMPLE_RATE
+
+
+def redact(value):
+    """Masks secrets in a field value: sensitive dict keys and bearer tokens in strings."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if SENSITIVE_FIELD.search(str(key)) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return BEARER_TOKEN.sub(rf"\g<1>{REDACTED}", value)
+    return value
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    fields = getattr(record, "fields", {})
+    return {key: REDACTED if SENSITIVE_FIELD.search(key) else redact(value) for key, value in fields.items()}
+
+
+class TextFormatter(logging.Formatter):
+    """`time LEVEL logger event key=value ...`; field values are only rendered here."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        parts = [self.formatTime(record), record.levelname, record.name, record.getMessage()]
+        parts.extend(f"{key}={value!r}" if isinstance(value, str) else f"{key}={value}"
+                     for key, value in _fields(record).items())
+        line = " ".join(parts)
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per event, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class StructuredLogger:
+    """
+    A thin wrapper over a stdlib logger that logs an event name plus keyword fields.
+
+    Fields are passed as objects and only formatted if the event is emitted,
+    so a disabled level costs one cached level check and nothing else.
+    DEBUG and INFO events are kept with probability LOG_SAMPLE_RATE.
+    """
+
+    __slots__ = ("logger",)
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: int, event: str, fields: dict, exc_info=None) -> None:
+        if level < logging.WARNING and _sample_rate < 1.0 and random.random() >= _sample_rate:
+            return
+        self.logger.log(level, event, exc_info=exc_info, extra={"fields": fields}, stacklevel=3)
+
+    def debug(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, exc_info=None, **fields) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, event, fields, exc_info=exc_info)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Returns a structured logger; use the module's __name__."""
+    return StructuredLogger(logging.getLogger(name))
+
+
+def configure_logging(level=None, fmt=None, sample_rate=None, stream=None) -> None:
+    """
+    Configures the agent and API client loggers (`agent`, `api`, `utils`).
+
+    Arguments default to the LOG_LEVEL, LOG_FORMAT and LOG_SAMPLE_RATE
+    environment variables. Output goes to stderr so it never mixes with the
+    CLI conversation on stdout. Safe to call more than once.
+    """
+    global _sample_rate
+    level = LOG_LEVEL if level is None else level
+    if isinstance(level, str):
+        level = level.upper()
+    fmt = fmt or LOG_FORMAT
+    _sample_rate = LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+    for name in ("agent", "api", "utils"):
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.setLevel(level)
+        logger.propagate = False
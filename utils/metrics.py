@@ -0,0 +1,268 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Wrap graph nodes and routers with timing; "false" builds the graph without the wrappers
+AGENT_METRICS = os.getenv("AGENT_METRICS", "true").lower() in ("1", "true", "yes")
+
+# Histogram bucket upper bounds; values above the last bound land in an overflow bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+SIZE_BUCKETS_BYTES = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+
+class Histogram:
+    """Counts observations into fixed buckets, with their count, sum and maximum."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation; the maximum if it overflowed."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 2),
+            "p95": round(self.quantile(0.95), 2),
+            "max": round(self.max, 2),
+            "buckets": {**{f"le_{bound:g}": count for bound, count in zip(self.buckets, self.counts)},
+                        "le_inf": self.counts[-1]},
+        }
+
+
+class _Span:
+    """LLM and HTTP time accumulated while one node runs."""
+
+    __slots__ = ("llm_ms", "http_ms")
+
+    def __init__(self):
+        self.llm_ms = 0.0
+        self.http_ms = 0.0
+
+
+_current_span: ContextVar[Optional[_Span]] = ContextVar("node_span", default=None)
+
+
+def add_llm_time(elapsed_ms: float) -> None:
+    """Charges an LLM call to the node running in this context, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.llm_ms += elapsed_ms
+
+
+def add_http_time(elapsed_ms: float) -> None:
+    """Charges an HTTP request to the node running in this context, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.http_ms += elapsed_ms
+
+
+def state_size(state: Any) -> int:
+    """
+    Approximate size in bytes of a state (dataclass or dict).
+
+    Runs on every node and router call, so the conversation history is measured
+    by its message lengths rather than serialized; only the API response, the
+    one large field a node replaces wholesale, is encoded as JSON.
+    """
+    if state is None:
+        return 0
+    get = state.get if isinstance(state, dict) else functools.partial(getattr, state)
+    size = len(get("user_message", "") or "") + len(get("agent_response", "") or "")
+    size += sum(len(message.get("content", "")) for message in get("conversation_history", None) or ())
+    api_response = get("api_response", None)
+    if api_response:
+        try:
+            size += len(json.dumps(api_response, default=str))
+        except (TypeError, ValueError):
+            pass
+    return size
+
+
+class NodeStats:
+    """Histograms of wall, LLM and HTTP time and state size for one node or router."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.errors = 0
+        self.wall_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.llm_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.http_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.state_bytes = Histogram(SIZE_BUCKETS_BYTES)
+        self.routes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, wall_ms: float, span: _Span, size: int, failed: bool, route: Optional[str] = None) -> None:
+        with self._lock:
+            self.errors += failed
+            self.wall_ms.observe(wall_ms)
+            self.llm_ms.observe(span.llm_ms)
+            self.http_ms.observe(span.http_ms)
+            self.state_bytes.observe(size)
+            if route is not None:
+                self.routes[route] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            summary = {
+                "kind": self.kind,
+                "calls": self.wall_ms.count,
+                "errors": self.errors,
+                "wall_ms": self.wall_ms.summary(),
+                "llm_ms": self.llm_ms.summary(),
+                "http_ms": self.http_ms.summary(),
+                "state_bytes": self.state_bytes.summary(),
+            }
+            if self.kind == "router":
+                summary["routes"] = dict(self.routes)
+            return summary
+
+
+class WorkflowMetrics:
+    """
+    Per-node timing for the LangGraph workflow.
+
+    `node()` and `router()` wrap the functions passed to the StateGraph. Each
+    call records its wall time, the LLM and HTTP time spent inside it (reported
+    by LLMRegistry and the API clients through add_llm_time/add_http_time), and
+    the size of the state it returns; routers also count the branch taken.
+    Stats are process-wide and shared by every graph built with the wrappers.
+    """
+
+    def __init__(self, enabled: bool = AGENT_METRICS):
+        self.enabled = enabled
+        self._stats: Dict[str, NodeStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, kind: str) -> NodeStats:
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = NodeStats(kind)
+            return self._stats[name]
+
+    def node(self, name: str, fn: Callable) -> Callable:
+        """Wraps a sync or async node; `config` is still passed through to nodes that take it."""
+        if not self.enabled:
+            return fn
+        self._get(name, "node")
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(state, **kwargs):
+                span, start = _Span(), time.perf_counter()
+                token = _current_span.set(span)
+                failed = True
+                result = None
+                try:
+                    result = await fn(state, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    _current_span.reset(token)
+                    self._get(name, "node").record((time.perf_counter() - start) * 1000, span,
+                                                   state_size(result), failed)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(state, **kwargs):
+            span, start = _Span(), time.perf_counter()
+            token = _current_span.set(span)
+            failed = True
+            result = None
+            try:
+                result = fn(state, **kwargs)
+                failed = False
+                return result
+            finally:
+                _current_span.reset(token)
+                self._get(name, "node").record((time.perf_counter() - start) * 1000, span,
+                                               state_size(result), failed)
+        return wrapper
+
+    def router(self, name: str, fn: Callable) -> Callable:
+        """Wraps a conditional edge function, counting the branches it returns."""
+        if not self.enabled:
+            return fn
+        self._get(name, "router")
+
+        @functools.wraps(fn)
+        def wrapper(state, **kwargs):
+            span, start = _Span(), time.perf_counter()
+            route = None
+            try:
+                route = fn(state, **kwargs)
+                return route
+            finally:
+                self._get(name, "router").record((time.perf_counter() - start) * 1000, span,
+                                                 state_size(state), route is None, route)
+        return wrapper
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Summary per node and router, in the order they first ran."""
+        with self._lock:
+            stats = dict(self._stats)
+        return {name: node_stats.summary() for name, node_stats in stats.items()}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One flat row per node, for tables in the CLI and the web app."""
+        return [
+            {
+                "node": name,
+                "calls": summary["calls"],
+                "errors": summary["errors"],
+                "wall p50 ms": summary["wall_ms"]["p50"],
+                "wall p95 ms": summary["wall_ms"]["p95"],
+                "wall max ms": summary["wall_ms"]["max"],
+                "LLM mean ms": summary["llm_ms"]["mean"],
+                "HTTP mean ms": summary["http_ms"]["mean"],
+                "state mean B": summary["state_bytes"]["mean"],
+            }
+            for name, summary in self.stats().items()
+        ]
+
+    def format_table(self) -> str:
+        rows = self.rows()
+        if not rows:
+            return "No node metrics recorded yet."
+        header = (f"{'node':>34} | {'calls':>5} | {'p50 ms':>7} | {'p95 ms':>7} | {'max ms':>8} | "
+                  f"{'LLM ms':>7} | {'HTTP ms':>7} | {'state B':>7}")
+        lines = [header, "-" * len(header)]
+        for row in rows:
+            lines.append(f"{row['node']:>34} | {row['calls']:>5} | {row['wall p50 ms']:>7.2f} | "
+                         f"{row['wall p95 ms']:>7.2f} | {row['wall max ms']:>8.2f} | {row['LLM mean ms']:>7.2f} | "
+                         f"{row['HTTP mean ms']:>7.2f} | {row['state mean B']:>7.0f}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+workflow_metrics = WorkflowMetrics()